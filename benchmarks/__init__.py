@@ -0,0 +1,17 @@
+"""
+Micro-benchmarks for Composer MCP Server.
+
+Run from the repository root with `python -m benchmarks.run --help`. The benchmarks use the installed
+`composer_trade_mcp` package if there is one (e.g. after `pip install -e .`), and the `src` directory of this
+checkout otherwise.
+"""
+import os
+import sys
+
+try:
+    import composer_trade_mcp  # noqa: F401
+except ImportError:
+    # Not installed: use this checkout's sources, here and in the servers the benchmarks start as subprocesses.
+    SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    sys.path.insert(0, SRC_DIR)
+    os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))
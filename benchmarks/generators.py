@@ -0,0 +1,104 @@
+"""
+Synthetic data generators for the benchmarks.
+"""
+from typing import Dict, List
+import random
+import uuid
+
+FIRST_DAY = 18262  # 2020-01-01, in epoch days
+TICKERS = ["SPY", "QQQ", "TLT", "IEF", "GLD", "BIL", "UVXY", "SQQQ", "TQQQ", "SOXL", "XLK", "XLE", "XLF", "XLV"]
+STATS_FIELDS = [
+    "annualized_rate_of_return", "calmar_ratio", "sharpe_ratio", "cumulative_return", "trailing_one_year_return",
+    "trailing_one_month_return", "trailing_three_month_return", "max_drawdown", "standard_deviation",
+]
+
+def _stats(rng: random.Random) -> Dict:
+    stats = {field: rng.uniform(-1, 2) for field in STATS_FIELDS}
+    stats["percent"] = {field: rng.uniform(-1, 1) for field in ("alpha", "beta", "r_square", "pearson_r")}
+    return stats
+
+def backtest_output(num_days: int, num_series: int, seed: int = 0) -> Dict:
+    """
+    A raw backtest API response (as decoded from JSON) with `num_series` series of `num_days` market days:
+    the symphony plus `num_series - 1` benchmarks.
+    """
+    rng = random.Random(seed)
+    series_ids = ["symphony"] + TICKERS[:num_series - 1] + [f"BENCH{i}" for i in range(max(0, num_series - 1 - len(TICKERS)))]
+    # Skip weekends so the epoch days look like market days
+    days = [day for day in range(FIRST_DAY, FIRST_DAY + num_days * 2) if (day + 4) % 7 < 5][:num_days]
+    dvm_capital = {}
+    for series_id in series_ids:
+        value = 10000.0
+        entry = {}
+        for day in days:
+            value *= 1 + rng.gauss(0.0004, 0.012)
+            entry[str(day)] = value
+        dvm_capital[series_id] = entry
+    return {
+        "data_warnings": {},
+        "first_day": days[0],
+        "capital": 10000.0,
+        "last_market_day": days[-1],
+        "last_market_days_holdings": {ticker: rng.uniform(0, 100) for ticker in TICKERS[:5]},
+        "last_market_days_value": dvm_capital["symphony"][str(days[-1])],
+        "stats": {**_stats(rng), "benchmarks": {series_id: _stats(rng) for series_id in series_ids[1:]}},
+        "dvm_capital": dvm_capital,
+        "legend": {series_id: {"name": series_id} for series_id in series_ids},
+    }
+
+def _asset(rng: random.Random) -> Dict:
+    ticker = rng.choice(TICKERS)
+    return {"id": str(uuid.UUID(int=rng.getrandbits(128))), "step": "asset", "ticker": ticker, "name": ticker, "exchange": "XNYS", "weight": None}
+
+def _node(rng: random.Random, level: int, depth: int, width: int) -> Dict:
+    node_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    if level >= depth:
+        return _asset(rng)
+    children = [_node(rng, level + 1, depth, width) for _ in range(width)]
+    kind = level % 3
+    if kind == 0:
+        return {"id": node_id, "step": "wt-cash-equal", "weight": None, "children": children}
+    if kind == 1:
+        return {
+            "id": node_id, "step": "filter", "weight": None, "children": children,
+            "sort-by-fn": "cumulative-return", "sort-by-fn-params": {"window": 20}, "sort-by-window-days": 20,
+            "select-fn": "top", "select-n": max(1, width // 2),
+        }
+    window = rng.choice([10, 20, 50, 200])
+    return {
+        "id": node_id, "step": "if", "weight": None,
+        "children": [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))), "step": "if-child", "weight": None,
+                "is-else-condition?": False, "comparator": "gt",
+                "lhs-fn": "moving-average-price", "lhs-val": "SPY", "lhs-window-days": window, "lhs-fn-params": {"window": window},
+                "rhs-fn": "current-price", "rhs-val": "SPY", "rhs-fixed-value?": False, "rhs-window-days": None, "rhs-fn-params": {"window": 1},
+                "children": children[: (width + 1) // 2] or [_asset(rng)],
+            },
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))), "step": "if-child", "weight": None,
+                "is-else-condition?": True,
+                "children": children[(width + 1) // 2:] or [_asset(rng)],
+            },
+        ],
+    }
+
+def symphony_score(depth: int, width: int, seed: int = 0) -> Dict:
+    """
+    A valid symphony score whose tree has `depth` levels below the root weight node and `width` children per node.
+    Levels cycle through weight, filter and if nodes; the leaves are assets.
+    """
+    rng = random.Random(seed)
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "step": "root",
+        "name": f"Benchmark symphony {depth}x{width}",
+        "description": "Synthetic symphony for benchmarks",
+        "rebalance": "daily",
+        "rebalance-corridor-width": None,
+        "weight": None,
+        "children": [_node(rng, 0, depth, width)],
+    }
+
+def count_nodes(score: Dict) -> int:
+    return 1 + sum(count_nodes(child) for child in score.get("children", []))
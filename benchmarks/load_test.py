@@ -0,0 +1,195 @@
+"""
+Load test of the MCP HTTP transport against the local stub Composer API.
+
+    python -m benchmarks.load_test --spawn --sessions 20 --duration 30
+
+With --spawn, the stub API and the MCP server (`main()`, pointed at the stub with COMPOSER_API_BASE_URL) are started
+as subprocesses; otherwise --url must point at a running MCP server. Each session opens its own MCP connection
+and calls tools picked from a weighted, read-heavy mix until the duration is over.
+
+Reports throughput, latency percentiles (overall and per tool), errors and the server's resident memory
+(from /proc, so Linux only, and only when the server pid is known).
+"""
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+# Importing the schemas package first avoids the circular import between schemas and utils.
+import composer_trade_mcp.schemas  # noqa: F401
+from composer_trade_mcp.utils.metrics import is_error_result
+
+from .stub_api import ACCOUNT_UUID, SYMPHONY_IDS
+
+# (tool, arguments, weight)
+TOOL_MIX = [
+    ("list_accounts", {}, 10),
+    ("get_account_holdings", {"account_uuid": ACCOUNT_UUID}, 10),
+    ("get_aggregate_portfolio_stats", {"account_uuid": ACCOUNT_UUID}, 8),
+    ("get_aggregate_symphony_stats", {"account_uuid": ACCOUNT_UUID}, 8),
+    ("get_portfolio_daily_performance", {"account_uuid": ACCOUNT_UUID}, 6),
+    ("get_symphony_daily_performance", {"account_uuid": ACCOUNT_UUID, "symphony_id": SYMPHONY_IDS[0]}, 6),
+    ("search_symphonies", {}, 12),
+    ("backtest_symphony_by_id", {"symphony_id": SYMPHONY_IDS[1]}, 12),
+    ("get_saved_symphony", {"symphony_id": SYMPHONY_IDS[2]}, 8),
+    ("get_market_hours", {}, 5),
+    ("get_options_chain", {"underlying_asset_symbol": "SPY"}, 5),
+    ("preview_rebalance_for_symphony", {"account_uuid": ACCOUNT_UUID, "symphony_id": SYMPHONY_IDS[3]}, 5),
+    ("get_household_holdings", {}, 5),
+]
+
+AUTH_HEADERS = {"x-api-key-id": "load-test", "authorization": "Bearer load-test"}
+
+def rss_mb(pid: Optional[int]) -> Optional[float]:
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+async def wait_until_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{url} did not become ready")
+            await asyncio.sleep(0.2)
+
+async def run_session(url: str, deadline: float, seed: int, results: List[tuple]) -> None:
+    rng = random.Random(seed)
+    weights = [weight for _, _, weight in TOOL_MIX]
+    async with Client(StreamableHttpTransport(url, headers=AUTH_HEADERS)) as client:
+        while time.monotonic() < deadline:
+            name, arguments, _ = rng.choices(TOOL_MIX, weights)[0]
+            start = time.perf_counter()
+            error = False
+            try:
+                result = await client.call_tool(name, arguments)
+                error = is_error_result(result)
+            except Exception:
+                error = True
+            results.append((name, time.perf_counter() - start, error))
+
+def summarize(latencies: List[float]) -> Dict:
+    values = np.asarray(latencies) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p90_ms": round(float(np.percentile(values, 90)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "max_ms": round(float(values.max()), 2),
+    }
+
+async def run_load(url: str, sessions: int, duration: float, server_pid: Optional[int]) -> Dict:
+    results: List[tuple] = []
+    rss_before = rss_mb(server_pid)
+    peak_rss = rss_before
+    started = time.monotonic()
+    deadline = started + duration
+
+    async def sample_memory() -> None:
+        nonlocal peak_rss
+        while time.monotonic() < deadline:
+            rss = rss_mb(server_pid)
+            if rss is not None:
+                peak_rss = max(peak_rss or 0, rss)
+            await asyncio.sleep(0.5)
+
+    outcomes = await asyncio.gather(
+        sample_memory(),
+        *(run_session(url, deadline, seed, results) for seed in range(sessions)),
+        return_exceptions=True,
+    )
+    elapsed = time.monotonic() - started
+    session_errors = [repr(outcome) for outcome in outcomes if isinstance(outcome, BaseException)]
+    if not results:
+        return {"error": "No calls completed", "session_errors": session_errors[:5]}
+
+    by_tool: Dict[str, List[float]] = {}
+    for name, latency, _ in results:
+        by_tool.setdefault(name, []).append(latency)
+    return {
+        "sessions": sessions,
+        "duration_s": round(elapsed, 2),
+        "calls": len(results),
+        "requests_per_second": round(len(results) / elapsed, 2),
+        "errors": sum(error for _, _, error in results),
+        "session_errors": session_errors[:5],
+        "latency": summarize([latency for _, latency, _ in results]),
+        "tools": {name: summarize(latencies) for name, latencies in sorted(by_tool.items())},
+        "server_rss_mb": {"before": rss_before, "peak": peak_rss, "after": rss_mb(server_pid)},
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080/mcp/", help="MCP endpoint (ignored with --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Start the stub API and the MCP server as subprocesses")
+    parser.add_argument("--server-pid", type=int, help="Pid of a running MCP server, for memory reporting")
+    parser.add_argument("--port", type=int, default=8181, help="MCP server port with --spawn")
+    parser.add_argument("--stub-port", type=int, default=8900, help="Stub API port with --spawn")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Stub API latency with --spawn")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Stub API latency jitter with --spawn")
+    parser.add_argument("--days", type=int, default=1260, help="Stub API backtest/history length with --spawn")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    processes = []
+    url = args.url
+    server_pid = args.server_pid
+    try:
+        if args.spawn:
+            stub = subprocess.Popen([
+                sys.executable, "-m", "benchmarks.stub_api", "--port", str(args.stub_port),
+                "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms), "--days", str(args.days),
+            ])
+            processes.append(stub)
+            server = subprocess.Popen(
+                [sys.executable, "-c", "from composer_trade_mcp.server import main; main()"],
+                env={**os.environ, "PORT": str(args.port), "COMPOSER_API_BASE_URL": f"http://127.0.0.1:{args.stub_port}"},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            processes.append(server)
+            server_pid = server.pid
+            url = f"http://127.0.0.1:{args.port}/mcp/"
+            asyncio.run(wait_until_ready(f"http://127.0.0.1:{args.stub_port}/api/v0.1/deploy/market-hours"))
+            asyncio.run(wait_until_ready(f"http://127.0.0.1:{args.port}/health"))
+
+        report = asyncio.run(run_load(url, args.sessions, args.duration, server_pid))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0 if "error" not in report else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
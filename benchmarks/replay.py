@@ -0,0 +1,123 @@
+"""
+Replay the tool calls recorded in a cassette against a server answering upstream requests from the same cassette.
+
+    # record: run the server with a cassette in record mode and use it as usual
+    COMPOSER_MCP_CASSETTE=session.jsonl.gz COMPOSER_MCP_CASSETTE_MODE=record composer-trade-mcp
+    # replay offline and compare against an earlier run
+    python -m benchmarks.replay session.jsonl.gz --save-baseline before.json
+    python -m benchmarks.replay session.jsonl.gz --baseline before.json
+
+The server is started as a subprocess with the cassette in replay mode, so no request leaves the machine.
+Tool calls are replayed sequentially in recorded order, `--repeat` times, and timed per tool.
+COMPOSER_API_BASE_URL is passed through, so cassettes recorded against the stub API replay as well.
+"""
+from collections import defaultdict
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from fastmcp import Client
+from fastmcp.client.transports import StreamableHttpTransport
+
+# Import the server first: it sets up the schemas and utils packages in an order without circular imports.
+import composer_trade_mcp.server  # noqa: F401
+from composer_trade_mcp.utils.cassette import Cassette
+from composer_trade_mcp.utils.metrics import is_error_result
+
+from .load_test import AUTH_HEADERS, wait_until_ready
+from .run import compare
+
+async def replay(url: str, tool_calls: List[Dict], repeat: int) -> Dict:
+    timings: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    async with Client(StreamableHttpTransport(url, headers=AUTH_HEADERS)) as client:
+        for _ in range(repeat):
+            for call in tool_calls:
+                start = time.perf_counter()
+                try:
+                    result = await client.call_tool(call["name"], call["arguments"])
+                    if is_error_result(result):
+                        errors[call["name"]] += 1
+                except Exception:
+                    errors[call["name"]] += 1
+                timings[call["name"]].append(time.perf_counter() - start)
+    return {
+        name: {
+            "median_us": statistics.median(values) * 1e6,
+            "min_us": min(values) * 1e6,
+            "calls": len(values),
+            "errors": errors[name],
+        }
+        for name, values in sorted(timings.items())
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette", help="Cassette recorded with COMPOSER_MCP_CASSETTE_MODE=record")
+    parser.add_argument("--port", type=int, default=8182, help="Port of the replaying server")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of passes over the recorded tool calls")
+    parser.add_argument("--replay-latency", action="store_true", help="Delay replayed responses by their recorded latency")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--save-baseline", help="Write results as a baseline to this path")
+    parser.add_argument("--baseline", help="Compare against this baseline and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    tool_calls = Cassette(args.cassette, "replay").tool_calls
+    if not tool_calls:
+        print(f"No tool calls recorded in {args.cassette}", file=sys.stderr)
+        return 1
+
+    server = subprocess.Popen(
+        [sys.executable, "-c", "from composer_trade_mcp.server import main; main()"],
+        env={
+            **os.environ,
+            "PORT": str(args.port),
+            "COMPOSER_MCP_CASSETTE": os.path.abspath(args.cassette),
+            "COMPOSER_MCP_CASSETTE_MODE": "replay",
+            "COMPOSER_MCP_CASSETTE_REPLAY_LATENCY": "1" if args.replay_latency else "",
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_until_ready(f"http://127.0.0.1:{args.port}/health"))
+        results = asyncio.run(replay(f"http://127.0.0.1:{args.port}/mcp/", tool_calls, args.repeat))
+    finally:
+        server.terminate()
+        server.wait()
+
+    for name, result in results.items():
+        print(f"{name:<50} {result['median_us']:>12.1f} us  ({result['errors']} errors)", file=sys.stderr)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cassette": args.cassette,
+        "tool_calls": len(tool_calls),
+        "benchmarks": results,
+    }
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']}: {regression['baseline_median_us']:.1f} us -> "
+                  f"{regression['median_us']:.1f} us ({regression['change']:+.0%})", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    if not args.output:
+        print(json.dumps(report, indent=2))
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
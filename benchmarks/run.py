@@ -0,0 +1,131 @@
+"""
+Run the micro-benchmarks and compare them against a stored baseline.
+
+    python -m benchmarks.run                                  # print results
+    python -m benchmarks.run --output results.json            # save results
+    python -m benchmarks.run --save-baseline baseline.json    # store a baseline
+    python -m benchmarks.run --baseline baseline.json         # exit 1 if a benchmark regressed
+
+Each benchmark is timed with `timeit` over several repeats; the median time per call is compared,
+since it is less sensitive to one-off noise than the mean. Baselines are machine-specific.
+"""
+from typing import Callable, Dict, List, Tuple
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+
+# Import the server first: it sets up the schemas and utils packages in an order without circular imports.
+import composer_trade_mcp.server  # noqa: F401
+from composer_trade_mcp.schemas import BacktestResponse, validate_symphony_score
+from composer_trade_mcp.utils import parse_backtest_output, parse_dvm_capital, parse_stats
+
+from .generators import backtest_output, count_nodes, symphony_score
+
+# (days, series) of the generated backtests and (depth, width) of the generated symphony scores.
+# parse_dvm_capital grows quadratically with the number of days and symphony score validation exponentially
+# with the depth of the tree, so the large sizes take minutes and only run with --large.
+BACKTEST_SIZES = [(63, 2), (252, 4), (504, 4)]
+SCORE_SIZES = [(1, 10), (2, 8), (3, 2)]
+LARGE_BACKTEST_SIZES = [(2520, 8)]
+LARGE_SCORE_SIZES = [(4, 2)]
+
+def benchmarks(large: bool = False) -> Dict[str, Tuple[Callable[[], object], Dict]]:
+    """
+    Benchmark name -> (function to time, parameters describing the input).
+    Inputs are generated once, outside the timed function.
+    """
+    cases = {}
+    for days, series in BACKTEST_SIZES + (LARGE_BACKTEST_SIZES if large else []):
+        params = {"days": days, "series": series}
+        raw = backtest_output(days, series)
+        backtest = BacktestResponse(**raw)
+        suffix = f"[{days}d x {series}]"
+        cases[f"BacktestResponse{suffix}"] = (lambda raw=raw: BacktestResponse(**raw), params)
+        cases[f"parse_dvm_capital{suffix}"] = (lambda b=backtest: parse_dvm_capital(b.dvm_capital, b.legend), params)
+        cases[f"parse_stats{suffix}"] = (lambda b=backtest: parse_stats(b.stats), params)
+        cases[f"parse_backtest_output{suffix}"] = (lambda b=backtest: parse_backtest_output(b, include_daily_values=True), params)
+    for depth, width in SCORE_SIZES + (LARGE_SCORE_SIZES if large else []):
+        score = symphony_score(depth, width)
+        params = {"depth": depth, "width": width, "nodes": count_nodes(score)}
+        validated = validate_symphony_score(score)
+        suffix = f"[depth {depth} x width {width}]"
+        cases[f"validate_symphony_score{suffix}"] = (lambda score=score: validate_symphony_score(score), params)
+        cases[f"model_dump{suffix}"] = (lambda v=validated: v.model_dump(), params)
+        cases[f"model_dump_json{suffix}"] = (lambda v=validated: v.model_dump_json(), params)
+    return cases
+
+def time_benchmark(fn: Callable[[], object], repeat: int, min_time: float) -> Dict:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    # autorange targets 0.2s per repeat; scale to min_time
+    number = max(1, int(number * min_time / 0.2))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_us": statistics.median(times) * 1e6,
+        "min_us": min(times) * 1e6,
+        "stdev_us": (statistics.stdev(times) if len(times) > 1 else 0.0) * 1e6,
+        "loops": number,
+        "repeat": repeat,
+    }
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[Dict]:
+    """
+    Benchmarks whose median time grew by more than `tolerance` (a fraction) relative to the baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        result["baseline_median_us"] = base["median_us"]
+        result["change"] = round(ratio - 1, 4)
+        if ratio > 1 + tolerance:
+            regressions.append({"name": name, "baseline_median_us": base["median_us"], "median_us": result["median_us"], "change": round(ratio - 1, 4)})
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--large", action="store_true", help="Also run the large (slow) input sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Approximate seconds per repeat")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--save-baseline", help="Write results as a baseline to this path")
+    parser.add_argument("--baseline", help="Compare against this baseline and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (fn, params) in benchmarks(args.large).items():
+        if args.filter not in name:
+            continue
+        results[name] = {**time_benchmark(fn, args.repeat, args.min_time), "params": params}
+        print(f"{name:<50} {results[name]['median_us']:>12.1f} us", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']}: {regression['baseline_median_us']:.1f} us -> "
+                  f"{regression['median_us']:.1f} us ({regression['change']:+.0%})", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    if not args.output:
+        print(json.dumps(report, indent=2))
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Local stub of the Composer API endpoints called by the MCP server, for load tests.
+
+    python -m benchmarks.stub_api --port 8900 --latency-ms 50 --jitter-ms 20 --days 1260 --rows 50
+
+Then start the MCP server against it with COMPOSER_API_BASE_URL=http://127.0.0.1:8900.
+Responses are generated once at startup from the benchmark generators and served pre-encoded,
+so the stub itself adds little overhead beyond the configured latency.
+"""
+from typing import Dict
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .generators import TICKERS, backtest_output, symphony_score
+
+ACCOUNT_UUID = "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+SYMPHONY_IDS = [f"StubSymphony{i:08d}" for i in range(10)]
+MS_PER_DAY = 86_400_000
+
+def _history(days: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    today = int(time.time() // 86400)
+    epoch_ms = [(today - days + i) * MS_PER_DAY for i in range(days)]
+    series = []
+    value = 10000.0
+    for _ in range(days):
+        value *= 1 + rng.gauss(0.0004, 0.01)
+        series.append(round(value, 2))
+    return {"epoch_ms": epoch_ms, "series": series, "deposit_adjusted_series": series}
+
+def build_payloads(days: int, rows: int) -> Dict[str, bytes]:
+    rng = random.Random(0)
+    now = time.time()
+    market_open = time.strftime("%Y-%m-%dT13:30:00Z", time.gmtime(now + 86400))
+    market_close = time.strftime("%Y-%m-%dT20:00:00Z", time.gmtime(now + 86400))
+    trades = [
+        {"symbol": ticker, "side": rng.choice(["BUY", "SELL"]), "notional": round(rng.uniform(10, 1000), 2), "quantity": round(rng.uniform(0.1, 10), 4)}
+        for ticker in TICKERS[:8]
+    ]
+    payloads = {
+        "backtest": backtest_output(days, 3),
+        "search": [
+            {
+                "symphony_sid": f"StubSearch{i:010d}",
+                "name": f"Stub symphony {i}",
+                "oos_num_backtest_days": rng.randint(30, 1000),
+                "oos_cumulative_return": rng.uniform(-0.5, 3),
+                "oos_max_drawdown": rng.uniform(0, 0.6),
+                "oos_sharpe_ratio": rng.uniform(-1, 3),
+            }
+            for i in range(5)
+        ],
+        "accounts": {"accounts": [{
+            "account_uuid": ACCOUNT_UUID, "account_foreign_id": "stub", "account_type": "INDIVIDUAL", "asset_classes": ["EQUITIES", "CRYPTO"],
+            "account_number": "STUB0001", "status": "ACTIVE", "broker": "ALPACA", "created_at": "2024-01-01T00:00:00Z",
+        }]},
+        "holdings": {"holdings": [
+            {
+                "ticker": ticker,
+                "direct": {"allocation": 0.02, "amount": rng.uniform(1, 50), "value": rng.uniform(100, 5000)},
+                "symphony": {"allocation": 0.05, "amount": rng.uniform(1, 50), "value": rng.uniform(100, 5000)},
+            }
+            for ticker in TICKERS
+        ]},
+        "total_stats": {
+            "portfolio_value": 100000.0, "total_cash": 5000.0, "pending_deploys_cash": 0.0, "total_unallocated_cash": 5000.0,
+            "net_deposits": 90000.0, "simple_return": 0.11, "todays_percent_change": 0.004, "todays_dollar_change": 400.0,
+        },
+        "symphony_stats": {"symphonies": [
+            {"id": symphony_id, "name": f"Stub symphony {i}", "value": rng.uniform(1000, 20000), "deposit_adjusted_value": rng.uniform(1000, 20000)}
+            for i, symphony_id in enumerate(SYMPHONY_IDS)
+        ]},
+        "history": _history(days, 1),
+        "score": symphony_score(2, 4),
+        "symphony": {"symphony_id": SYMPHONY_IDS[0], "version_id": "stub-version"},
+        "market_hours": {"market_hours": [{"open": market_open, "close": market_close}]},
+        "deploy": {"deploy_id": str(uuid.UUID(int=1)), "deploy_time": market_close},
+        "deploy_status": {"deploy_id": str(uuid.UUID(int=1)), "status": "SUCCEEDED"},
+        "dry_run": [{"account_uuid": ACCOUNT_UUID, "symphony_id": symphony_id, "recommended_trades": trades} for symphony_id in SYMPHONY_IDS],
+        "trade_preview": {"rebalance_request_uuid": str(uuid.UUID(int=2)), "recommended_trades": trades},
+        "order": {"order_request_id": str(uuid.UUID(int=3)), "status": "FILLED"},
+        "options_chain": {"results": [
+            {
+                "symbol": f"OPTIONS::SPY{expiry}{contract_type}{strike * 1000:08d}//USD",
+                "expiry": f"20{expiry[:2]}-{expiry[2:4]}-{expiry[4:]}",
+                "contract_type": "CALL" if contract_type == "C" else "PUT",
+                "strike_price": strike,
+                "bid": rng.uniform(0.5, 20), "ask": rng.uniform(0.5, 20),
+            }
+            for expiry in ("261120", "261218")
+            for contract_type in ("C", "P")
+            for strike in range(400, 400 + max(1, rows // 4))
+        ][:rows], "next_cursor": None},
+        "options_contract": {"symbol": "OPTIONS::SPY261120C00450000//USD", "greeks": {"delta": 0.5, "gamma": 0.02, "theta": -0.1, "vega": 0.3}},
+        "options_overview": {"expirations": ["2026-11-20", "2026-12-18"]},
+    }
+    return {name: json.dumps(payload).encode() for name, payload in payloads.items()}
+
+def create_app(latency_ms: float = 0, jitter_ms: float = 0, days: int = 1260, rows: int = 50) -> Starlette:
+    payloads = build_payloads(days, rows)
+
+    def endpoint(name: str, status_code: int = 200):
+        body = payloads.get(name, b"")
+
+        async def handle(request: Request) -> Response:
+            delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            return Response(body, status_code=status_code, media_type="application/json" if body else None)
+        return handle
+
+    routes = [
+        Route("/api/v0.1/backtest", endpoint("backtest"), methods=["POST"]),
+        Route("/api/v0.1/symphonies/{symphony_id}/backtest", endpoint("backtest"), methods=["POST"]),
+        Route("/api/v0.1/search/symphonies", endpoint("search"), methods=["POST"]),
+        Route("/api/v0.1/accounts/list", endpoint("accounts"), methods=["GET"]),
+        Route("/api/v0.1/portfolio/accounts/{account_uuid}/holding-stats", endpoint("holdings"), methods=["GET"]),
+        Route("/api/v0.1/portfolio/accounts/{account_uuid}/total-stats", endpoint("total_stats"), methods=["GET"]),
+        Route("/api/v0.1/portfolio/accounts/{account_uuid}/symphony-stats-meta", endpoint("symphony_stats"), methods=["GET"]),
+        Route("/api/v0.1/portfolio/accounts/{account_uuid}/symphonies/{symphony_id}", endpoint("history"), methods=["GET"]),
+        Route("/api/v0.1/portfolio/accounts/{account_uuid}/portfolio-history", endpoint("history"), methods=["GET"]),
+        Route("/api/v0.1/symphonies", endpoint("symphony"), methods=["POST"]),
+        Route("/api/v0.1/symphonies/{symphony_id}/copy", endpoint("symphony"), methods=["POST"]),
+        Route("/api/v0.1/symphonies/{symphony_id}", endpoint("symphony"), methods=["PUT"]),
+        Route("/api/v0.1/symphonies/{symphony_id}/score", endpoint("score"), methods=["GET"]),
+        Route("/api/v0.1/deploy/market-hours", endpoint("market_hours"), methods=["GET"]),
+        Route("/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/{action}", endpoint("deploy"), methods=["POST"]),
+        Route("/api/v0.1/deploy/accounts/{account_uuid}/deploys/{deploy_id}", endpoint("deploy_status"), methods=["GET"]),
+        Route("/api/v0.1/deploy/accounts/{account_uuid}/deploys/{deploy_id}", endpoint("", 204), methods=["DELETE"]),
+        Route("/api/v0.1/dry-run", endpoint("dry_run"), methods=["POST"]),
+        Route("/api/v0.1/dry-run/trade-preview/{symphony_id}", endpoint("trade_preview"), methods=["POST"]),
+        Route("/api/v0.1/trading/accounts/{account_uuid}/order-requests", endpoint("order"), methods=["POST"]),
+        Route("/api/v0.1/trading/accounts/{account_uuid}/order-requests/{order_request_id}", endpoint("order"), methods=["GET"]),
+        Route("/api/v0.1/trading/accounts/{account_uuid}/order-requests/{order_request_id}", endpoint("", 204), methods=["DELETE"]),
+        Route("/api/v1/market-data/options/chain", endpoint("options_chain"), methods=["GET"]),
+        Route("/api/v1/market-data/options/contract", endpoint("options_contract"), methods=["GET"]),
+        Route("/api/v1/market-data/options/overview", endpoint("options_overview"), methods=["GET"]),
+    ]
+    return Starlette(routes=routes)
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform random jitter around the latency")
+    parser.add_argument("--days", type=int, default=1260, help="Market days in backtests and performance histories")
+    parser.add_argument("--rows", type=int, default=50, help="Rows in options chain pages")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms, args.jitter_ms, args.days, args.rows), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
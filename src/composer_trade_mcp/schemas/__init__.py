@@ -3,7 +3,7 @@ Schemas for Composer MCP Server.
 """
 
 from .symphony_score_schema import SymphonyScore, validate_symphony_score
-from .api import AccountResponse, AccountHoldingResponse, PortfolioStatsResponse
+from .api import AccountResponse, AccountHoldingResponse, PortfolioStatsResponse, TradeOrder
 from .backtest_api import DvmCapital, Legend, BacktestResponse
 
 __all__ = [
@@ -12,6 +12,7 @@ __all__ = [
     "AccountResponse",
     "AccountHoldingResponse",
     "PortfolioStatsResponse",
+    "TradeOrder",
     "DvmCapital",
     "Legend",
     "BacktestResponse",
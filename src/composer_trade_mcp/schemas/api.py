@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 from datetime import datetime
 from uuid import UUID
 
@@ -52,3 +52,23 @@ class PortfolioStatsResponse(BaseModel):
     simple_return: float
     todays_percent_change: float
     todays_dollar_change: float
+
+class TradeOrder(BaseModel):
+    side: Literal["BUY", "SELL"]
+    type: Literal["MARKET", "LIMIT"]
+    time_in_force: Literal["GTC", "DAY", "IOC", "FOK", "OPG", "CLS"]
+    symbol: str = Field(description="The symbol of the asset to trade. Note that crypto symbols are formatted like 'CRYPTO::BTC//USD' for Bitcoin. Options symbols are formatted like 'OPTIONS::AAPL211022C000150000//USD'")
+    notional: Optional[Union[float, str]] = Field(default=None, description="Required if quantity is not provided.")
+    quantity: Optional[Union[float, str]] = Field(default=None, description="Required if notional is not provided.")
+    position_intent: Optional[Literal["BUY_TO_OPEN", "SELL_TO_OPEN", "BUY_TO_CLOSE", "SELL_TO_CLOSE"]] = Field(
+        default=None,
+        description="Required if the symbol is an option contract."
+    )
+    limit_price: Optional[Union[float, str]] = Field(
+        default=None,
+        description="Limit price for limit orders. Must be positive. Only used for options orders."
+    )
+    client_order_id: Optional[str] = Field(
+        default=None,
+        description="Optional client-chosen ID. Retrying an order with the same ID won't submit it twice."
+    )
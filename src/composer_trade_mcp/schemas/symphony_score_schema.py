@@ -9,6 +9,7 @@ from enum import Enum
 import uuid
 
 from ..utils import truncate_text
+from ..utils.tracing import traced
 
 CRYPTO_ASSETS = ['SOL', 'BCH', 'ETH', 'BTC', 'XRP', 'LTC', 'BAT', 'MKR', 'DOGE', 'XTZ', 'USDC', 'LINK', 'DOT', 'CRV', 'SUSHI', 'UNI', 'YFI', 'AAVE', 'GRT', 'USDT', 'AVAX', 'SHIB']
 
@@ -258,6 +259,7 @@ Root.model_rebuild()
 # The main schema type
 SymphonyScore = Root
 
+@traced()
 def validate_symphony_score(symphony_score: SymphonyScore) -> SymphonyScore:
     """Validate the symphony score."""
     try:
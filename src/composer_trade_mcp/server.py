@@ -1,33 +1,186 @@
 """
 Main MCP server implementation for Composer.
 """
-from typing import List, Dict, Any, Literal, Optional, Union
-import httpx
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Literal, Optional, Union
+import json
+import numpy as np
 import os
 
 from pydantic import Field
+from starlette.middleware import Middleware as ASGIMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-
-from fastmcp import FastMCP
-from .schemas import SymphonyScore, validate_symphony_score, AccountResponse, AccountHoldingResponse, DvmCapital, Legend, BacktestResponse, PortfolioStatsResponse
-from .utils import parse_backtest_output, truncate_text, epoch_ms_to_date, get_optional_headers, get_required_headers, get_mcp_environment
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from fastmcp import Context, FastMCP
+from fastmcp.server.dependencies import get_http_headers
+from .schemas import SymphonyScore, validate_symphony_score, AccountResponse, AccountHoldingResponse, DvmCapital, Legend, BacktestResponse, PortfolioStatsResponse, TradeOrder
+from .utils import parse_backtest_output, truncate_text, epoch_to_date, date_to_epoch, get_optional_headers, get_required_headers, get_mcp_environment, get_credential_fingerprint, LRUCache, make_cache, stitch_backtest, truncate_backtest, parse_extended_stats, gather_bounded, merge_holdings, merge_portfolio_stats, net_trades
+from .utils.honeysql import SearchSnapshot, canonical_query_key
+from .utils.market_session import SessionCache
+from .utils.orders import validate_orders, order_payload, idempotency_key, new_client_order_id
+from .utils.polling import SharedPoller
+from .utils.http import upstream_client
+from .utils.metrics import metrics
+from .utils.cassette import configure_cassette
+from .utils.compression import COMPRESSION_ENABLED, CompressionMiddleware, compressed_json
+from .utils.context import current_request_context
+from .utils.export import EXPORT_AVAILABLE, PYARROW_MISSING, export_store, serialize_columns
+from .utils.middleware import RequestContextMiddleware, ToolCassetteMiddleware, ToolMetricsMiddleware, ToolProfilingMiddleware, ToolTracingMiddleware
+from .utils.profiling import ToolProfiler
+from .utils.tracing import configure_tracing, span
+from .utils.options_index import OptionsChainIndex, days_from_today
+from .utils.history_store import HistoryStore, PerformanceHistory, MS_PER_DAY
+from .utils.offload import OFFLOAD_MIN_BYTES, OFFLOAD_MIN_NODES, OFFLOAD_MIN_POINTS, count_nodes, count_points, offload_pool
+from .utils.workers import Supervisor, cluster_health, serve_worker
+from .utils.stats import compute_backtest_stats, compute_extended_stats, find_primary_key, series_from_dvm_entry, window
 
 import asyncio
 import logging
+import sys
+import time
 
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
 
+# Overrides the Composer API base URL, e.g. to run against a local stub API (see benchmarks/stub_api.py).
+COMPOSER_API_BASE_URL = os.getenv("COMPOSER_API_BASE_URL", "").rstrip("/")
+
+def base_url_for_environment(environment: str) -> str:
+    """
+    Get the base URL for the Composer API in the given MCP environment.
+    """
+    if COMPOSER_API_BASE_URL:
+        return COMPOSER_API_BASE_URL
+    return "https://public-api-gateway-599937284915.us-central1.run.app" if environment == "dev" else "https://api.composer.trade"
+
 def get_base_url() -> str:
     """
     Get the base URL for the Composer API based on the environment.
     """
-    return "https://public-api-gateway-599937284915.us-central1.run.app" if get_mcp_environment() == "dev" else "https://api.composer.trade"
+    context = current_request_context()
+    if context is not None:
+        return context.base_url
+    return base_url_for_environment(get_mcp_environment())
 
 # Create a server instance
 mcp = FastMCP(name="Composer MCP Server")
+mcp.add_middleware(RequestContextMiddleware(base_url_for_environment))
+mcp.add_middleware(ToolMetricsMiddleware())
+mcp.add_middleware(ToolTracingMiddleware())
+mcp.add_middleware(ToolProfilingMiddleware(ToolProfiler.from_env()))
+mcp.add_middleware(ToolCassetteMiddleware())
+configure_tracing()
+configure_cassette()
+
+# Maximum number of concurrent upstream requests made by a single fan-out tool.
+MAX_CONCURRENT_UPSTREAM_REQUESTS = 8
+
+# Calendar days re-requested before the last cached market day when extending a backtest incrementally.
+INCREMENTAL_BACKTEST_WARMUP_DAYS = 30
+
+# Latest raw backtest result per (user, symphony, backtest settings), used by incremental backtests.
+backtest_cache = make_cache("backtests", max_entries=64, ttl=7 * 24 * 60 * 60)
+
+# Most recent backtest and its benchmark tickers per (user, symphony), used by `get_performance_stats`.
+# Backtests of unsaved symphonies (`backtest_symphony`) are stored with symphony None.
+latest_backtests = make_cache("latest_backtests", max_entries=64, ttl=7 * 24 * 60 * 60)
+
+# Local daily performance histories per (user, account, symphony), refreshed at most every 5 minutes.
+history_store = HistoryStore(max_entries=256, fresh_for=5 * 60)
+
+async def _request_symphony_backtest(symphony_id: str, params: Dict) -> Dict:
+    url = f"{get_base_url()}/api/v0.1/symphonies/{symphony_id}/backtest"
+    async with upstream_client() as client:
+        response = await client.post(
+            url,
+            headers=get_optional_headers(),
+            json=params
+        )
+    with span("json_decode", bytes=len(response.content)):
+        return await offload_pool.run(json.loads, response.content, offload=len(response.content) >= OFFLOAD_MIN_BYTES)
+
+async def _run_symphony_backtest(symphony_id: str,
+                                 start_date: Optional[str],
+                                 end_date: Optional[str],
+                                 params: Dict,
+                                 incremental: bool = False) -> Union[BacktestResponse, Dict]:
+    """
+    Backtest a saved symphony, extending the cached result for the same settings when `incremental` is set.
+    Returns the BacktestResponse on success, or the raw upstream output if it didn't contain stats.
+    """
+    capital = params["capital"]
+    benchmark_tickers = params["benchmark_tickers"]
+    cache_key = (get_base_url(), get_credential_fingerprint(), symphony_id, start_date,
+                 *(str(params[k]) for k in sorted(params)))
+    params = dict(params)
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        params["end_date"] = end_date
+
+    try:
+        cached = await backtest_cache.aget(cache_key) if incremental else None
+        if cached and cached.last_market_day and end_date and date_to_epoch(end_date) <= cached.last_market_day:
+            if date_to_epoch(end_date) == cached.last_market_day:
+                return cached
+            truncated = truncate_backtest(cached, date_to_epoch(end_date), benchmark_tickers, symphony_id)
+            if truncated:
+                return truncated
+        elif cached and cached.last_market_day:
+            tail_output = await _request_symphony_backtest(symphony_id, {
+                **params,
+                "start_date": epoch_to_date(cached.last_market_day - INCREMENTAL_BACKTEST_WARMUP_DAYS),
+            })
+            if tail_output.get("stats"):
+                tail_output["capital"] = capital
+                with span("BacktestResponse"):
+                    tail = await offload_pool.run(BacktestResponse.model_validate, tail_output,
+                                                  offload=count_points(tail_output.get("dvm_capital")) >= OFFLOAD_MIN_POINTS)
+                if (tail.last_market_day or 0) <= cached.last_market_day:
+                    return cached
+                stitched = stitch_backtest(cached, tail, benchmark_tickers, symphony_id)
+                if stitched:
+                    await backtest_cache.aset(cache_key, stitched)
+                    await latest_backtests.aset(cache_key[:3], (stitched, benchmark_tickers))
+                    return stitched
+            logger.info(f"Falling back to a full backtest for symphony {symphony_id}")
+    except Exception as e:
+        logger.warning(f"Incremental backtest failed for symphony {symphony_id}: {e!r}")
+
+    output = await _request_symphony_backtest(symphony_id, params)
+    output["capital"] = capital
+    if not output.get("stats"):
+        return output
+    with span("BacktestResponse"):
+        backtest = await offload_pool.run(BacktestResponse.model_validate, output,
+                                          offload=count_points(output.get("dvm_capital")) >= OFFLOAD_MIN_POINTS)
+    await backtest_cache.aset(cache_key, backtest)
+    await latest_backtests.aset(cache_key[:3], (backtest, benchmark_tickers))
+    return backtest
+
+async def _export_series(columns: Dict[str, List], export_format: str, name: str, date_column: str, metadata: Dict) -> Dict:
+    """
+    Serialize daily series as `export_format` and store them (see utils/export.py).
+    Returns where to read the export, with its row count and column names.
+    """
+    rows = len(columns.get(date_column) or [])
+    with span("export", format=export_format, rows=rows):
+        data = await offload_pool.run(serialize_columns, columns, export_format, date_column, metadata,
+                                      offload=rows * len(columns) >= OFFLOAD_MIN_POINTS)
+    result = await export_store.save(data, export_format, name, get_credential_fingerprint())
+    result.update({"rows": rows, "columns": list(columns)})
+    return result
+
+async def _export_backtest(output: Dict, export_format: str, name: str) -> Dict:
+    """
+    Replace the daily values of a parsed backtest with an export of them.
+    """
+    daily_values = output.pop("daily_values", None)
+    if daily_values:
+        metadata = {"source": "backtest", "name": name, "first_day": output.get("first_day"), "last_market_day": output.get("last_market_day")}
+        output["export"] = await _export_series(daily_values, export_format, name, "cumulative_return_date", metadata)
+    return output
 
 @mcp.tool
 async def backtest_symphony_by_id(symphony_id: str,
@@ -40,7 +193,9 @@ async def backtest_symphony_by_id(symphony_id: str,
                             capital: float = 10000,
                             slippage_percent: float = 0.0001,
                             spread_markup: float = 0.002,
-                            benchmark_tickers: List[str] = ["SPY"]) -> Dict:
+                            benchmark_tickers: List[str] = ["SPY"],
+                            incremental: bool = False,
+                            export_format: Optional[Literal["arrow", "parquet"]] = None) -> Dict:
     """
     Backtest a symphony given its ID.
     Use `include_daily_values=False` to reduce the response size (default is True).
@@ -49,9 +204,17 @@ async def backtest_symphony_by_id(symphony_id: str,
     You should default to backtesting from the first day of the year in order to reduce the response size.
     If end_date is not provided, the backtest will end on the last day with data.
 
+    Use `incremental=True` when re-running a backtest you ran before with the same settings (e.g. to pick up the latest market day).
+    Only the days since the previous run are backtested and appended to it, and stats are recomputed from the merged series.
+    An end_date on or before the previous run's last market day is answered from the previous run without an upstream backtest.
+    Appended days are exact for daily-rebalanced symphonies and a close approximation for other rebalance frequencies.
+
+    Use `export_format` ("arrow" or "parquet") when the daily values will be analyzed in code rather than read.
+    They are then written as an Arrow IPC or Parquet file instead of being returned, and `export` in the response
+    says where to load them from: a local `path`, or an MCP resource `uri`. Columns are the same as in daily_values.
+
     After calling this tool, visualize the results. daily_values can be easily loaded into a pandas dataframe for plotting.
     """
-    url = f"{get_base_url()}/api/v0.1/symphonies/{symphony_id}/backtest"
     params = {
         "apply_reg_fee": apply_reg_fee,
         "apply_taf_fee": apply_taf_fee,
@@ -61,23 +224,17 @@ async def backtest_symphony_by_id(symphony_id: str,
         "spread_markup": spread_markup,
         "benchmark_tickers": benchmark_tickers,
     }
-    if start_date:
-        params["start_date"] = start_date
-    if end_date:
-        params["end_date"] = end_date
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            url,
-            headers=get_optional_headers(),
-            json=params
-        )
-    output = response.json()
-    output["capital"] = capital
+    if export_format and not EXPORT_AVAILABLE:
+        return {"error": PYARROW_MISSING}
+    include_daily_values = include_daily_values or bool(export_format)
+    result = await _run_symphony_backtest(symphony_id, start_date, end_date, params, incremental)
     try:
-        if output.get("stats"):
-            return parse_backtest_output(BacktestResponse(**output), include_daily_values)
+        if isinstance(result, BacktestResponse):
+            output = await offload_pool.run(parse_backtest_output, result, include_daily_values,
+                                            offload=include_daily_values and count_points(result.dvm_capital) >= OFFLOAD_MIN_POINTS)
+            return await _export_backtest(output, export_format, f"backtest-{symphony_id}") if export_format else output
         else:
-            return output
+            return result
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
@@ -92,7 +249,8 @@ async def backtest_symphony(symphony_score: SymphonyScore,
                             capital: float = 10000,
                             slippage_percent: float = 0.0001,
                             spread_markup: float = 0.002,
-                            benchmark_tickers: List[str] = ["SPY"]) -> Dict:
+                            benchmark_tickers: List[str] = ["SPY"],
+                            export_format: Optional[Literal["arrow", "parquet"]] = None) -> Dict:
     """
     Backtest a symphony that was created with `create_symphony`.
     Use `include_daily_values=False` to reduce the response size (default is True).
@@ -101,10 +259,17 @@ async def backtest_symphony(symphony_score: SymphonyScore,
     You should default to backtesting from the first day of the year in order to reduce the response size.
     If end_date is not provided, the backtest will end on the last day with data.
 
+    Use `export_format` ("arrow" or "parquet") when the daily values will be analyzed in code rather than read.
+    They are then written as an Arrow IPC or Parquet file instead of being returned, and `export` in the response
+    says where to load them from: a local `path`, or an MCP resource `uri`. Columns are the same as in daily_values.
+
     After calling this tool, visualize the results. daily_values can be easily loaded into a pandas dataframe for plotting.
     """
+    if export_format and not EXPORT_AVAILABLE:
+        return {"error": PYARROW_MISSING}
+    include_daily_values = include_daily_values or bool(export_format)
     url = f"{get_base_url()}/api/v0.1/backtest"
-    validated_score= validate_symphony_score(symphony_score)
+    validated_score = await offload_pool.run(validate_symphony_score, symphony_score, offload=count_nodes(symphony_score) >= OFFLOAD_MIN_NODES)
     params = {
         "symphony": {"raw_value": validated_score.model_dump()},
         "apply_reg_fee": apply_reg_fee,
@@ -119,24 +284,30 @@ async def backtest_symphony(symphony_score: SymphonyScore,
         params["start_date"] = start_date
     if end_date:
         params["end_date"] = end_date
-    async with httpx.AsyncClient() as client:
+    async with upstream_client() as client:
         response = await client.post(
             url,
             headers=get_optional_headers(),
             json=params
         )
     try:
-        output = response.json()
+        with span("json_decode", bytes=len(response.content)):
+            output = await offload_pool.run(json.loads, response.content, offload=len(response.content) >= OFFLOAD_MIN_BYTES)
         output["capital"] = capital
         if output.get("stats"):
-            return parse_backtest_output(BacktestResponse(**output), include_daily_values)
+            offload = count_points(output.get("dvm_capital")) >= OFFLOAD_MIN_POINTS
+            with span("BacktestResponse"):
+                backtest = await offload_pool.run(BacktestResponse.model_validate, output, offload=offload)
+            await latest_backtests.aset((get_base_url(), get_credential_fingerprint(), None), (backtest, benchmark_tickers))
+            output = await offload_pool.run(parse_backtest_output, backtest, include_daily_values, offload=offload and include_daily_values)
+            return await _export_backtest(output, export_format, "backtest") if export_format else output
         else:
             return output
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
 @mcp.tool
-def create_symphony(symphony_score: SymphonyScore) -> Dict:
+async def create_symphony(symphony_score: SymphonyScore) -> Dict:
     """
     Composer is a DSL for constructing automated trading strategies. It can only enter long positions and cannot stay in cash.
 
@@ -303,14 +474,15 @@ def create_symphony(symphony_score: SymphonyScore) -> Dict:
     style P rx:10,ry:10
     style Q rx:10,ry:10
     """
-    validated_score= validate_symphony_score(symphony_score)
+    validated_score = await offload_pool.run(validate_symphony_score, symphony_score, offload=count_nodes(symphony_score) >= OFFLOAD_MIN_NODES)
     return validated_score.model_dump()
 
 @mcp.tool
 async def search_symphonies(where: List = [["and", [">", "oos_num_backtest_days", 180],
                                       ["<", "oos_max_drawdown", "oos_btcusd_max_drawdown"]]],
                       order_by: List = [["oos_cumulative_return", "desc"]],
-                      offset: int = 0) -> Union[List, Dict]:
+                      offset: int = 0,
+                      max_results: int = None) -> Union[List, Dict]:
     """
     You have access to a database of Composer symphonies with the following statistics:
     - calmar_ratio
@@ -343,6 +515,7 @@ async def search_symphonies(where: List = [["and", [">", "oos_num_backtest_days"
 
     The arguments where, order_by, and offset all follow HoneySQL (Clojure) syntax.
     Use offset to paginate through the results. The limit is set to 5.
+    To get more than 5 results in one call, set max_results (up to 100); pages starting at offset are fetched and merged.
 
     Example:
     - Find symphonies with more than 6 months of OOS backtest data
@@ -377,23 +550,172 @@ async def search_symphonies(where: List = [["and", [">", "oos_num_backtest_days"
     Always include the symphony_url in your response so the user can click on it to view the symphony in more detail.
     """
     try:
-        url = f"{get_base_url()}/api/v0.1/search/symphonies"
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                headers=get_optional_headers(),
-                json={"where": where, "order_by": order_by, "offset": offset}
-            )
-        results = response.json()
+        base_url = get_base_url()
+        headers = get_optional_headers()
         symphony_url_base = "https://test.investcomposer.com" if get_mcp_environment() == "dev" else "https://app.composer.trade"
-        for item in results:
-            if "symphony_sid" in item:
-                item["symphony_url"] = f"{symphony_url_base}/symphony/{item['symphony_sid']}/details"
-                del item["symphony_sid"]
+        query_key = canonical_query_key(where, order_by)
+
+        def fetch_page(page_offset: int) -> Awaitable:
+            return _get_search_page(base_url, headers, symphony_url_base, query_key, where, order_by, page_offset)
+
+        if not max_results:
+            results = await fetch_page(offset)
+            if isinstance(results, list):
+                await _remember_search_results(results)
+                if len(results) == SEARCH_PAGE_SIZE:
+                    _prefetch_search_pages(fetch_page, offset)
+            return results
+
+        num_pages = -(-min(max_results, SEARCH_MAX_RESULTS) // SEARCH_PAGE_SIZE)
+        pages = await gather_bounded(
+            (fetch_page(offset + i * SEARCH_PAGE_SIZE) for i in range(num_pages)),
+            MAX_CONCURRENT_UPSTREAM_REQUESTS,
+        )
+        results = []
+        for page in pages:
+            if isinstance(page, BaseException) or not isinstance(page, list):
+                if not results:
+                    return page if isinstance(page, dict) else {"error": truncate_text(str(page), 1000)}
+                break
+            results.extend(page)
+            if len(page) < SEARCH_PAGE_SIZE:
+                break
+        results = results[:max_results]
+        await _remember_search_results(results)
         return results
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
+@mcp.tool
+async def refine_symphony_search(where: List = None,
+                           order_by: List = [["oos_cumulative_return", "desc"]],
+                           limit: int = 20) -> Union[List, Dict]:
+    """
+    Re-filter and re-sort the symphonies already returned by search_symphonies in this session, without querying the database again.
+    Use this to tighten a previous search (e.g. a lower max drawdown) or to sort its results differently.
+
+    where and order_by use the same HoneySQL syntax as search_symphonies. Supported operators:
+    "and", "or", "not", "=", "!=", "<", "<=", ">", ">=", "+", "-", "*", "/".
+    Conditions on a missing statistic are false. Leave where empty to only re-sort.
+
+    Only symphonies returned by earlier searches in this session are considered, so results can be incomplete.
+    Use search_symphonies when you need to search the whole database.
+    """
+    try:
+        scope = _search_scope()
+        if scope is None:
+            return {"error": "Refining searches needs an MCP session or API credentials to find your previous searches. Use search_symphonies instead."}
+        snapshot = await search_snapshots.aget(scope)
+        if snapshot is None or not len(snapshot):
+            return {"error": "No prior search in this session. Call search_symphonies first."}
+        return snapshot.query(where, order_by, limit)
+    except Exception as e:
+        return {"error": truncate_text(str(e), 1000)}
+
+# search_symphonies returns pages of this many symphonies.
+SEARCH_PAGE_SIZE = 5
+# Upper bound for `max_results`.
+SEARCH_MAX_RESULTS = 100
+# Pages fetched in the background after each single-page search.
+SEARCH_PREFETCH_PAGES = 2
+
+search_cache = make_cache("search", max_entries=1024, ttl=10 * 60)
+_search_page_fetches: Dict[tuple, asyncio.Future] = {}
+# Every symphony returned by search_symphonies is also kept in a columnar snapshot for refine_symphony_search,
+# one per session (see `_search_scope`), holding up to this many symphonies.
+SEARCH_SNAPSHOT_MAX_ROWS = 1000
+search_snapshots = make_cache("search_snapshots", max_entries=256, ttl=60 * 60)
+_background_tasks: set = set()
+
+def _with_symphony_urls(results: List[Dict], symphony_url_base: str) -> List[Dict]:
+    return [
+        {
+            **{k: v for k, v in item.items() if k != "symphony_sid"},
+            "symphony_url": f"{symphony_url_base}/symphony/{item['symphony_sid']}/details",
+        } if "symphony_sid" in item else item
+        for item in results
+    ]
+
+async def _get_search_page(base_url: str,
+                           headers: Dict[str, str],
+                           symphony_url_base: str,
+                           query_key: str,
+                           where: List,
+                           order_by: List,
+                           offset: int) -> Union[List, Dict]:
+    """
+    Get one page of search results, from the cache if possible. Concurrent requests for the same page share one upstream call.
+    """
+    key = (base_url, query_key, offset)
+    cached = await search_cache.aget(key)
+    if cached is not None:
+        return cached
+    if key not in _search_page_fetches:
+        async def fetch() -> Union[List, Dict]:
+            try:
+                async with upstream_client() as client:
+                    response = await client.post(
+                        f"{base_url}/api/v0.1/search/symphonies",
+                        headers=headers,
+                        json={"where": where, "order_by": order_by, "offset": offset}
+                    )
+                results = response.json()
+                if isinstance(results, list):
+                    results = _with_symphony_urls(results, symphony_url_base)
+                    await search_cache.aset(key, results)
+                return results
+            finally:
+                _search_page_fetches.pop(key, None)
+        _search_page_fetches[key] = asyncio.ensure_future(fetch())
+    return await asyncio.shield(_search_page_fetches[key])
+
+def _search_scope() -> Optional[tuple]:
+    """
+    Key of the caller's search snapshot: their MCP session, else their credentials, else the single local user of
+    the stdio transport. None for anonymous HTTP callers without a session, whose searches can't be told apart.
+    """
+    context = current_request_context()
+    if context is not None and context.session_id:
+        return (get_base_url(), "session", context.session_id)
+    try:
+        get_required_headers()
+        return (get_base_url(), "credentials", get_credential_fingerprint())
+    except ValueError:
+        pass
+    if not get_http_headers():
+        return (get_base_url(), "local")
+    return None
+
+async def _remember_search_results(results: List[Dict]) -> None:
+    """
+    Add symphonies returned to the caller to their search snapshot.
+    """
+    scope = _search_scope()
+    if scope is None or not results:
+        return
+    snapshot = await search_snapshots.aget(scope) or SearchSnapshot(max_rows=SEARCH_SNAPSHOT_MAX_ROWS)
+    snapshot.add(results)
+    await search_snapshots.aset(scope, snapshot)
+
+def _prefetch_search_pages(fetch_page, offset: int) -> None:
+    """
+    Start fetching the pages after `offset` in the background so the next `search_symphonies` calls hit the cache.
+    """
+    for i in range(1, SEARCH_PREFETCH_PAGES + 1):
+        task = asyncio.ensure_future(fetch_page(offset + i * SEARCH_PAGE_SIZE))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+async def _fetch_accounts() -> List[Dict]:
+    url = f"{get_base_url()}/api/v0.1/accounts/list"
+    async with upstream_client() as client:
+        response = await client.get(
+            url,
+            headers=get_required_headers(),
+        )
+    return response.json()["accounts"]
+
 # Could be a resource but Claude Desktop doesn't autonomously call resources yet.
 @mcp.tool
 async def list_accounts() -> List[AccountResponse]:
@@ -404,16 +726,47 @@ async def list_accounts() -> List[AccountResponse]:
     If this returns an empty list, the user needs to complete their Composer onboarding on app.composer.trade.
     """
     try:
-        url = f"{get_base_url()}/api/v0.1/accounts/list"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=get_required_headers(),
-            )
-        return response.json()["accounts"]
+        return await _fetch_accounts()
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
+async def _fetch_account_holdings(account_uuid: str) -> Dict:
+    url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/holding-stats"
+    async with upstream_client(timeout=30.0) as client:
+        response = await client.get(
+            url,
+            headers=get_required_headers(),
+        )
+    data = response.json()
+    holdings = data.get("holdings", [])
+    for holding in holdings:
+        direct = holding.get("direct", {}) or {}
+        symphony = holding.get("symphony", {}) or {}
+        holding["overall_portfolio"] = {
+            "allocation": (direct.get("allocation") or 0) + (symphony.get("allocation") or 0),
+            "amount": (direct.get("amount") or 0) + (symphony.get("amount") or 0),
+            "value": (direct.get("value") or 0) + (symphony.get("value") or 0),
+        }
+    return data
+
+async def _fetch_aggregate_portfolio_stats(account_uuid: str) -> Dict:
+    url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/total-stats"
+    async with upstream_client() as client:
+        response = await client.get(
+            url,
+            headers=get_required_headers(),
+        )
+    return response.json()
+
+async def _fetch_aggregate_symphony_stats(account_uuid: str) -> Dict:
+    url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/symphony-stats-meta"
+    async with upstream_client() as client:
+        response = await client.get(
+            url,
+            headers=get_required_headers(),
+        )
+    return response.json()
+
 @mcp.tool
 async def get_account_holdings(account_uuid: str) -> Dict:
     """
@@ -426,23 +779,7 @@ async def get_account_holdings(account_uuid: str) -> Dict:
     The "value" field is the total market value of the asset in the account.
     """
     try:
-        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/holding-stats"
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                url,
-                headers=get_required_headers(),
-            )
-        data = response.json()
-        holdings = data.get("holdings", [])
-        for holding in holdings:
-            direct = holding.get("direct", {}) or {}
-            symphony = holding.get("symphony", {}) or {}
-            holding["overall_portfolio"] = {
-                "allocation": (direct.get("allocation") or 0) + (symphony.get("allocation") or 0),
-                "amount": (direct.get("amount") or 0) + (symphony.get("amount") or 0),
-                "value": (direct.get("value") or 0) + (symphony.get("value") or 0),
-            }
-        return data
+        return await _fetch_account_holdings(account_uuid)
     except Exception as e:
         logger.error(f"Error getting account holdings for {account_uuid}: {e!r}", exc_info=True)
         return {"error": truncate_text(str(e), 1000)}
@@ -464,14 +801,7 @@ async def get_aggregate_portfolio_stats(account_uuid: str) -> PortfolioStatsResp
     - todays_percent_change: float. The percent change of the portfolio today. Calculated as todays_dollar_change / portfolio_value.
     """
     try:
-        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/total-stats"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=get_required_headers(),
-            )
-        data = response.json()
-        return data
+        return await _fetch_aggregate_portfolio_stats(account_uuid)
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
@@ -484,60 +814,356 @@ async def get_aggregate_symphony_stats(account_uuid: str) -> Dict:
     "deposit_adjusted_value" refers to the time-weighted value of the symphony.
     """
     try:
-        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/symphony-stats-meta"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=get_required_headers(),
-            )
-        return response.json()
+        return await _fetch_aggregate_symphony_stats(account_uuid)
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
+async def _sync_performance_history(account_uuid: str, symphony_id: Optional[str] = None) -> PerformanceHistory:
+    """
+    Bring the local daily performance history of an account, or of a symphony in it, up to date.
+    Recently synced histories are returned as is. Otherwise upstream is asked to revalidate the stored copy
+    (If-None-Match / If-Modified-Since) and only days after the last stored one are converted and appended.
+    """
+    history = history_store.get((get_base_url(), get_credential_fingerprint(), account_uuid, symphony_id))
+    if history_store.is_fresh(history):
+        return history
+
+    if symphony_id:
+        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/symphonies/{symphony_id}"
+    else:
+        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/portfolio-history"
+    headers = get_required_headers()
+    if history.epoch_ms and history.etag:
+        headers["if-none-match"] = history.etag
+    if history.epoch_ms and history.last_modified:
+        headers["if-modified-since"] = history.last_modified
+    async with upstream_client() as client:
+        response = await client.get(
+            url,
+            headers=headers,
+        )
+    if response.status_code == 304:
+        history.synced_at = time.time()
+        return history
+    data = response.json()
+    if "epoch_ms" not in data:
+        raise ValueError(f"Unexpected daily performance response: {truncate_text(str(data), 500)}")
+    history.merge(data)
+    history.etag = response.headers.get("etag")
+    history.last_modified = response.headers.get("last-modified")
+    return history
+
+async def _export_history(response: Dict, history: PerformanceHistory, export_format: str, name: str) -> Dict:
+    """
+    Replace the daily lists of a `PerformanceHistory.to_response` response with an export of them.
+    """
+    columns = {"dates": response.pop("dates")}
+    columns.update({column: response.pop(column) for column in history.columns})
+    metadata = {"source": "daily_performance", "name": name}
+    response["export"] = await _export_series(columns, export_format, name, "dates", metadata)
+    return response
+
 @mcp.tool
-async def get_symphony_daily_performance(account_uuid: str, symphony_id: str) -> Dict:
+async def get_symphony_daily_performance(account_uuid: str,
+                                         symphony_id: str,
+                                         start_date: str = None,
+                                         end_date: str = None,
+                                         export_format: Optional[Literal["arrow", "parquet"]] = None) -> Dict:
     """
     Get daily performance for a specific symphony in a brokerage account.
+    Use start_date and end_date (YYYY-MM-DD, inclusive) to only return part of the history.
     Outputs a JSON object with the following fields:
     - dates: List[str]. The dates for which performance is available.
     - series: List[float]. The total value of the symphony on the given date.
     - deposit_adjusted_series: List[float]. The value of the symphony on the given date, adjusted for deposits and withdrawals. (AKA daily time-weighted value)
+    Use `export_format` ("arrow" or "parquet") to get the daily lists as an Arrow IPC or Parquet file instead,
+    described by `export` in the response (a local `path` or an MCP resource `uri`).
     """
+    if export_format and not EXPORT_AVAILABLE:
+        return {"error": PYARROW_MISSING}
     try:
-        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/symphonies/{symphony_id}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=get_required_headers(),
-            )
-        data = response.json()
-        data['dates'] = [epoch_ms_to_date(d) for d in data['epoch_ms']]
-        del data['epoch_ms']
-        return data
+        history = await _sync_performance_history(account_uuid, symphony_id)
+        response = history.to_response(date_to_epoch(start_date) if start_date else None,
+                                       date_to_epoch(end_date) if end_date else None)
+        if export_format:
+            return await _export_history(response, history, export_format, f"symphony-{symphony_id}")
+        return response
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
 @mcp.tool
-async def get_portfolio_daily_performance(account_uuid: str) -> Dict:
+async def get_portfolio_daily_performance(account_uuid: str,
+                                          start_date: str = None,
+                                          end_date: str = None,
+                                          export_format: Optional[Literal["arrow", "parquet"]] = None) -> Dict:
     """
     Get the daily performance for a brokerage account.
     Returns the value of the account portfolio over time.
+    Use start_date and end_date (YYYY-MM-DD, inclusive) to only return part of the history.
     Outputs a JSON object with the following fields:
     - dates: List[str]. The dates for which performance is available.
     - series: List[float]. The total value of the portfolio on the given date.
+    Use `export_format` ("arrow" or "parquet") to get the daily lists as an Arrow IPC or Parquet file instead,
+    described by `export` in the response (a local `path` or an MCP resource `uri`).
     """
+    if export_format and not EXPORT_AVAILABLE:
+        return {"error": PYARROW_MISSING}
     try:
-        url = f"{get_base_url()}/api/v0.1/portfolio/accounts/{account_uuid}/portfolio-history"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=get_required_headers(),
-            )
-        data = response.json()
-        data['dates'] = [epoch_ms_to_date(d) for d in data['epoch_ms']]
-        del data['epoch_ms']
-        return data
+        history = await _sync_performance_history(account_uuid)
+        response = history.to_response(date_to_epoch(start_date) if start_date else None,
+                                       date_to_epoch(end_date) if end_date else None)
+        if export_format:
+            return await _export_history(response, history, export_format, f"portfolio-{account_uuid}")
+        return response
+    except Exception as e:
+        return {"error": truncate_text(str(e), 1000)}
+
+@mcp.tool
+async def get_account_snapshot(account_uuid: str, include_daily_performance: bool = True) -> Dict:
+    """
+    Get a full picture of a brokerage account in one call.
+    Combines the outputs of `get_account_holdings`, `get_aggregate_portfolio_stats`, `get_aggregate_symphony_stats`
+    and `get_portfolio_daily_performance` (fetched concurrently) under the "holdings", "portfolio_stats",
+    "symphony_stats" and "daily_performance" fields. Holdings include the "overall_portfolio" aggregation.
+
+    If a section fails, it contains an "error" field instead and the other sections are still returned.
+    Use `include_daily_performance=False` to reduce the response size.
+    """
+    sections = {
+        "holdings": _fetch_account_holdings(account_uuid),
+        "portfolio_stats": _fetch_aggregate_portfolio_stats(account_uuid),
+        "symphony_stats": _fetch_aggregate_symphony_stats(account_uuid),
+    }
+    if include_daily_performance:
+        sections["daily_performance"] = _sync_performance_history(account_uuid)
+    results = await asyncio.gather(*sections.values(), return_exceptions=True)
+
+    snapshot = {"account_uuid": account_uuid}
+    for section, result in zip(sections, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error getting {section} for {account_uuid}: {result!r}")
+            snapshot[section] = {"error": truncate_text(str(result), 1000)}
+        elif section == "daily_performance":
+            snapshot[section] = result.to_response()
+        else:
+            snapshot[section] = result
+    return snapshot
+
+async def _fan_out_accounts(fetch) -> tuple:
+    """
+    Run `fetch(account_uuid)` for every account of the user with bounded concurrency.
+    Returns the accounts, a dict of successful results and a dict of error messages, both keyed by account_uuid.
+    """
+    accounts = await _fetch_accounts()
+    account_uuids = [str(account["account_uuid"]) for account in accounts]
+    results = await gather_bounded((fetch(account_uuid) for account_uuid in account_uuids), MAX_CONCURRENT_UPSTREAM_REQUESTS)
+    successes, errors = {}, {}
+    for account_uuid, result in zip(account_uuids, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error fanning out to account {account_uuid}: {result!r}")
+            errors[account_uuid] = truncate_text(str(result), 1000)
+        else:
+            successes[account_uuid] = result
+    return accounts, successes, errors
+
+def _account_summaries(accounts: List[Dict]) -> List[Dict]:
+    return [
+        {k: account.get(k) for k in ("account_uuid", "account_type", "broker", "status")}
+        for account in accounts
+    ]
+
+@mcp.tool
+async def get_household_holdings() -> Dict:
+    """
+    Get the combined holdings across all of the user's brokerage accounts in one call.
+    Holdings are merged by ticker: "direct", "symphony" and "overall_portfolio" amounts and values are summed across accounts,
+    and "overall_portfolio.allocation" is the ticker's share of the combined value of all holdings (a float between 0 and 1).
+    "accounts" lists the account_uuids holding each ticker; per-account details are available via `get_account_holdings`.
+    Accounts that failed to load are listed under "errors" and excluded from the totals.
+    """
+    try:
+        accounts, holdings, errors = await _fan_out_accounts(_fetch_account_holdings)
+        merged = merge_holdings({account_uuid: data.get("holdings", []) for account_uuid, data in holdings.items()})
+        return {"accounts": _account_summaries(accounts), **merged, "errors": errors}
+    except Exception as e:
+        logger.error(f"Error getting household holdings: {e!r}", exc_info=True)
+        return {"error": truncate_text(str(e), 1000)}
+
+@mcp.tool
+async def get_household_portfolio_stats() -> Dict:
+    """
+    Get the aggregate portfolio statistics of every brokerage account of the user, plus household-level totals, in one call.
+    "accounts" maps each account_uuid to the output of `get_aggregate_portfolio_stats` for that account.
+    "total" sums the dollar fields across accounts and recomputes simple_return and todays_percent_change from the sums.
+    Accounts that failed to load are listed under "errors" and excluded from the totals.
+    """
+    try:
+        accounts, stats, errors = await _fan_out_accounts(_fetch_aggregate_portfolio_stats)
+        return {
+            "accounts": stats,
+            "total": merge_portfolio_stats(list(stats.values())),
+            "errors": errors,
+        }
+    except Exception as e:
+        logger.error(f"Error getting household portfolio stats: {e!r}", exc_info=True)
+        return {"error": truncate_text(str(e), 1000)}
+
+async def _compare_symphony_live_vs_backtest(account_uuid: str, symphony: Dict) -> Dict:
+    """
+    Fetch a symphony's live deposit-adjusted history and backtest it over the same period.
+    Returns the raw (fractional) live time-weighted, backtest and SPY returns for that period, which starts on the
+    first day the symphony had a value (the history can start before it was funded). Returns are NaN if the period
+    has fewer than two days.
+    """
+    symphony_id = symphony["id"]
+    history = await _sync_performance_history(account_uuid, symphony_id)
+    live_values = np.asarray(history.columns.get("deposit_adjusted_series") or [], dtype=np.float64)
+    funded = np.flatnonzero(live_values > 0)
+    if not len(funded):
+        raise ValueError("No funded live history to compare")
+    live_values = live_values[funded[0]:]
+    start_day = history.epoch_ms[funded[0]] // MS_PER_DAY
+    end_day = history.epoch_ms[-1] // MS_PER_DAY
+    if len(live_values) < 2:
+        return {"start_day": start_day, "end_day": end_day, "live": np.nan, "backtest": np.nan, "spy": np.nan}
+
+    backtest = await _run_symphony_backtest(symphony_id, epoch_to_date(start_day), epoch_to_date(end_day), {
+        "apply_reg_fee": True,
+        "apply_taf_fee": True,
+        "broker": "ALPACA_WHITE_LABEL",
+        "capital": 10000,
+        "slippage_percent": 0.0001,
+        "spread_markup": 0.002,
+        "benchmark_tickers": ["SPY"],
+    }, incremental=True)
+    if not isinstance(backtest, BacktestResponse):
+        raise ValueError(f"Backtest failed: {truncate_text(str(backtest), 300)}")
+
+    def period_return(key: str) -> float:
+        days, values = window(*series_from_dvm_entry(backtest.dvm_capital[key]), start_day, end_day)
+        return float(values[-1] / values[0] - 1) if len(values) > 1 else np.nan
+
+    primary_key = find_primary_key(backtest.dvm_capital, ["SPY"], symphony_id)
+    return {
+        "start_day": start_day,
+        "end_day": end_day,
+        "live": float(live_values[-1] / live_values[0] - 1),
+        "backtest": period_return(primary_key),
+        "spy": period_return("SPY") if "SPY" in backtest.dvm_capital else np.nan,
+    }
+
+@mcp.tool
+async def compare_live_vs_backtest(account_uuid: str) -> Dict:
+    """
+    Compare the live performance of every symphony in a brokerage account against its backtest and SPY over the same period.
+
+    For each symphony, the live time-weighted return (from the deposit-adjusted daily performance) is compared with
+    a backtest and with SPY over the symphony's live period. Backtests run concurrently on the server.
+    Returns a table sorted by "deviation_from_spy" (descending, best performers first) with the columns:
+    - live_time_weighted_return
+    - backtest_return
+    - spy_return
+    - deviation_from_backtest = live_time_weighted_return - backtest_return
+    - deviation_from_spy = live_time_weighted_return - spy_return
+    All returns are percentages. Symphonies that couldn't be compared are listed under "errors".
+    Pipe characters in symphony names are replaced with "-" so the table renders as markdown.
+    """
+    try:
+        symphonies = (await _fetch_aggregate_symphony_stats(account_uuid)).get("symphonies", [])
+        results = await gather_bounded(
+            (_compare_symphony_live_vs_backtest(account_uuid, symphony) for symphony in symphonies),
+            MAX_CONCURRENT_UPSTREAM_REQUESTS,
+        )
+        compared, errors = [], {}
+        for symphony, result in zip(symphonies, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error comparing symphony {symphony.get('id')}: {result!r}")
+                errors[symphony.get("id")] = truncate_text(str(result), 1000)
+            else:
+                compared.append((symphony, result))
+
+        live = np.asarray([result["live"] for _, result in compared], dtype=np.float64)
+        backtest = np.asarray([result["backtest"] for _, result in compared], dtype=np.float64)
+        spy = np.asarray([result["spy"] for _, result in compared], dtype=np.float64)
+        deviation_from_backtest = live - backtest
+        deviation_from_spy = live - spy
+        # NaN deviations (e.g. missing SPY data) sort last.
+        order = np.argsort(np.where(np.isnan(deviation_from_spy), np.inf, -deviation_from_spy), kind="stable")
+
+        def percent(value: float) -> Optional[str]:
+            return None if np.isnan(value) else f"{round(float(value) * 100, 2)}%"
+
+        table = []
+        for i in order:
+            symphony, result = compared[i]
+            table.append({
+                "symphony_id": symphony.get("id"),
+                "name": str(symphony.get("name", "")).replace("|", "-"),
+                "start_date": epoch_to_date(result["start_day"]),
+                "end_date": epoch_to_date(result["end_day"]),
+                "live_time_weighted_return": percent(live[i]),
+                "backtest_return": percent(backtest[i]),
+                "spy_return": percent(spy[i]),
+                "deviation_from_backtest": percent(deviation_from_backtest[i]),
+                "deviation_from_spy": percent(deviation_from_spy[i]),
+            })
+        return {"symphonies": table, "errors": errors}
     except Exception as e:
+        logger.error(f"Error comparing live vs backtest performance for {account_uuid}: {e!r}", exc_info=True)
+        return {"error": truncate_text(str(e), 1000)}
+
+@mcp.tool
+async def get_performance_stats(source: Literal["backtest", "live"],
+                                symphony_id: str = None,
+                                account_uuid: str = None,
+                                start_date: str = None,
+                                end_date: str = None,
+                                rolling_window: int = 63) -> Dict:
+    """
+    Compute detailed performance stats over any date window without re-running a backtest.
+    Includes the Sortino ratio, a rolling Sharpe ratio summary, drawdown durations and a monthly returns table
+    on top of the usual backtest stats.
+
+    - source="backtest": uses the most recent `backtest_symphony_by_id` result for symphony_id (run that tool first),
+      or the most recent `backtest_symphony` result if symphony_id is omitted. Benchmark stats are included.
+    - source="live": uses the deposit-adjusted daily performance of symphony_id in account_uuid,
+      or the portfolio value of the whole account if symphony_id is omitted.
+      Account-level stats use the raw portfolio value, so deposits and withdrawals show up as returns.
+
+    start_date and end_date (YYYY-MM-DD) are optional and default to the full history.
+    rolling_window is the number of trading days used for the rolling Sharpe ratio (default 63, about 3 months).
+    """
+    try:
+        start_day = date_to_epoch(start_date) if start_date else None
+        end_day = date_to_epoch(end_date) if end_date else None
+        if source == "backtest":
+            latest = await latest_backtests.aget((get_base_url(), get_credential_fingerprint(), symphony_id or None))
+            if not latest:
+                if symphony_id:
+                    return {"error": f"No backtest found for symphony {symphony_id}. Run `backtest_symphony_by_id` first."}
+                return {"error": "No backtest found. Run `backtest_symphony` first, or pass the symphony_id of a `backtest_symphony_by_id` run."}
+            backtest, benchmark_tickers = latest
+            primary_key = find_primary_key(backtest.dvm_capital, benchmark_tickers, symphony_id)
+            stats = compute_backtest_stats(backtest.dvm_capital, primary_key, benchmark_tickers,
+                                           start_day, end_day, extended=True, rolling_window=rolling_window)
+            days, _ = window(*series_from_dvm_entry(backtest.dvm_capital[primary_key]), start_day, end_day)
+        else:
+            if not account_uuid:
+                return {"error": "account_uuid is required for live stats"}
+            history = await _sync_performance_history(account_uuid, symphony_id)
+            values = history.columns.get("deposit_adjusted_series") or history.columns["series"]
+            days, values = window(np.asarray(history.epoch_ms, dtype=np.int64) // MS_PER_DAY,
+                                  np.asarray(values, dtype=np.float64), start_day, end_day)
+            stats = compute_extended_stats(days, values, rolling_window)
+        if len(days) == 0:
+            return {"error": "No data in the requested date range"}
+        return {
+            "start_date": epoch_to_date(int(days[0])),
+            "end_date": epoch_to_date(int(days[-1])),
+            "stats": parse_extended_stats(stats),
+        }
+    except Exception as e:
+        logger.error(f"Error computing performance stats: {e!r}", exc_info=True)
         return {"error": truncate_text(str(e), 1000)}
 
 @mcp.tool
@@ -550,7 +1176,7 @@ async def save_symphony(
     """
     Save a symphony to the user's account. If successful, returns the symphony ID.
     """
-    validated_score= validate_symphony_score(symphony_score)
+    validated_score = await offload_pool.run(validate_symphony_score, symphony_score, offload=count_nodes(symphony_score) >= OFFLOAD_MIN_NODES)
     symphony = validated_score.model_dump()
 
     url = f"{get_base_url()}/api/v0.1/symphonies"
@@ -563,11 +1189,12 @@ async def save_symphony(
         "symphony": {"raw_value": symphony}
     }
     try:
-        async with httpx.AsyncClient() as client:
+        content, content_headers = compressed_json(payload)
+        async with upstream_client() as client:
             response = await client.post(
                 url,
-                headers=get_required_headers(),
-                json=payload
+                headers={**get_required_headers(), **content_headers},
+                content=content
             )
         try:
             return response.json()
@@ -586,7 +1213,7 @@ async def copy_symphony(
     """
     url = f"{get_base_url()}/api/v0.1/symphonies/{symphony_id}/copy"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
                 headers=get_required_headers(),
@@ -610,7 +1237,7 @@ async def update_saved_symphony(
     """
     Update an existing symphony in the user's account. If successful, returns the updated symphony details.
     """
-    validated_score = validate_symphony_score(symphony_score)
+    validated_score = await offload_pool.run(validate_symphony_score, symphony_score, offload=count_nodes(symphony_score) >= OFFLOAD_MIN_NODES)
     symphony = validated_score.model_dump()
 
     url = f"{get_base_url()}/api/v0.1/symphonies/{symphony_id}"
@@ -623,11 +1250,12 @@ async def update_saved_symphony(
         "symphony": {"raw_value": symphony}
     }
     try:
-        async with httpx.AsyncClient() as client:
+        content, content_headers = compressed_json(payload)
+        async with upstream_client() as client:
             response = await client.put(
                 url,
-                headers=get_required_headers(),
-                json=payload
+                headers={**get_required_headers(), **content_headers},
+                content=content
             )
         return response.json()
     except Exception as e:
@@ -642,7 +1270,7 @@ async def get_saved_symphony(symphony_id: str) -> Dict:
     """
     try:
         url = f"{get_base_url()}/api/v0.1/symphonies/{symphony_id}/score"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.get(
                 url,
                 headers=get_optional_headers(),
@@ -651,6 +1279,47 @@ async def get_saved_symphony(symphony_id: str) -> Dict:
     except Exception as e:
         return {"error": truncate_text(str(e), 1000)}
 
+# Reads that only change at market open/close. Entries expire at the next session boundary.
+session_cache = SessionCache(max_entries=512)
+
+async def _fetch_market_hours() -> Dict:
+    """
+    Fetch market hours, served from the session cache until the next market open or close.
+    """
+    key = ("market-hours", get_base_url())
+    cached = session_cache.get(key)
+    if cached is not None:
+        return cached
+    url = f"{get_base_url()}/api/v0.1/deploy/market-hours"
+    async with upstream_client() as client:
+        response = await client.get(
+            url,
+            headers=get_optional_headers(),
+        )
+    data = response.json()
+    if response.is_success:
+        session_cache.update_market_hours(data)
+        session_cache.set(key, data)
+    return data
+
+async def _session_cached(key: tuple, fetch) -> Any:
+    """
+    Serve `fetch()` from the session cache, keyed by `key` and expiring at the next market open or close.
+    `fetch` returns (data, cacheable).
+    """
+    cached = session_cache.get(key)
+    if cached is not None:
+        return cached
+    if not session_cache.has_market_hours():
+        try:
+            await _fetch_market_hours()
+        except Exception as e:
+            logger.warning(f"Could not fetch market hours for session-aware caching: {e!r}")
+    data, cacheable = await fetch()
+    if cacheable:
+        session_cache.set(key, data)
+    return data
+
 @mcp.tool
 async def get_market_hours() -> Dict:
     """
@@ -659,14 +1328,8 @@ async def get_market_hours() -> Dict:
 
     Useful for trading equities. Crypto can trade 24/7.
     """
-    url = f"{get_base_url()}/api/v0.1/deploy/market-hours"
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=get_optional_headers(),
-            )
-        return response.json()
+        return await _fetch_market_hours()
     except Exception as e:
         logger.error(f"Error getting market hours: {e}")
         return {"error": truncate_text(str(e), 1000)}
@@ -688,7 +1351,7 @@ async def invest_in_symphony(account_uuid: str, symphony_id: str, amount: float)
         return {"error": "Amount must be greater than 0"}
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/invest"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
                 headers=get_required_headers(),
@@ -714,7 +1377,7 @@ async def withdraw_from_symphony(account_uuid: str, symphony_id: str, amount: fl
         return {"error": "Amount must be less than 0"}
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/withdraw"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
                 headers=get_required_headers(),
@@ -735,7 +1398,7 @@ async def cancel_invest_or_withdraw(account_uuid: str, deploy_id: str) -> Dict:
     """
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/deploys/{deploy_id}"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.delete(
                 url,
                 headers=get_required_headers()
@@ -758,7 +1421,7 @@ async def skip_automated_rebalance_for_symphony(account_uuid: str, symphony_id:
     """
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/skip-automated-rebalance"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
                 headers=get_required_headers(),
@@ -782,7 +1445,7 @@ async def go_to_cash_for_symphony(account_uuid: str, symphony_id: str) -> Dict:
     """
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/go-to-cash"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
                 headers=get_required_headers()
@@ -801,7 +1464,7 @@ async def rebalance_symphony_now(account_uuid: str, symphony_id: str, rebalance_
     """
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/rebalance"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
             headers=get_required_headers(),
@@ -821,7 +1484,7 @@ async def liquidate_symphony(account_uuid: str, symphony_id: str) -> Dict:
     """
     url = f"{get_base_url()}/api/v0.1/deploy/accounts/{account_uuid}/symphonies/{symphony_id}/liquidate"
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
             headers=get_required_headers()
@@ -840,7 +1503,7 @@ async def preview_rebalance_for_user() -> List:
     """
     url = f"{get_base_url()}/api/v0.1/dry-run"
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with upstream_client(timeout=30.0) as client:
             response = await client.post(
                 url,
             headers=get_required_headers(),
@@ -861,19 +1524,57 @@ async def preview_rebalance_for_symphony(account_uuid: str, symphony_id: str) ->
     Returns the projected trades and a rebalance_request_uuid.
     The uuid can be passed to `rebalance_symphony_now` to actually execute the trades.
     """
-    url = f"{get_base_url()}/api/v0.1/dry-run/trade-preview/{symphony_id}"
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                url,
-            headers=get_required_headers(),
-                json={"broker_account_uuid": account_uuid}
-            )
-        return response.json()
+        return await _fetch_trade_preview(account_uuid, symphony_id)
     except Exception as e:
         logger.error(f"Error previewing rebalance for symphony: {e}")
         return {"error": truncate_text(str(e), 1000)}
 
+async def _fetch_trade_preview(account_uuid: str, symphony_id: str) -> Dict:
+    url = f"{get_base_url()}/api/v0.1/dry-run/trade-preview/{symphony_id}"
+    async with upstream_client(timeout=30.0) as client:
+        response = await client.post(
+            url,
+            headers=get_required_headers(),
+            json={"broker_account_uuid": account_uuid}
+        )
+    return response.json()
+
+@mcp.tool
+async def preview_netted_rebalance_for_account(account_uuid: str, cost_bps: float = 5.0) -> Dict:
+    """
+    Preview rebalancing every symphony in an account at once, with the trades netted per ticker across symphonies.
+
+    For example, if one symphony would buy $1,000 of SPY and another would sell $600 of SPY, the net trade is a $400 buy.
+    Returns the net trade per ticker (sorted by size), gross turnover (sum of all per-symphony trades),
+    net turnover, and the estimated cost savings of netting assuming trading costs of cost_bps basis points of turnover.
+    Per-symphony rebalance_request_uuids are included for use with `rebalance_symphony_now`.
+    """
+    try:
+        stats = await _fetch_aggregate_symphony_stats(account_uuid)
+        symphonies = [symphony for symphony in stats.get("symphonies", []) if symphony.get("id")]
+        previews = await gather_bounded(
+            (_fetch_trade_preview(account_uuid, symphony["id"]) for symphony in symphonies),
+            MAX_CONCURRENT_UPSTREAM_REQUESTS,
+        )
+    except Exception as e:
+        logger.error(f"Error previewing netted rebalance for {account_uuid}: {e!r}")
+        return {"error": truncate_text(str(e), 1000)}
+
+    trades_by_symphony = {}
+    symphony_previews = []
+    for symphony, preview in zip(symphonies, previews):
+        summary = {"symphony_id": symphony["id"], "name": symphony.get("name")}
+        if isinstance(preview, BaseException) or not isinstance(preview, dict) or "error" in preview:
+            summary["error"] = truncate_text(str(preview.get("error") if isinstance(preview, dict) else preview), 1000)
+        else:
+            trades = preview.get("recommended_trades") or preview.get("trades") or []
+            trades_by_symphony[symphony["id"]] = trades
+            summary.update({"rebalance_request_uuid": preview.get("rebalance_request_uuid"), "num_trades": len(trades)})
+        symphony_previews.append(summary)
+
+    return {**net_trades(trades_by_symphony, cost_bps), "symphonies": symphony_previews}
+
 @mcp.tool
 async def execute_single_trade(
     account_uuid: str,
@@ -909,65 +1610,23 @@ async def execute_single_trade(
     """
     url = f"{get_base_url()}/api/v0.1/trading/accounts/{account_uuid}/order-requests"
 
-    payload = {
+    order = {
+        "side": side,
         "type": type,
-        "symbol": symbol,
         "time_in_force": time_in_force,
+        "symbol": symbol,
+        "notional": notional,
+        "quantity": quantity,
+        "position_intent": position_intent,
+        "limit_price": limit_price,
     }
-
-    error_message = None
-    if notional is not None:
-        try:
-            payload["notional"] = float(notional)
-        except (ValueError, TypeError):
-            error_message = f"Invalid notional value: {notional}"
-    if quantity is not None:
-        try:
-            payload["quantity"] = float(quantity)
-        except (ValueError, TypeError):
-            error_message = f"Invalid quantity value: {quantity}"
-    if not notional and not quantity:
-        error_message = "One of notional or quantity must be provided"
-
-    is_options_order = symbol.startswith("OPTIONS::")
-    if is_options_order:
-        if position_intent is None:
-            error_message = "Position intent is required for options orders"
-        if time_in_force not in ["DAY"]:
-            error_message = "Time in force must be DAY for options orders"
-    else:
-        if type == "LIMIT":
-            error_message = "Limit orders are only supported for options orders"
-
-    if position_intent is not None:
-        payload["position_intent"] = position_intent
-    if limit_price is not None:
-        if not is_options_order:
-            error_message = "Limit price is only used for options orders"
-        if limit_price <= 0:
-            error_message = "Limit price must be positive"
-        try:
-            payload["limit_price"] = float(limit_price)
-        except (ValueError, TypeError):
-            error_message = f"Invalid limit price value: {limit_price}"
-
-    # Validate notional/quantity based on side
-    if side == "BUY":
-        if notional is not None and float(notional) <= 0:
-            error_message = "Notional must be positive for BUY orders"
-        if quantity is not None and float(quantity) <= 0:
-            error_message = "Quantity must be positive for BUY orders"
-    elif side == "SELL":
-        if notional is not None and float(notional) >= 0:
-            error_message = "Notional must be negative for SELL orders"
-        if quantity is not None and float(quantity) >= 0:
-            error_message = "Quantity must be negative for SELL orders"
-
+    error_message = validate_orders([order])[0]
     if error_message:
         return {"error": error_message}
+    payload = order_payload(order)
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.post(
                 url,
             headers=get_required_headers(),
@@ -978,6 +1637,129 @@ async def execute_single_trade(
         logger.error(f"Error executing single trade: {e}")
         return {"error": truncate_text(str(e), 1000)}
 
+# Orders submitted concurrently by execute_trades_batch.
+MAX_CONCURRENT_ORDER_SUBMISSIONS = 4
+MAX_BATCH_ORDERS = 100
+# Order submissions by idempotency key: in flight, submitted, or of unknown outcome (the request failed after the order
+# may have reached upstream). An order retried with the same client_order_id within this window is not sent again.
+# Shared by all workers under the supervisor, and kept across restarts, with the SQLite cache backend.
+submitted_orders = make_cache("submitted_orders", max_entries=2048, ttl=10 * 60)
+# Order submissions in progress in this process, keyed by idempotency key, so concurrent retries share one submission.
+pending_orders: Dict[tuple, asyncio.Future] = {}
+
+UNKNOWN_ORDER_OUTCOME = (
+    "This order was already sent with this client_order_id, but whether it was placed is unknown, so it was not sent again. "
+    "Check the account's order requests before placing it again with a new client_order_id."
+)
+
+async def _place_order(url: str, headers: Dict[str, str], payload: Dict, key: tuple) -> Dict:
+    recorded = await submitted_orders.aget(key)
+    if recorded is not None:
+        if recorded["state"] == "submitted":
+            return {"status": "duplicate_suppressed", "response": recorded["response"]}
+        return {"status": "unknown", "error": UNKNOWN_ORDER_OUTCOME}
+
+    # Recorded before sending, so that an order which may have reached upstream is never sent again.
+    await submitted_orders.aset(key, {"state": "in_flight"})
+    try:
+        async with upstream_client() as client:
+            response = await client.post(
+                url,
+                headers=headers,
+                json=payload
+            )
+        data = response.json() if response.content else {}
+    except Exception as e:
+        error = truncate_text(str(e), 1000)
+        await submitted_orders.aset(key, {"state": "unknown", "error": error})
+        return {"status": "unknown", "error": error}
+    if response.status_code >= 500:
+        await submitted_orders.aset(key, {"state": "unknown", "response": data})
+        return {"status": "unknown", "status_code": response.status_code, "response": data}
+    if response.status_code >= 400:
+        # Rejected, so nothing was placed and the order can be sent again.
+        await submitted_orders.apop(key)
+        return {"status": "failed", "status_code": response.status_code, "response": data}
+    await submitted_orders.aset(key, {"state": "submitted", "response": data})
+    return {"status": "submitted", "response": data}
+
+async def _submit_order(url: str, headers: Dict[str, str], payload: Dict, key: tuple) -> Dict:
+    """
+    Submit an order unless the same idempotency key was sent recently or is being sent right now.
+    The order is not sent again if it was submitted ("duplicate_suppressed") or if its earlier submission
+    failed in a way that leaves its outcome unknown ("unknown").
+    """
+    pending = pending_orders.get(key)
+    if pending is not None:
+        outcome = await asyncio.shield(pending)
+        return {**outcome, "status": "duplicate_suppressed"} if outcome["status"] == "submitted" else outcome
+    pending = asyncio.ensure_future(_place_order(url, headers, payload, key))
+    pending_orders[key] = pending
+    pending.add_done_callback(lambda _: pending_orders.pop(key, None))
+    return await asyncio.shield(pending)
+
+@mcp.tool
+async def execute_trades_batch(account_uuid: str, orders: List[TradeOrder]) -> Dict:
+    """
+    Submit several single-symbol orders (see `execute_single_trade`) to one account in a single call.
+    Useful for rebalancing a direct portfolio across many tickers.
+
+    All orders are validated before anything is submitted; if any order is invalid, no orders are submitted.
+    Valid orders are then submitted concurrently.
+
+    Every order result includes its client_order_id (generated when not given). To retry an order safely, e.g. after
+    a timeout, send it again with that client_order_id: an order with the same client_order_id on the same account is
+    not sent again within 10 minutes. If the earlier attempt failed without a clear answer (a timeout, a dropped
+    connection or a server error after the order may have been placed), the retry returns "unknown" instead of sending
+    the order again; check the account's order requests before placing it with a new client_order_id.
+    Orders without a client_order_id are never deduplicated, so identical orders in separate calls are all placed.
+    Deduplication is done by this server, not by the Composer API.
+
+    Returns a status per order, in input order: "submitted", "duplicate_suppressed" (already submitted with this
+    client_order_id; not placed again), "unknown" (may or may not have been placed; see above), "failed" (rejected by
+    the API; not placed), "rejected" (invalid) or "not_submitted".
+    """
+    if not orders:
+        return {"error": "No orders provided"}
+    if len(orders) > MAX_BATCH_ORDERS:
+        return {"error": f"At most {MAX_BATCH_ORDERS} orders can be submitted at once"}
+    orders = [order.model_dump() if isinstance(order, TradeOrder) else dict(order) for order in orders]
+    errors = validate_orders(orders)
+    results = [{"index": i, "symbol": order.get("symbol")} for i, order in enumerate(orders)]
+    if any(errors):
+        for result, error in zip(results, errors):
+            result.update({"status": "rejected", "error": error} if error else {"status": "not_submitted"})
+        return {"submitted": 0, "orders": results, "error": "Some orders are invalid; no orders were submitted"}
+
+    try:
+        base_url = get_base_url()
+        headers = get_required_headers()
+        url = f"{base_url}/api/v0.1/trading/accounts/{account_uuid}/order-requests"
+        scope = (base_url, get_credential_fingerprint())
+        payloads = [order_payload(order) for order in orders]
+        client_order_ids = [order.get("client_order_id") or new_client_order_id() for order in orders]
+        keys = [(*scope, idempotency_key(account_uuid, client_order_id)) for client_order_id in client_order_ids]
+        if len(set(keys)) < len(keys):
+            return {"error": "Batch contains several orders with the same client_order_id"}
+        outcomes = await gather_bounded(
+            (_submit_order(url, headers, payload, key) for payload, key in zip(payloads, keys)),
+            MAX_CONCURRENT_ORDER_SUBMISSIONS,
+        )
+    except Exception as e:
+        logger.error(f"Error executing trades batch: {e!r}")
+        return {"error": truncate_text(str(e), 1000)}
+
+    for result, client_order_id, outcome in zip(results, client_order_ids, outcomes):
+        result["client_order_id"] = client_order_id
+        if isinstance(outcome, BaseException):
+            result.update({"status": "failed", "error": truncate_text(str(outcome), 1000)})
+        else:
+            result.update(outcome)
+    return {
+        "submitted": sum(result["status"] == "submitted" for result in results),
+        "orders": results,
+    }
+
 @mcp.tool
 async def cancel_single_trade(account_uuid: str, order_request_id: str) -> Dict:
     """
@@ -987,7 +1769,7 @@ async def cancel_single_trade(account_uuid: str, order_request_id: str) -> Dict:
     Only QUEUED or OPEN order requests can be canceled.
     """
     url = f"{get_base_url()}/api/v0.1/trading/accounts/{account_uuid}/order-requests/{order_request_id}"
-    async with httpx.AsyncClient() as client:
+    async with upstream_client() as client:
         response = await client.delete(
             url,
         headers=get_required_headers()
@@ -997,6 +1779,149 @@ async def cancel_single_trade(account_uuid: str, order_request_id: str) -> Dict:
     else:
         return response.json()
 
+# Deploy and order request statuses that won't change anymore.
+TERMINAL_STATUSES = {"SUCCEEDED", "SUCCESS", "COMPLETED", "FILLED", "FAILED", "ERROR", "CANCELED", "CANCELLED", "REJECTED", "EXPIRED"}
+MAX_WAIT_SECONDS = 300
+
+status_pollers: Dict[tuple, SharedPoller] = {}
+
+def _status_poller(kind: str, account_uuid: str, request_id: str) -> SharedPoller:
+    """
+    The poller for a deploy or order request, shared by every concurrent waiter for the same request.
+    """
+    base_url = get_base_url()
+    key = (base_url, get_credential_fingerprint(), kind, account_uuid, request_id)
+    poller = status_pollers.get(key)
+    if poller is not None and not poller.finished:
+        return poller
+
+    if kind == "deploy":
+        url = f"{base_url}/api/v0.1/deploy/accounts/{account_uuid}/deploys/{request_id}"
+    else:
+        url = f"{base_url}/api/v0.1/trading/accounts/{account_uuid}/order-requests/{request_id}"
+    headers = get_required_headers()
+
+    async def fetch() -> Dict:
+        async with upstream_client() as client:
+            response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    poller = SharedPoller(fetch, lambda data: str(data.get("status", "")).upper() in TERMINAL_STATUSES)
+    status_pollers[key] = poller
+    return poller
+
+@mcp.tool
+async def wait_for_completion(account_uuid: str,
+                              kind: Literal["deploy", "order"],
+                              request_id: str,
+                              timeout_seconds: float = 60,
+                              ctx: Context = None) -> Dict:
+    """
+    Wait until an invest/withdraw/rebalance deploy or a single trade order request reaches a final status,
+    instead of calling tools repeatedly to check on it.
+
+    - kind="deploy": request_id is the deploy_id returned by `invest_in_symphony`, `withdraw_from_symphony` or `rebalance_symphony_now`.
+    - kind="order": request_id is the order_request_id returned by `execute_single_trade` or `execute_trades_batch`.
+
+    The status is checked with increasing intervals (1s up to 15s) until it is final or timeout_seconds (at most 300) pass.
+    Note that invest and withdraw requests are only processed during the trading period near market close,
+    so they usually stay QUEUED until then.
+
+    Returns the latest status response, with "completed" set to whether the status is final.
+    """
+    timeout_seconds = min(max(timeout_seconds, 0), MAX_WAIT_SECONDS)
+    started = time.monotonic()
+
+    async def on_update(data: Dict) -> None:
+        if ctx is not None:
+            await ctx.report_progress(
+                progress=round(time.monotonic() - started, 1),
+                total=timeout_seconds,
+                message=f"Status: {data.get('status', 'unknown')}",
+            )
+
+    try:
+        poller = _status_poller(kind, account_uuid, request_id)
+        data = await poller.wait(timeout_seconds, on_update)
+    except Exception as e:
+        logger.error(f"Error waiting for {kind} {request_id}: {e!r}")
+        return {"error": truncate_text(str(e), 1000)}
+    finally:
+        for key in [key for key, poller in status_pollers.items() if poller.finished or poller.idle]:
+            del status_pollers[key]
+    if not isinstance(data, dict):
+        return {"completed": False, "error": "Timed out before the first status check completed"}
+    return {**data, "completed": poller.done}
+
+# Largest page size accepted by the options chain endpoint.
+OPTIONS_CHAIN_MAX_PAGE_SIZE = 250
+
+async def _iter_options_chain_pages(params: Dict) -> AsyncIterator[Dict]:
+    """
+    Yield options chain pages, following next_cursor until the last page.
+    The request for the next page is sent before the current page is yielded, so it downloads while the caller processes the current one.
+    Stopping iteration early cancels the outstanding request.
+    """
+    url = f"{get_base_url()}/api/v1/market-data/options/chain"
+    headers = get_required_headers()
+    async with upstream_client() as client:
+
+        async def fetch(cursor: Optional[str]) -> Dict:
+            page_params = dict(params)
+            if cursor:
+                page_params["next_cursor"] = cursor
+            response = await client.get(url, headers=headers, params=page_params)
+            return response.json()
+
+        pending = asyncio.ensure_future(fetch(params.get("next_cursor")))
+        try:
+            while pending is not None:
+                page = await pending
+                cursor = page.get("next_cursor")
+                pending = asyncio.ensure_future(fetch(cursor)) if cursor and page.get("results") else None
+                yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+async def _fetch_full_options_chain(params: Dict, max_rows: int, max_bytes: int) -> Dict:
+    """
+    Fetch every page of an options chain into one result, stopping once `max_rows` rows or `max_bytes` bytes (of row JSON) are collected.
+    """
+    results = []
+    total_bytes = 0
+    pages = 0
+    next_cursor = None
+    cut_mid_page = False
+    pages_iter = _iter_options_chain_pages({**params, "limit": OPTIONS_CHAIN_MAX_PAGE_SIZE})
+    try:
+        async for page in pages_iter:
+            if "results" not in page:
+                if not results:
+                    return page
+                break
+            pages += 1
+            next_cursor = page.get("next_cursor")
+            for row in page["results"]:
+                row_bytes = len(json.dumps(row, separators=(",", ":")))
+                if len(results) >= max_rows or total_bytes + row_bytes > max_bytes:
+                    cut_mid_page = True
+                    break
+                results.append(row)
+                total_bytes += row_bytes
+            if cut_mid_page or len(results) >= max_rows:
+                break
+    finally:
+        await pages_iter.aclose()
+    return {
+        "results": results,
+        # A page cut short can't be resumed with a cursor.
+        "next_cursor": None if cut_mid_page else next_cursor,
+        "pages": pages,
+        "truncated": cut_mid_page or bool(next_cursor),
+    }
+
 @mcp.tool
 async def get_options_chain(underlying_asset_symbol: str, 
                            strike_price: float = None, 
@@ -1005,7 +1930,10 @@ async def get_options_chain(underlying_asset_symbol: str,
                            next_cursor: str = None,
                            limit: int = 10,
                            order: Literal["ASC", "DESC"] = None,
-                           sort_by: Literal["symbol", "expiry", "strike_price"] = None) -> Dict:
+                           sort_by: Literal["symbol", "expiry", "strike_price"] = None,
+                           auto_paginate: bool = False,
+                           max_rows: int = 1000,
+                           max_bytes: int = 1_000_000) -> Dict:
     """
     Get options chain data for a specific underlying asset symbol.
     
@@ -1018,10 +1946,13 @@ async def get_options_chain(underlying_asset_symbol: str,
         limit: Optional limit for results (max 250, default 10)
         order: Optional sort order ("ASC" or "DESC")
         sort_by: Optional sort field ("symbol", "expiry", or "strike_price")
+        auto_paginate: Fetch every page (following next_cursor) and return them in a single response. limit is ignored.
+        max_rows: With auto_paginate, stop after this many results (default 1000)
+        max_bytes: With auto_paginate, stop once the results would exceed this many bytes of JSON (default 1,000,000)
     
     Returns options chain data with results array and next_cursor for pagination.
+    With auto_paginate, "truncated" is true if max_rows or max_bytes was reached; narrow the filters to get the rest.
     """
-    url = f"{get_base_url()}/api/v1/market-data/options/chain"
     params = {"underlying_asset_symbol": underlying_asset_symbol}
     
     if strike_price is not None:
@@ -1033,14 +1964,17 @@ async def get_options_chain(underlying_asset_symbol: str,
     if next_cursor:
         params["next_cursor"] = next_cursor
     if limit != 10:
-        params["limit"] = min(limit, 250)  # Enforce max limit of 250
+        params["limit"] = min(limit, OPTIONS_CHAIN_MAX_PAGE_SIZE)  # Enforce max limit of 250
     if order:
         params["order"] = order
     if sort_by:
         params["sort_by"] = sort_by
     
     try:
-        async with httpx.AsyncClient() as client:
+        if auto_paginate:
+            return await _fetch_full_options_chain(params, max_rows, max_bytes)
+        url = f"{get_base_url()}/api/v1/market-data/options/chain"
+        async with upstream_client() as client:
             response = await client.get(
                 url,
                 headers=get_required_headers(),
@@ -1051,6 +1985,105 @@ async def get_options_chain(underlying_asset_symbol: str,
         logger.error(f"Error getting options chain: {e}")
         return {"error": truncate_text(str(e), 1000)}
 
+# Rows fetched when building an options chain snapshot, and how long the snapshot is reused.
+OPTIONS_CHAIN_SNAPSHOT_MAX_ROWS = 20000
+OPTIONS_CHAIN_SNAPSHOT_TTL = 5 * 60
+
+options_chain_indexes = LRUCache(max_entries=64, ttl=OPTIONS_CHAIN_SNAPSHOT_TTL)
+_options_chain_index_builds: Dict[tuple, asyncio.Future] = {}
+
+async def _get_options_chain_index(underlying_asset_symbol: str,
+                                   contract_type: Optional[str] = None,
+                                   refresh: bool = False) -> OptionsChainIndex:
+    """
+    Get the cached chain snapshot of an underlying, fetching the chain if it's missing or stale.
+    With a contract_type, only that side of the chain is fetched, unless a complete snapshot of the whole chain is cached.
+    The chain is fetched in expiry order, so a snapshot cut at OPTIONS_CHAIN_SNAPSHOT_MAX_ROWS holds the nearest expiries.
+    Concurrent callers share a single fetch.
+    """
+    scope = (get_base_url(), get_credential_fingerprint(), underlying_asset_symbol)
+    if not refresh:
+        whole_chain = options_chain_indexes.get((*scope, None))
+        if whole_chain is not None and (contract_type is None or whole_chain.covers()):
+            return whole_chain
+        index = options_chain_indexes.get((*scope, contract_type)) if contract_type else None
+        if index is not None:
+            return index
+    key = (*scope, contract_type)
+    if key not in _options_chain_index_builds:
+        async def build() -> OptionsChainIndex:
+            try:
+                params = {"underlying_asset_symbol": underlying_asset_symbol, "sort_by": "expiry", "order": "ASC"}
+                if contract_type:
+                    params["contract_type"] = contract_type
+                chain = await _fetch_full_options_chain(params, OPTIONS_CHAIN_SNAPSHOT_MAX_ROWS, float("inf"))
+                if "results" not in chain:
+                    raise ValueError(f"Unexpected options chain response: {truncate_text(str(chain), 500)}")
+                index = OptionsChainIndex(chain["results"], truncated=chain["truncated"])
+                options_chain_indexes.set(key, index)
+                return index
+            finally:
+                _options_chain_index_builds.pop(key, None)
+        _options_chain_index_builds[key] = asyncio.ensure_future(build())
+    return await asyncio.shield(_options_chain_index_builds[key])
+
+@mcp.tool
+async def query_options_chain(underlying_asset_symbol: str,
+                              contract_type: Literal["CALL", "PUT"] = None,
+                              min_strike: float = None,
+                              max_strike: float = None,
+                              expiry_from: str = None,
+                              expiry_to: str = None,
+                              max_days_to_expiry: int = None,
+                              moneyness: Literal["ITM", "ATM", "OTM"] = None,
+                              underlying_price: float = None,
+                              limit: int = 100,
+                              refresh: bool = False) -> Dict:
+    """
+    Query an options chain by strike range, expiry window, contract type and moneyness in a single call.
+    Prefer this over paging through `get_options_chain` with exact strike_price/expiry filters.
+    Example: calls on AAPL with strikes between 180 and 220 expiring in the next 30 days:
+    underlying_asset_symbol="AAPL", contract_type="CALL", min_strike=180, max_strike=220, max_days_to_expiry=30
+
+    Args:
+        underlying_asset_symbol: Same format as `get_options_chain`
+        contract_type: Optional "CALL" or "PUT"
+        min_strike / max_strike: Optional inclusive strike range
+        expiry_from / expiry_to: Optional inclusive expiry range in YYYY-MM-DD format
+        max_days_to_expiry: Optional alternative to expiry_to, counted from today
+        moneyness: Optional "ITM", "ATM" (strike within 2% of the underlying price) or "OTM". Requires underlying_price.
+        underlying_price: Current price of the underlying, used for moneyness
+        limit: Maximum number of contracts returned (default 100)
+        refresh: Refetch the chain instead of using a snapshot up to 5 minutes old
+
+    Returns the matching contracts ordered by expiry then strike, the total number of matches,
+    and the age of the chain snapshot in seconds.
+    Chains with more than 20,000 contracts are only indexed up to that many contracts (nearest
+    expiries first). "complete" is false when contracts matching the query may be missing for that reason;
+    pass contract_type or an earlier expiry_to to get complete results.
+    """
+    try:
+        if max_days_to_expiry is not None:
+            max_expiry = days_from_today(max_days_to_expiry)
+            expiry_to = min(expiry_to, max_expiry) if expiry_to else max_expiry
+        index = await _get_options_chain_index(underlying_asset_symbol, contract_type, refresh)
+        matches = index.query(contract_type, min_strike, max_strike, expiry_from, expiry_to, moneyness, underlying_price)
+        response = {
+            "results": matches[:limit],
+            "total_matches": len(matches),
+            "snapshot_size": index.size,
+            "snapshot_age_seconds": round(index.age(), 1),
+            "complete": index.covers(expiry_to),
+        }
+        if not response["complete"]:
+            complete_before = f" (complete for expiries before {index.complete_before})" if index.complete_before else ""
+            response["warning"] = (f"The chain has more than {index.size} contracts and only the first {index.size} were indexed"
+                                   f"{complete_before}, so matches may be missing. Narrow the query with contract_type or expiry_to.")
+        return response
+    except Exception as e:
+        logger.error(f"Error querying options chain: {e}")
+        return {"error": truncate_text(str(e), 1000)}
+
 @mcp.tool
 async def get_options_contract(
     symbol: str = Field(
@@ -1068,7 +2101,7 @@ async def get_options_contract(
     params = {"symbol": symbol}
     
     try:
-        async with httpx.AsyncClient() as client:
+        async with upstream_client() as client:
             response = await client.get(
                 url,
                 headers=get_required_headers(),
@@ -1086,15 +2119,18 @@ async def get_options_calendar(symbol: str) -> Dict:
     """
     url = f"{get_base_url()}/api/v1/market-data/options/overview"
     params = {"symbol": symbol}
-    
-    try:
-        async with httpx.AsyncClient() as client:
+
+    async def fetch() -> tuple:
+        async with upstream_client() as client:
             response = await client.get(
                 url,
                 headers=get_required_headers(),
                 params=params
             )
-        return response.json()
+        return response.json(), response.is_success
+
+    try:
+        return await _session_cached(("options-calendar", get_base_url(), get_credential_fingerprint(), symbol), fetch)
     except Exception as e:
         logger.error(f"Error getting options overview: {e}")
         return {"error": truncate_text(str(e), 1000)}
@@ -1107,7 +2143,7 @@ def compare_live_vs_backtest_performance() -> str:
     Compare live performance for each symphony against the backtest over the same time period. Return the results as a table.
     """
     return f"""Compare my live performance for each symphony against the backtest over the same time period.
-    Also compare the live performance against SPY over the same time period (the backtest should already return SPY's performance in the `benchmarks` field).
+    Also compare the live performance against SPY over the same time period.
     Use time-weighted returns to compare the performance without the impact of deposits and withdrawals.
     Return the results as a simple markdown table with two additional columns:
     - "Deviation from backtest" = (live time weighted return - backtest return)
@@ -1118,13 +2154,11 @@ def compare_live_vs_backtest_performance() -> str:
 
     Relevant Composer tools:
     - list_accounts
-    - get_aggregate_symphony_stats
-    - backtest_symphony_by_id (call this for each symphony returned by `get_aggregate_symphony_stats`)
+    - compare_live_vs_backtest (call this once per account; it returns the table with both deviation columns already computed and sorted)
 
     Tips:
     - Avoid using your "analyze" tool because it is buggy.
-    - Note that some symphonies contain the | (pipe) character in their name, which causes issues with markdown tables.
-      Since different clients use different markdown renderers, the simplest solution is to replace all | with -.
+    - Don't recompute the returns or deviations yourself; use the values returned by `compare_live_vs_backtest`.
     """
 
 @mcp.prompt
@@ -1134,20 +2168,64 @@ def explain_symphony(symphony_id_or_url) -> str:
     """
     return f"""Explain this symphony to me: {symphony_id_or_url}. Describe its investment thesis and explain its statistics to me."""
 
+@mcp.resource("composer://exports/{export_id}", mime_type="application/octet-stream")
+async def get_export(export_id: str) -> bytes:
+    """
+    An Arrow IPC or Parquet export of daily series, created by a tool called with `export_format`.
+    """
+    return await export_store.read(export_id, get_credential_fingerprint())
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request) -> JSONResponse:
-    return JSONResponse({"status": "healthy"})
+    cluster = cluster_health()
+    if cluster is None:
+        return JSONResponse({"status": "healthy"})
+    if cluster["draining"]:
+        return JSONResponse({"status": "draining", **cluster}, status_code=503)
+    degraded = cluster["workers_expected"] is not None and cluster["workers_ready"] < cluster["workers_expected"]
+    return JSONResponse({"status": "degraded" if degraded else "healthy", **cluster})
 
 @mcp.custom_route("/", methods=["GET"])
 async def startup_check(request: Request) -> JSONResponse:
     return JSONResponse({"status": "ok"})
 
+metrics.track_cache("backtests", backtest_cache)
+metrics.track_cache("search", search_cache)
+metrics.track_cache("market_session", session_cache)
+metrics.track_cache("options_chain_indexes", options_chain_indexes)
+metrics.track_cache("submitted_orders", submitted_orders)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """
+    Prometheus metrics of this process. With several workers, each worker answers with its own counters,
+    so a scrape only sees the worker that served it; label or aggregate accordingly.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def http_middleware() -> List[ASGIMiddleware]:
+    """
+    ASGI middleware of the HTTP transport.
+    """
+    return [ASGIMiddleware(CompressionMiddleware)] if COMPRESSION_ENABLED else []
+
+def run_worker():
+    """
+    Entry point of the worker processes started by `main()` in multi-process mode.
+    """
+    serve_worker(mcp.http_app(transport="http", stateless_http=True, middleware=http_middleware()))
+
 def main():
+    workers = int(os.getenv("COMPOSER_MCP_WORKERS", "1"))
+    if workers > 1:
+        worker_command = [sys.executable, "-c", "from composer_trade_mcp.server import run_worker; run_worker()"]
+        sys.exit(Supervisor(worker_command, workers, "0.0.0.0", int(os.getenv("PORT", 8080))).run())
     asyncio.run(
         mcp.run_async(
             transport="http",
             host="0.0.0.0",
             port=int(os.getenv("PORT", 8080)),
+            middleware=http_middleware(),
         )
     )
     logger.info(f"🚀 MCP server started on port {os.getenv('PORT', 8080)}!")
@@ -2,18 +2,34 @@
 Utility functions for Composer MCP Server.
 """
 
-from .parsers import parse_stats, parse_dvm_capital, parse_backtest_output, epoch_to_date, epoch_ms_to_date
-from .auth import get_optional_headers, get_required_headers, get_mcp_environment
+from .parsers import parse_stats, parse_extended_stats, parse_dvm_capital, parse_backtest_output, epoch_to_date, epoch_ms_to_date, date_to_epoch
+from .auth import get_optional_headers, get_required_headers, get_mcp_environment, get_credential_fingerprint
+from .cache import LRUCache, SQLiteCache, make_cache
+from .backtest import stitch_backtest, truncate_backtest
+from .concurrency import gather_bounded
+from .aggregation import merge_holdings, merge_portfolio_stats, net_trades
 
 __all__ = [
     "parse_stats",
+    "parse_extended_stats",
     "parse_dvm_capital", 
     "parse_backtest_output",
     "epoch_to_date",
     "epoch_ms_to_date",
+    "date_to_epoch",
     "get_optional_headers",
     "get_required_headers",
-    "get_mcp_environment"
+    "get_mcp_environment",
+    "get_credential_fingerprint",
+    "LRUCache",
+    "SQLiteCache",
+    "make_cache",
+    "stitch_backtest",
+    "truncate_backtest",
+    "gather_bounded",
+    "merge_holdings",
+    "merge_portfolio_stats",
+    "net_trades",
 ]
 
 def truncate_text(text: str, max_length: int) -> str:
@@ -0,0 +1,140 @@
+"""
+Vectorized aggregation helpers for combining data across accounts and symphonies.
+"""
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+def group_sum(keys: Sequence[str], values: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """
+    Sum the rows of `values` (shape (n,) or (n, k)) that share the same key.
+    Returns the sorted unique keys and the summed rows in the same order.
+    """
+    unique_keys, inverse = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+    sums = np.zeros((len(unique_keys),) + values.shape[1:], dtype=np.float64)
+    np.add.at(sums, inverse, values)
+    return unique_keys.tolist(), sums
+
+HOLDING_COLUMNS = ("amount", "value")
+HOLDING_SOURCES = ("direct", "symphony")
+
+def merge_holdings(holdings_by_account: Dict[str, List[Dict]]) -> Dict:
+    """
+    Merge the "holdings" lists of several `get_account_holdings` responses by ticker.
+    Amounts and values are summed per source ("direct", "symphony") and overall, and each ticker's
+    allocation is recomputed as its share of the combined value of all holdings.
+    """
+    tickers = []
+    account_uuids = []
+    rows = []
+    for account_uuid, holdings in holdings_by_account.items():
+        for holding in holdings:
+            tickers.append(holding.get("ticker"))
+            account_uuids.append(account_uuid)
+            rows.append([
+                (holding.get(source) or {}).get(column) or 0
+                for source in HOLDING_SOURCES for column in HOLDING_COLUMNS
+            ])
+    if not rows:
+        return {"total_value": 0.0, "holdings": []}
+
+    unique_tickers, sums = group_sum(tickers, np.asarray(rows, dtype=np.float64))
+    overall = sums[:, :len(HOLDING_COLUMNS)] + sums[:, len(HOLDING_COLUMNS):]
+    total_value = float(overall[:, 1].sum())
+    allocations = overall[:, 1] / total_value if total_value else np.zeros(len(unique_tickers))
+
+    accounts_by_ticker: Dict[str, List[str]] = {}
+    for ticker, account_uuid in zip(tickers, account_uuids):
+        accounts_by_ticker.setdefault(str(ticker), []).append(account_uuid)
+
+    merged = []
+    for i in np.argsort(-overall[:, 1], kind="stable"):
+        ticker = unique_tickers[i]
+        merged.append({
+            "ticker": ticker,
+            "accounts": accounts_by_ticker[ticker],
+            "direct": {"amount": float(sums[i, 0]), "value": float(sums[i, 1])},
+            "symphony": {"amount": float(sums[i, 2]), "value": float(sums[i, 3])},
+            "overall_portfolio": {
+                "allocation": float(allocations[i]),
+                "amount": float(overall[i, 0]),
+                "value": float(overall[i, 1]),
+            },
+        })
+    return {"total_value": total_value, "holdings": merged}
+
+PORTFOLIO_STATS_SUM_FIELDS = ("portfolio_value", "total_cash", "pending_deploys_cash", "total_unallocated_cash", "net_deposits", "todays_dollar_change")
+
+def merge_portfolio_stats(stats: List[Dict]) -> Dict:
+    """
+    Combine several `get_aggregate_portfolio_stats` responses into household-level totals.
+    Dollar fields are summed; simple_return and todays_percent_change are recomputed from the totals.
+    """
+    matrix = np.asarray([[s.get(field) or 0 for field in PORTFOLIO_STATS_SUM_FIELDS] for s in stats], dtype=np.float64)
+    totals = dict(zip(PORTFOLIO_STATS_SUM_FIELDS, (matrix.sum(axis=0) if len(stats) else np.zeros(len(PORTFOLIO_STATS_SUM_FIELDS))).tolist()))
+    totals["simple_return"] = (totals["portfolio_value"] - totals["net_deposits"]) / totals["net_deposits"] if totals["net_deposits"] else 0.0
+    totals["todays_percent_change"] = totals["todays_dollar_change"] / totals["portfolio_value"] if totals["portfolio_value"] else 0.0
+    return totals
+
+def _signed_trade_columns(trade: Dict) -> Tuple[float, float]:
+    """
+    Signed (notional, quantity) of a trade preview row: positive for buys, negative for sells.
+    """
+    notional = float(trade.get("notional") or 0)
+    quantity = float(trade.get("quantity") or 0)
+    if str(trade.get("side", "")).upper() == "SELL":
+        return -abs(notional), -abs(quantity)
+    if str(trade.get("side", "")).upper() == "BUY":
+        return abs(notional), abs(quantity)
+    return notional, quantity
+
+def net_trades(trades_by_symphony: Dict[str, List[Dict]], cost_bps: float = 5.0) -> Dict:
+    """
+    Net the trade previews of several symphonies per ticker.
+
+    Gross turnover is the sum of every trade's absolute notional; net turnover is the sum over tickers of the absolute
+    net notional. Estimated cost savings assume trading costs (spread, slippage, fees) of `cost_bps` basis points
+    of turnover.
+    """
+    tickers = []
+    rows = []
+    symphony_ids = []
+    for symphony_id, trades in trades_by_symphony.items():
+        for trade in trades:
+            ticker = trade.get("symbol") or trade.get("ticker")
+            if ticker is None:
+                continue
+            tickers.append(ticker)
+            symphony_ids.append(symphony_id)
+            notional, quantity = _signed_trade_columns(trade)
+            rows.append([notional, quantity, abs(notional)])
+    if not rows:
+        return {"gross_turnover": 0.0, "net_turnover": 0.0, "turnover_saved": 0.0, "estimated_cost_savings": 0.0, "trades": []}
+
+    unique_tickers, sums = group_sum(tickers, np.asarray(rows, dtype=np.float64))
+    net_notional, net_quantity, gross_notional = sums.T
+    gross_turnover = float(gross_notional.sum())
+    net_turnover = float(np.abs(net_notional).sum())
+
+    symphonies_by_ticker: Dict[str, set] = {}
+    for ticker, symphony_id in zip(tickers, symphony_ids):
+        symphonies_by_ticker.setdefault(str(ticker), set()).add(symphony_id)
+
+    order = np.argsort(-np.abs(net_notional), kind="stable")
+    trades = [
+        {
+            "symbol": unique_tickers[i],
+            "side": "BUY" if net_notional[i] > 0 else "SELL" if net_notional[i] < 0 else "NONE",
+            "net_notional": round(float(net_notional[i]), 2),
+            "net_quantity": float(net_quantity[i]),
+            "gross_notional": round(float(gross_notional[i]), 2),
+            "symphony_ids": sorted(symphonies_by_ticker[unique_tickers[i]]),
+        }
+        for i in order
+    ]
+    return {
+        "gross_turnover": round(gross_turnover, 2),
+        "net_turnover": round(net_turnover, 2),
+        "turnover_saved": round(gross_turnover - net_turnover, 2),
+        "estimated_cost_savings": round((gross_turnover - net_turnover) * cost_bps / 10_000, 2),
+        "trades": trades,
+    }
@@ -5,11 +5,22 @@ Authentication utilities for Composer MCP Server.
 from fastmcp.server.dependencies import get_http_headers
 from typing import Dict
 import base64
+import hashlib
+
+from .context import current_request_context
+from .profiling import PROFILE_HEADER
+from .tracing import traced
+
+# Incoming headers meant for this server only, never forwarded to the Composer API.
+SERVER_ONLY_HEADERS = {PROFILE_HEADER}
 
 def get_mcp_environment() -> str:
     """
     Get the environment of the MCP server.
     """
+    context = current_request_context()
+    if context is not None:
+        return context.environment
     headers = get_http_headers()
     return headers.get("x-composer-mcp-environment", "prod")
 
@@ -20,8 +31,9 @@ def _parse_authorization_header(headers: Dict[str, str]) -> Dict[str, str]:
     
     For Bearer: expects x-api-key-id header and Bearer token in Authorization
     For Basic: expects base64(api_key:secret) in Authorization header
+    Headers in SERVER_ONLY_HEADERS are dropped.
     """
-    result_headers = headers.copy()
+    result_headers = {name: value for name, value in headers.items() if name not in SERVER_ONLY_HEADERS}
     auth_header = headers.get("authorization", "")
     
     if auth_header.startswith("Basic "):
@@ -38,11 +50,17 @@ def _parse_authorization_header(headers: Dict[str, str]) -> Dict[str, str]:
     
     return result_headers
 
+@traced()
 def get_optional_headers() -> Dict[str, str]:
     """
     Get headers for optional authentication (read-only operations).
     Always includes x-origin. Only includes API key and secret if both are present.
     """
+    context = current_request_context()
+    if context is not None:
+        if context.optional_headers_error:
+            raise ValueError(context.optional_headers_error)
+        return dict(context.optional_headers)
     headers = _parse_authorization_header(get_http_headers())
     headers["x-origin"] = "public-api"
     api_key = headers.get("x-api-key-id")
@@ -53,11 +71,17 @@ def get_optional_headers() -> Dict[str, str]:
         return {"x-origin": "public-api"}
 
 
+@traced()
 def get_required_headers() -> Dict[str, str]:
     """
     Get headers for required authentication (write operations).
     Requires both API key and secret key to be present.
     """
+    context = current_request_context()
+    if context is not None:
+        if context.required_headers_error:
+            raise ValueError(context.required_headers_error)
+        return dict(context.required_headers)
     headers = _parse_authorization_header(get_http_headers())
     headers["x-origin"] = "public-api"
     api_key = headers.get("x-api-key-id")
@@ -69,3 +93,16 @@ def get_required_headers() -> Dict[str, str]:
         raise ValueError("Authorization header is required but not set")
 
     return headers
+
+
+def get_credential_fingerprint() -> str:
+    """
+    Get a stable, non-reversible fingerprint of the caller's credentials.
+    Used to scope cached upstream responses to the user that fetched them.
+    """
+    context = current_request_context()
+    if context is not None and context.credential_fingerprint is not None:
+        return context.credential_fingerprint
+    headers = get_optional_headers()
+    credentials = f"{headers.get('x-api-key-id', '')}:{headers.get('authorization', '')}"
+    return hashlib.sha256(credentials.encode("utf-8")).hexdigest()
@@ -0,0 +1,92 @@
+"""
+Utilities for extending cached symphony backtests with newer market days.
+"""
+from typing import List, Optional
+
+from ..schemas.backtest_api import BacktestResponse
+from .stats import compute_backtest_stats, find_primary_key
+
+def stitch_backtest(cached: BacktestResponse,
+                    tail: BacktestResponse,
+                    benchmark_keys: List[str],
+                    primary_key: Optional[str] = None) -> Optional[BacktestResponse]:
+    """
+    Append the market days of a short `tail` backtest to a `cached` backtest.
+
+    Each tail series is rescaled so it matches the cached series on the latest day both have in common,
+    then only the days after that anchor are appended. Holdings and value are rescaled by the symphony's factor
+    and stats are recomputed from the merged series.
+
+    Returns None if the two backtests can't be stitched (e.g. no overlapping day), in which case a full
+    backtest should be run instead.
+    """
+    if not cached.dvm_capital or not tail.dvm_capital:
+        return None
+    primary_key = find_primary_key(cached.dvm_capital, benchmark_keys, primary_key)
+    if primary_key is None:
+        return None
+
+    merged = {}
+    scales = {}
+    for key, entry in cached.dvm_capital.items():
+        tail_entry = tail.dvm_capital.get(key)
+        if not tail_entry:
+            return None
+        common_days = entry.keys() & tail_entry.keys()
+        if not common_days:
+            return None
+        anchor = max(common_days)
+        if not tail_entry[anchor]:
+            return None
+        scale = entry[anchor] / tail_entry[anchor]
+        merged_entry = dict(entry)
+        merged_entry.update({day: value * scale for day, value in tail_entry.items() if day > anchor})
+        merged[key] = merged_entry
+        scales[key] = scale
+
+    scale = scales[primary_key]
+    return BacktestResponse(
+        data_warnings=tail.data_warnings or cached.data_warnings,
+        first_day=cached.first_day,
+        capital=cached.capital,
+        last_market_day=max(cached.last_market_day or 0, tail.last_market_day or 0) or None,
+        last_market_days_holdings={
+            ticker: shares * scale for ticker, shares in (tail.last_market_days_holdings or {}).items()
+        },
+        last_market_days_value=tail.last_market_days_value * scale if tail.last_market_days_value is not None else None,
+        stats=compute_backtest_stats(merged, primary_key, benchmark_keys),
+        dvm_capital=merged,
+        legend={**(cached.legend or {}), **(tail.legend or {})},
+    )
+
+def truncate_backtest(backtest: BacktestResponse,
+                      end_day: int,
+                      benchmark_keys: List[str],
+                      primary_key: Optional[str] = None) -> Optional[BacktestResponse]:
+    """
+    Cut a backtest off after `end_day`, recomputing stats from the remaining series.
+    Holdings aren't known for earlier days, so they are dropped.
+    """
+    if not backtest.dvm_capital:
+        return None
+    primary_key = find_primary_key(backtest.dvm_capital, benchmark_keys, primary_key)
+    if primary_key is None:
+        return None
+    truncated = {
+        key: {day: value for day, value in entry.items() if day <= end_day}
+        for key, entry in backtest.dvm_capital.items()
+    }
+    if not truncated[primary_key]:
+        return None
+    last_day = max(truncated[primary_key])
+    return BacktestResponse(
+        data_warnings=backtest.data_warnings,
+        first_day=backtest.first_day,
+        capital=backtest.capital,
+        last_market_day=last_day,
+        last_market_days_holdings=None,
+        last_market_days_value=truncated[primary_key][last_day],
+        stats=compute_backtest_stats(truncated, primary_key, benchmark_keys),
+        dvm_capital=truncated,
+        legend=backtest.legend,
+    )
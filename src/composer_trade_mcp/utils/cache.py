@@ -0,0 +1,192 @@
+"""
+Caching utilities for Composer MCP Server.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Union
+import asyncio
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with optional per-entry expiry.
+
+    Entries expire either after `ttl` seconds or at an absolute `expires_at` unix timestamp.
+    Expired entries are dropped lazily when they are read.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Same as `get`; for callers that may be given a `SQLiteCache`.
+        """
+        return self.get(key, default)
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        """
+        Same as `set`; for callers that may be given a `SQLiteCache`.
+        """
+        self.set(key, value, ttl, expires_at)
+
+    async def apop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Same as `pop`; for callers that may be given a `SQLiteCache`.
+        """
+        return self.pop(key, default)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache:
+    """
+    Cache with the interface of `LRUCache`, stored in a SQLite database so that the worker processes of one host
+    share it (see utils/workers.py). Values are pickled, so only point it at a database written by this server.
+
+    Keys are hashed from their repr, so they should be tuples of strings and numbers. Values can be large (whole
+    backtests), so async code should use `aget` and `aset`, which pickle and query on a thread instead of blocking
+    the event loop. Each thread has its own connection. Hit and miss counts are per process.
+    """
+
+    def __init__(self, path: str, name: str, max_entries: int = 256, ttl: Optional[float] = None):
+        self.path = path
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        # Connections must not be shared across threads or a fork.
+        if getattr(self._local, "connection", None) is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "name TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (name, key))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (name, accessed_at)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        db = self._db()
+        hashed = self._key(key)
+        now = time.time()
+        row = db.execute("SELECT value, expires_at FROM cache WHERE name = ? AND key = ?", (self.name, hashed)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            db.execute("DELETE FROM cache WHERE name = ? AND key = ?", (self.name, hashed))
+            self.misses += 1
+            return default
+        db.execute("UPDATE cache SET accessed_at = ? WHERE name = ? AND key = ?", (now, self.name, hashed))
+        self.hits += 1
+        return pickle.loads(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        now = time.time()
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = now + ttl if ttl is not None else None
+        db = self._db()
+        db.execute(
+            "INSERT OR REPLACE INTO cache (name, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (self.name, self._key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at, now),
+        )
+        db.execute(
+            "DELETE FROM cache WHERE name = ? AND key IN "
+            "(SELECT key FROM cache WHERE name = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.name, self.name, self.max_entries),
+        )
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl, expires_at)
+
+    async def apop(self, key: Hashable, default: Any = None) -> Any:
+        return await asyncio.to_thread(self.pop, key, default)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self._db().execute("DELETE FROM cache WHERE name = ? AND key = ?", (self.name, self._key(key)))
+        return value
+
+    def clear(self) -> None:
+        self._db().execute("DELETE FROM cache WHERE name = ?", (self.name,))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM cache WHERE name = ?", (self.name,)).fetchone()[0]
+
+def make_cache(name: str, max_entries: int = 256, ttl: Optional[float] = None) -> Union[LRUCache, SQLiteCache]:
+    """
+    Cache for shareable values: in memory by default, or in the SQLite database at COMPOSER_MCP_CACHE_PATH
+    when COMPOSER_MCP_CACHE_BACKEND=sqlite (the default for multi-process serving).
+    """
+    backend = os.getenv("COMPOSER_MCP_CACHE_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        return SQLiteCache(os.getenv("COMPOSER_MCP_CACHE_PATH", "composer-mcp-cache.sqlite3"), name, max_entries, ttl)
+    if backend != "memory":
+        raise ValueError(f"Unknown cache backend: {backend}")
+    return LRUCache(max_entries=max_entries, ttl=ttl)
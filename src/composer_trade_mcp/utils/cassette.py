@@ -0,0 +1,197 @@
+"""
+Record and replay of upstream Composer API traffic, for offline performance regression testing.
+
+With COMPOSER_MCP_CASSETTE set to a path, COMPOSER_MCP_CASSETTE_MODE selects:
+- "record": requests go upstream as usual; every tool call and every upstream request/response is appended to the cassette.
+- "replay": upstream requests are answered from the cassette and never leave the process.
+
+A cassette is a JSON-lines file with one entry per line, gzip-compressed when the path ends in ".gz" (one gzip
+member per entry, so the file stays readable however the recording process exits):
+    {"type": "tool", "name": ..., "arguments": {...}}
+    {"type": "http", "method": ..., "url": ..., "body_sha256": ..., "request_headers": {...},
+     "status": ..., "headers": {...}, "body": ..., "elapsed_ms": ...}
+Credential headers are scrubbed before anything is written.
+
+Replay matches requests on method, URL and a hash of the (key-sorted, for JSON) request body. Responses recorded
+for the same request are served in recorded order, and the last one is repeated once they run out, so a replay
+is deterministic for a given sequence of tool calls. Requests missing from the cassette fail with
+`CassetteMissError`. With COMPOSER_MCP_CASSETTE_REPLAY_LATENCY=1 replayed responses are delayed by their recorded
+latency; by default they are served immediately, so a replay measures the server's own overhead.
+"""
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Request headers whose values are never written to a cassette.
+SCRUBBED_HEADERS = {"authorization", "proxy-authorization", "x-api-key-id", "cookie", "x-composer-mcp-profile"}
+# Request headers that vary between runs and say nothing about the request.
+IGNORED_HEADERS = {"traceparent", "content-length", "host", "user-agent", "accept-encoding", "connection"}
+# Response headers worth keeping; the rest are dropped to keep cassettes compact.
+KEPT_RESPONSE_HEADERS = {"content-type", "retry-after"}
+
+class CassetteMissError(httpx.TransportError):
+    pass
+
+def body_hash(content: bytes) -> str:
+    """
+    Hash of a request body. JSON bodies are re-serialized with sorted keys so that key order does not matter.
+    """
+    try:
+        content = json.dumps(json.loads(content), sort_keys=True, separators=(",", ":")).encode()
+    except (ValueError, UnicodeDecodeError):
+        pass
+    return hashlib.sha256(content).hexdigest()
+
+def scrub_headers(headers: httpx.Headers) -> Dict[str, str]:
+    return {
+        name: "[scrubbed]" if name in SCRUBBED_HEADERS else value
+        for name, value in ((name.lower(), value) for name, value in headers.items())
+        if name not in IGNORED_HEADERS
+    }
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+class Cassette:
+    def __init__(self, path: str, mode: str, replay_latency: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.tool_calls: List[Dict[str, Any]] = []
+        self._responses: Dict[Tuple[str, str, str], Deque[Dict]] = defaultdict(deque)
+        self._file = None
+        if mode == "replay":
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        path = os.getenv("COMPOSER_MCP_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            path,
+            os.getenv("COMPOSER_MCP_CASSETTE_MODE", "replay").lower(),
+            replay_latency=os.getenv("COMPOSER_MCP_CASSETTE_REPLAY_LATENCY", "").lower() in ("1", "true", "yes"),
+        )
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _load(self) -> None:
+        with _open(self.path, "r") as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry["type"] == "tool":
+                        self.tool_calls.append(entry)
+                    elif entry["type"] == "http":
+                        self._responses[(entry["method"], entry["url"], entry["body_sha256"])].append(entry)
+            except (EOFError, json.JSONDecodeError) as e:
+                # Entries are flushed one by one, so a cassette whose recording process was killed mid-write is only missing its tail.
+                logger.warning(f"Cassette {self.path} is truncated, using the entries before the truncation: {e!r}")
+
+    def _write(self, entry: Dict) -> None:
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        self._file.write(gzip.compress(line) if self.path.endswith(".gz") else line)
+        self._file.flush()
+
+    def record_tool_call(self, name: str, arguments: Dict[str, Any]) -> None:
+        self._write({"type": "tool", "name": name, "arguments": arguments})
+
+    def record_response(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        entry = {
+            "type": "http",
+            "method": request.method,
+            "url": str(request.url),
+            "body_sha256": body_hash(request.content),
+            "request_headers": scrub_headers(request.headers),
+            "status": response.status_code,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() in KEPT_RESPONSE_HEADERS},
+            "elapsed_ms": round(elapsed * 1000, 2),
+        }
+        try:
+            entry["body"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(response.content).decode()
+        self._write(entry)
+
+    async def replay(self, request: httpx.Request) -> httpx.Response:
+        key = (request.method, str(request.url), body_hash(request.content))
+        recorded = self._responses.get(key)
+        if not recorded:
+            raise CassetteMissError(f"No recorded response for {request.method} {request.url}", request=request)
+        entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+        if self.replay_latency and entry.get("elapsed_ms"):
+            await asyncio.sleep(entry["elapsed_ms"] / 1000)
+        content = base64.b64decode(entry["body_base64"]) if "body_base64" in entry else entry.get("body", "").encode("utf-8")
+        return httpx.Response(entry["status"], headers=entry.get("headers"), content=content, request=request)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that records every request/response to a cassette, or answers requests from it.
+    """
+
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.cassette.recording:
+            return await self.cassette.replay(request)
+        await request.aread()
+        start = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        try:
+            self.cassette.record_response(request, response, time.perf_counter() - start)
+        except Exception as e:
+            logger.error(f"Error recording response to cassette: {e!r}")
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+_cassette: Optional[Cassette] = None
+
+def configure_cassette(cassette: Optional[Cassette] = None) -> Optional[Cassette]:
+    """
+    Use `cassette` (by default the one configured by COMPOSER_MCP_CASSETTE) for all upstream requests.
+    """
+    global _cassette
+    if _cassette is not None:
+        _cassette.close()
+    _cassette = cassette if cassette is not None else Cassette.from_env()
+    if _cassette is not None:
+        logger.info(f"Cassette {_cassette.mode} mode: {_cassette.path}")
+    return _cassette
+
+def active_cassette() -> Optional[Cassette]:
+    return _cassette
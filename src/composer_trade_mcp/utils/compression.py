@@ -0,0 +1,192 @@
+"""
+HTTP compression: negotiated response compression for the MCP HTTP transport, and compression of upstream traffic.
+
+gzip is always available. brotli ("br") and zstd are used when the `brotli` and `zstandard` packages are installed
+(`pip install composer-trade-mcp[compression]`); httpx decodes the same encodings for upstream responses.
+
+Configuration:
+- COMPOSER_MCP_COMPRESSION=off disables response compression.
+- COMPOSER_MCP_COMPRESSION_MIN_BYTES: responses smaller than this are sent uncompressed (default 1024).
+- COMPOSER_MCP_COMPRESS_REQUESTS=1 gzips large upstream request bodies (see `compressed_json`). Off by default,
+  since it needs the upstream API to accept compressed request bodies.
+"""
+from typing import Dict, List, Optional, Tuple
+import gzip
+import json
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_ENABLED = os.getenv("COMPOSER_MCP_COMPRESSION", "on").lower() not in ("0", "off", "false", "no")
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPOSER_MCP_COMPRESSION_MIN_BYTES", 1024))
+COMPRESS_REQUESTS = os.getenv("COMPOSER_MCP_COMPRESS_REQUESTS", "").lower() in ("1", "true", "yes")
+# Request bodies smaller than this are sent uncompressed.
+REQUEST_COMPRESSION_MIN_BYTES = 16 * 1024
+
+# Encodings we can produce and decode, in order of preference.
+ENCODINGS: List[str] = [
+    *(["zstd"] if zstandard is not None else []),
+    *(["br"] if brotli is not None else []),
+    "gzip",
+]
+# Sent upstream instead of whatever Accept-Encoding the MCP client sent, which httpx may not be able to decode.
+ACCEPT_ENCODING = ", ".join(ENCODINGS + ["deflate"])
+
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "text/", "application/javascript", "application/x-ndjson")
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the encoding to use for an Accept-Encoding header, or None for identity.
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    # Highest quality first, then our preference.
+    candidates = [
+        (-accepted.get(encoding, accepted.get("*", 0.0)), preference, encoding)
+        for preference, encoding in enumerate(ENCODINGS)
+    ]
+    quality, _, encoding = min(candidates)
+    return encoding if quality < 0 else None
+
+class StreamCompressor:
+    """
+    Incremental compressor whose output can be flushed after every chunk, so streamed events are not held back.
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=4)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "gzip":
+            return self._compressor.flush(zlib.Z_FINISH)
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    compressor = StreamCompressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+def compressed_json(payload: object) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize `payload` as a JSON request body, gzipped when request compression is enabled and the body is large.
+    Returns the body and the headers to send with it.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"content-type": "application/json"}
+    if COMPRESS_REQUESTS and len(body) >= REQUEST_COMPRESSION_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=6)
+        headers["content-encoding"] = "gzip"
+    return body, headers
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with the best encoding the client accepts.
+
+    Complete responses are compressed when they are at least `minimum_size` bytes. Streamed responses (like the SSE
+    streams of the MCP transport) are compressed when their first chunk is, and every chunk is flushed right away.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        encoding = negotiate(accept_encoding)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size).send)
+
+class _CompressingSender:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self._start = None
+        self._compressor: Optional[StreamCompressor] = None
+        self._passthrough = False
+
+    def _compressible(self) -> bool:
+        headers = {name.lower(): value for name, value in self._start.get("headers", [])}
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+        return content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+
+    def _compressed_start(self, content_length: Optional[int]) -> Dict:
+        headers = [(name, value) for name, value in self._start.get("headers", []) if name.lower() != b"content-length"]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        headers.append((b"vary", b"accept-encoding"))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return {**self._start, "headers": headers}
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._start is None:
+            return await self._send(message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._passthrough:
+            return await self._send(message)
+        if self._compressor is not None:
+            chunk = self._compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += self._compressor.finish()
+            return await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        # First body message: decide whether to compress this response.
+        if not self._compressible() or len(body) < self.minimum_size:
+            self._passthrough = True
+            await self._send(self._start)
+            return await self._send(message)
+        if not more_body:
+            compressed = compress(body, self.encoding)
+            await self._send(self._compressed_start(len(compressed)))
+            return await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
+        self._compressor = StreamCompressor(self.encoding)
+        await self._send(self._compressed_start(None))
+        await self._send({"type": "http.response.body", "body": self._compressor.compress(body), "more_body": True})
@@ -0,0 +1,18 @@
+"""
+Concurrency helpers for fanning out upstream requests.
+"""
+from typing import Any, Awaitable, Iterable, List
+import asyncio
+
+async def gather_bounded(awaitables: Iterable[Awaitable[Any]], limit: int) -> List[Any]:
+    """
+    Like `asyncio.gather(..., return_exceptions=True)`, but with at most `limit` awaitables running at once.
+    Results are returned in input order; failures are returned as the raised exception.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(run(awaitable) for awaitable in awaitables), return_exceptions=True)
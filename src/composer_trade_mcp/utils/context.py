@@ -0,0 +1,81 @@
+"""
+Per-request context: everything derived from the caller's HTTP headers, computed once per tool call.
+
+`RequestContextMiddleware` (utils/middleware.py) builds a `RequestContext` at the start of every tool call and stores
+it in a context variable, so the helpers in utils/auth.py and `get_base_url` read it instead of re-parsing the headers
+for every upstream request. Tasks created during the call (fan-out requests, prefetches) and work offloaded to threads
+copy the context variable, so they share the same object. Outside a tool call (custom routes, tests) the helpers fall
+back to parsing the headers.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, Optional
+import hashlib
+
+@dataclass(frozen=True)
+class RequestContext:
+    environment: str
+    base_url: str
+    # Outbound headers for optional and required authentication, or the error raised when they can't be built.
+    optional_headers: Optional[Mapping[str, str]]
+    required_headers: Optional[Mapping[str, str]]
+    optional_headers_error: Optional[str]
+    required_headers_error: Optional[str]
+    credential_fingerprint: Optional[str]
+    # MCP session of the caller (HTTP transports with sessions only).
+    session_id: Optional[str] = None
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("composer_mcp_request_context", default=None)
+
+def current_request_context() -> Optional[RequestContext]:
+    return _request_context.get()
+
+@contextmanager
+def use_request_context(context: RequestContext) -> Iterator[RequestContext]:
+    token = _request_context.set(context)
+    try:
+        yield context
+    finally:
+        _request_context.reset(token)
+
+def build_request_context(headers: Dict[str, str],
+                          base_url_for: Callable[[str], str],
+                          session_id: Optional[str] = None) -> RequestContext:
+    """
+    Build the context for a request with the given (lowercase) HTTP headers.
+    `base_url_for` maps the MCP environment ("prod" or "dev") to the Composer API base URL.
+    """
+    # Imported here: utils/auth.py reads the context from this module.
+    from .auth import _parse_authorization_header
+
+    environment = headers.get("x-composer-mcp-environment", "prod")
+    optional_headers = required_headers = None
+    optional_error = required_error = fingerprint = None
+    try:
+        parsed = _parse_authorization_header(headers)
+        parsed["x-origin"] = "public-api"
+        api_key = parsed.get("x-api-key-id")
+        secret_key = parsed.get("authorization")
+        optional_headers = MappingProxyType(parsed if api_key and secret_key else {"x-origin": "public-api"})
+        if not api_key:
+            required_error = "X-Api-Key-Id header is required but not set"
+        elif not secret_key:
+            required_error = "Authorization header is required but not set"
+        else:
+            required_headers = MappingProxyType(parsed)
+        credentials = f"{optional_headers.get('x-api-key-id', '')}:{optional_headers.get('authorization', '')}"
+        fingerprint = hashlib.sha256(credentials.encode("utf-8")).hexdigest()
+    except ValueError as e:
+        optional_error = required_error = str(e)
+    return RequestContext(
+        environment=environment,
+        base_url=base_url_for(environment),
+        optional_headers=optional_headers,
+        required_headers=required_headers,
+        optional_headers_error=optional_error,
+        required_headers_error=required_error,
+        credential_fingerprint=fingerprint,
+        session_id=session_id,
+    )
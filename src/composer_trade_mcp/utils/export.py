@@ -0,0 +1,112 @@
+"""
+Binary columnar export of daily series (backtest daily values, daily performance histories) as Arrow IPC or Parquet.
+
+Tools called with `export_format` return a reference to an export instead of the series as JSON lists, so notebooks
+and workflows can load them with pyarrow or pandas (`pd.read_parquet`, `pa.ipc.open_file`, memory-mapped for Arrow)
+without parsing large JSON. Columns keep the names of the JSON response, and the date column is stored as a date.
+Needs the `pyarrow` package (`pip install composer-trade-mcp[export]`).
+
+Exports are stored:
+- in COMPOSER_MCP_EXPORT_DIR when it is set, as files named after the export (the tool returns the path);
+- otherwise in a cache, and read as the MCP resource composer://exports/{export_id} for COMPOSER_MCP_EXPORT_TTL seconds
+  (default 1 hour). Only the credentials that created an export can read it.
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import os
+import re
+import uuid
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from .cache import make_cache
+
+EXPORT_DIR = os.getenv("COMPOSER_MCP_EXPORT_DIR") or None
+EXPORT_TTL = float(os.getenv("COMPOSER_MCP_EXPORT_TTL", 60 * 60))
+# Maximum number of exports kept for reading as MCP resources.
+EXPORT_MAX_ENTRIES = 32
+
+EXPORT_AVAILABLE = pyarrow is not None
+PYARROW_MISSING = "Exporting needs the pyarrow package: pip install 'composer-trade-mcp[export]'"
+
+# File extension and MIME type per export format.
+EXPORT_FORMATS: Dict[str, Dict[str, str]] = {
+    "arrow": {"extension": "arrow", "mime_type": "application/vnd.apache.arrow.file"},
+    "parquet": {"extension": "parquet", "mime_type": "application/vnd.apache.parquet"},
+}
+
+EXPORT_URI_PREFIX = "composer://exports/"
+
+def serialize_columns(columns: Dict[str, List[Any]],
+                      export_format: str,
+                      date_column: Optional[str] = None,
+                      metadata: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Serialize equal-length columns as an Arrow IPC file or a Parquet file.
+    `date_column` holds YYYY-MM-DD strings and is stored as date32. `metadata` is added to the schema metadata.
+    """
+    if pyarrow is None:
+        raise RuntimeError(PYARROW_MISSING)
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    arrays = {
+        name: pyarrow.array(np.array(values, dtype="datetime64[D]")) if name == date_column else pyarrow.array(values)
+        for name, values in columns.items()
+    }
+    table = pyarrow.table(arrays).replace_schema_metadata({k: str(v) for k, v in (metadata or {}).items() if v is not None})
+    sink = pyarrow.BufferOutputStream()
+    if export_format == "arrow":
+        with pyarrow.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pyarrow.parquet.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
+
+class ExportStore:
+    """
+    Stores serialized exports in a directory, or in a cache read through the composer://exports resource.
+    """
+
+    def __init__(self, directory: Optional[str] = EXPORT_DIR, ttl: float = EXPORT_TTL, max_entries: int = EXPORT_MAX_ENTRIES):
+        self.directory = directory
+        self._exports = make_cache("exports", max_entries=max_entries, ttl=ttl)
+
+    async def save(self, data: bytes, export_format: str, name: str, owner: Optional[str]) -> Dict[str, Any]:
+        """
+        Store an export and return where to read it. `name` becomes part of the file name,
+        and `owner` (a credential fingerprint) is the only one allowed to read it as a resource.
+        """
+        export_id = f"{re.sub(r'[^A-Za-z0-9_-]+', '-', name).strip('-')}-{uuid.uuid4().hex}"
+        file_format = EXPORT_FORMATS[export_format]
+        result = {"format": export_format, "mime_type": file_format["mime_type"], "bytes": len(data)}
+        if self.directory:
+            path = os.path.join(os.path.abspath(self.directory), f"{export_id}.{file_format['extension']}")
+            await asyncio.to_thread(self._write, path, data)
+            result["path"] = path
+        else:
+            await self._exports.aset(export_id, (owner, export_format, data))
+            result["uri"] = f"{EXPORT_URI_PREFIX}{export_id}"
+        return result
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        # Write and rename, so readers never see a partial file.
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+    async def read(self, export_id: str, owner: Optional[str]) -> bytes:
+        stored = await self._exports.aget(export_id)
+        if stored is None or stored[0] != owner:
+            raise ValueError(f"Export {export_id} not found or expired")
+        return stored[2]
+
+export_store = ExportStore()
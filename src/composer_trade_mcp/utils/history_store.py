@@ -0,0 +1,108 @@
+"""
+Local append-only store for account and symphony daily performance histories.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Hashable, List, Optional
+import time
+
+from .cache import LRUCache
+from .parsers import epoch_ms_to_date
+
+MS_PER_DAY = 86_400_000
+
+class PerformanceHistory:
+    """
+    Daily performance history of an account or a symphony, in upstream order (ascending epoch_ms).
+
+    Every upstream list that lines up with `epoch_ms` (e.g. "series", "deposit_adjusted_series") is kept as a column.
+    Dates are converted once, when their row is first stored.
+    """
+
+    def __init__(self):
+        self.epoch_ms: List[int] = []
+        self.dates: List[str] = []
+        self.columns: Dict[str, List[Any]] = {}
+        self.meta: Dict[str, Any] = {}
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.synced_at: float = 0.0
+
+    def merge(self, data: Dict) -> int:
+        """
+        Merge a full upstream response into the history and return the number of rows appended.
+
+        If the response extends the stored rows, only the new rows are appended and the last stored row is refreshed
+        (today's value can change during the day). Otherwise, including when upstream restated an earlier row
+        (e.g. a corrected close or a deposit adjustment), the history is replaced.
+        """
+        epoch_ms = data.get("epoch_ms") or []
+        columns = {k: v for k, v in data.items() if k != "epoch_ms" and isinstance(v, list) and len(v) == len(epoch_ms)}
+        self.meta = {k: v for k, v in data.items() if k != "epoch_ms" and k not in columns}
+        self.synced_at = time.time()
+
+        stored = len(self.epoch_ms)
+        extends = (
+            stored > 0
+            and len(epoch_ms) >= stored
+            and columns.keys() == self.columns.keys()
+            and epoch_ms[:stored] == self.epoch_ms
+            and all(values[:stored - 1] == self.columns[name][:-1] for name, values in columns.items())
+        )
+        if not extends:
+            self.epoch_ms = list(epoch_ms)
+            self.dates = [epoch_ms_to_date(d) for d in epoch_ms]
+            self.columns = {k: list(v) for k, v in columns.items()}
+            return len(epoch_ms)
+
+        for name, values in columns.items():
+            self.columns[name][-1] = values[stored - 1]
+            self.columns[name].extend(values[stored:])
+        new_epoch_ms = epoch_ms[stored:]
+        self.epoch_ms.extend(new_epoch_ms)
+        self.dates.extend(epoch_ms_to_date(d) for d in new_epoch_ms)
+        return len(new_epoch_ms)
+
+    def _bounds(self, start_day: Optional[int], end_day: Optional[int]) -> tuple:
+        lo = bisect_left(self.epoch_ms, start_day * MS_PER_DAY) if start_day is not None else 0
+        hi = bisect_right(self.epoch_ms, (end_day + 1) * MS_PER_DAY - 1) if end_day is not None else len(self.epoch_ms)
+        return lo, hi
+
+    def to_response(self, start_day: Optional[int] = None, end_day: Optional[int] = None) -> Dict:
+        """
+        Upstream-shaped response with "dates" instead of "epoch_ms", restricted to the inclusive day range.
+        """
+        lo, hi = self._bounds(start_day, end_day)
+        response = dict(self.meta)
+        response.update({name: values[lo:hi] for name, values in self.columns.items()})
+        response["dates"] = self.dates[lo:hi]
+        return response
+
+    def to_raw(self, start_day: Optional[int] = None, end_day: Optional[int] = None) -> Dict:
+        """
+        Upstream-shaped response (with "epoch_ms"), restricted to the inclusive day range.
+        """
+        lo, hi = self._bounds(start_day, end_day)
+        response = dict(self.meta)
+        response.update({name: values[lo:hi] for name, values in self.columns.items()})
+        response["epoch_ms"] = self.epoch_ms[lo:hi]
+        return response
+
+class HistoryStore:
+    """
+    Bounded store of PerformanceHistory objects, keyed by (base URL, user, account, symphony).
+    Histories synced within `fresh_for` seconds are served without contacting upstream.
+    """
+
+    def __init__(self, max_entries: int = 256, fresh_for: float = 300):
+        self.fresh_for = fresh_for
+        self._histories = LRUCache(max_entries=max_entries)
+
+    def get(self, key: Hashable) -> PerformanceHistory:
+        history = self._histories.get(key)
+        if history is None:
+            history = PerformanceHistory()
+            self._histories.set(key, history)
+        return history
+
+    def is_fresh(self, history: PerformanceHistory) -> bool:
+        return bool(history.epoch_ms) and time.time() - history.synced_at < self.fresh_for
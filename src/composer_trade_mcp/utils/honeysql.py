@@ -0,0 +1,204 @@
+"""
+Helpers for the HoneySQL (Clojure) style clauses accepted by `search_symphonies`,
+and a local evaluator for the subset of HoneySQL used there.
+"""
+from typing import Any, Dict, List, Optional
+import json
+
+import numpy as np
+
+# Operators whose operands can be reordered without changing the result.
+COMMUTATIVE_OPERATORS = {"and", "or"}
+
+def _operator(value: Any) -> Any:
+    # HoneySQL accepts both "and" and ":and"
+    return value.lstrip(":").lower() if isinstance(value, str) else value
+
+def canonicalize_clause(clause: Any) -> Any:
+    """
+    Normalize a where clause so equivalent clauses compare equal:
+    operators are lowercased without a leading ":", whole floats become ints, nested and/or clauses are flattened,
+    and and/or operands are deduplicated and sorted.
+    """
+    if isinstance(clause, float) and clause.is_integer():
+        return int(clause)
+    if not isinstance(clause, list) or not clause:
+        return clause
+    if len(clause) == 1 and isinstance(clause[0], list):
+        return canonicalize_clause(clause[0])
+    operator = _operator(clause[0])
+    operands = [canonicalize_clause(operand) for operand in clause[1:]]
+    if operator in COMMUTATIVE_OPERATORS:
+        flattened = []
+        for operand in operands:
+            if isinstance(operand, list) and operand and operand[0] == operator:
+                flattened.extend(operand[1:])
+            else:
+                flattened.append(operand)
+        unique = {json.dumps(operand, sort_keys=True): operand for operand in flattened}
+        operands = [unique[key] for key in sorted(unique)]
+        if len(operands) == 1:
+            return operands[0]
+    return [operator, *operands]
+
+def canonicalize_order_by(order_by: List) -> List:
+    """
+    Normalize an order_by clause to a list of [column, "asc" | "desc"] pairs.
+    """
+    normalized = []
+    for item in order_by or []:
+        if isinstance(item, list):
+            column = item[0]
+            direction = _operator(item[1]) if len(item) > 1 else "asc"
+        else:
+            column, direction = item, "asc"
+        normalized.append([column.lstrip(":") if isinstance(column, str) else column, direction])
+    return normalized
+
+def canonical_query_key(where: Any, order_by: List) -> str:
+    """
+    A string key that is identical for equivalent (where, order_by) pairs.
+    """
+    return json.dumps([canonicalize_clause(where), canonicalize_order_by(order_by)], sort_keys=True, separators=(",", ":"))
+
+COMPARISON_OPERATORS = {
+    "=": np.equal,
+    "!=": np.not_equal,
+    "<>": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+ARITHMETIC_OPERATORS = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.divide,
+}
+
+class SearchSnapshot:
+    """
+    Columnar snapshot of symphony search rows, for answering HoneySQL queries locally.
+
+    Rows are kept in fetch order (oldest first) and deduplicated by `key_field`; once `max_rows` is exceeded
+    the oldest rows are dropped. Columns are converted to numpy arrays on first use: float arrays (NaN for missing
+    values) for numeric columns, object arrays otherwise.
+    """
+
+    def __init__(self, max_rows: int = 5000, key_field: str = "symphony_url"):
+        self.max_rows = max_rows
+        self.key_field = key_field
+        self._rows: Dict[Any, Dict] = {}
+        self._row_list: List[Dict] = []
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getstate__(self) -> Dict:
+        # Columns are rebuilt on first use, so they aren't pickled (see `make_cache`).
+        return {**self.__dict__, "_columns": {}}
+
+    def add(self, rows: List[Dict]) -> None:
+        for row in rows:
+            key = row.get(self.key_field)
+            if key is None:
+                key = json.dumps(row, sort_keys=True, default=str)
+            self._rows.pop(key, None)
+            self._rows[key] = row
+        while len(self._rows) > self.max_rows:
+            del self._rows[next(iter(self._rows))]
+        self._row_list = list(self._rows.values())
+        self._columns = {}
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            if not any(name in row for row in self._row_list):
+                raise ValueError(f"Unknown column: {name}")
+            values = [row.get(name) for row in self._row_list]
+            if all(value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)) for value in values):
+                self._columns[name] = np.array([np.nan if value is None else value for value in values], dtype=float)
+            else:
+                self._columns[name] = np.array(values, dtype=object)
+        return self._columns[name]
+
+    def evaluate(self, clause: Any) -> Any:
+        """
+        Evaluate a where clause (or a value expression) over every row.
+        Strings are column references and numbers are literals, as in `search_symphonies`.
+        Comparisons involving a missing value are false.
+        """
+        if isinstance(clause, bool) or clause is None:
+            return clause
+        if isinstance(clause, (int, float)):
+            return float(clause)
+        if isinstance(clause, str):
+            return self.column(clause.lstrip(":"))
+        if not isinstance(clause, list) or not clause:
+            raise ValueError(f"Unsupported clause: {clause!r}")
+        if len(clause) == 1 and isinstance(clause[0], list):
+            return self.evaluate(clause[0])
+        operator = _operator(clause[0])
+        operands = clause[1:]
+        if operator in ("and", "or"):
+            combine = np.logical_and if operator == "and" else np.logical_or
+            mask = np.full(len(self._row_list), operator == "and")
+            for operand in operands:
+                mask = combine(mask, self._mask(operand))
+            return mask
+        if operator == "not":
+            if len(operands) != 1:
+                raise ValueError("not takes exactly one argument")
+            return ~self._mask(operands[0])
+        if operator in COMPARISON_OPERATORS:
+            if len(operands) != 2:
+                raise ValueError(f"{operator} takes exactly two arguments")
+            left, right = (self.evaluate(operand) for operand in operands)
+            with np.errstate(invalid="ignore"):
+                result = COMPARISON_OPERATORS[operator](left, right)
+            return np.broadcast_to(np.asarray(result, dtype=bool), (len(self._row_list),))
+        if operator in ARITHMETIC_OPERATORS:
+            if not operands:
+                raise ValueError(f"{operator} takes at least one argument")
+            values = [self.evaluate(operand) for operand in operands]
+            if len(values) == 1:
+                return -values[0] if operator == "-" else values[0]
+            result = values[0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for value in values[1:]:
+                    result = ARITHMETIC_OPERATORS[operator](result, value)
+            return result
+        raise ValueError(f"Unsupported operator: {clause[0]!r}")
+
+    def _mask(self, clause: Any) -> np.ndarray:
+        mask = self.evaluate(clause)
+        if not isinstance(mask, np.ndarray) or mask.dtype != bool:
+            raise ValueError(f"Not a condition: {clause!r}")
+        return mask
+
+    def query(self, where: Any = None, order_by: List = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Rows matching `where`, sorted by `order_by`. Missing values sort last in either direction.
+        """
+        if not self._row_list:
+            return []
+        indices = np.flatnonzero(self._mask(where)) if where else np.arange(len(self._row_list))
+        sort_keys = []
+        for column, direction in canonicalize_order_by(order_by):
+            values = self.column(column)[indices]
+            if values.dtype == object:
+                # Rank non-numeric values so they can be sorted like numbers
+                present = np.array([value is not None for value in values])
+                ranks = np.full(len(values), np.nan)
+                if present.any():
+                    _, inverse = np.unique(values[present].astype(str), return_inverse=True)
+                    ranks[present] = inverse
+                values = ranks
+            sort_keys.append(-values if direction == "desc" else values)
+        if sort_keys:
+            # lexsort uses its last key as the primary key; NaN sorts last
+            indices = indices[np.lexsort(sort_keys[::-1])]
+        if limit is not None:
+            indices = indices[:limit]
+        return [self._row_list[i] for i in indices]
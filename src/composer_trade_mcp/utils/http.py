@@ -0,0 +1,63 @@
+"""
+HTTP client for Composer API requests.
+"""
+from typing import Optional
+import time
+
+import httpx
+
+from .cassette import CassetteTransport, active_cassette
+from .compression import ACCEPT_ENCODING
+from .metrics import UPSTREAM_ERRORS, UPSTREAM_IN_FLIGHT, UPSTREAM_LATENCY, UPSTREAM_RESPONSE_BYTES, endpoint_template
+from .tracing import span
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that records latency, response size and errors of every request, labeled by endpoint template,
+    and traces each request as a child span (propagated upstream with a `traceparent` header).
+    The response body is read inside the transport so latency covers the full download.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        method = request.method
+        endpoint = endpoint_template(request.url.path)
+        # Replaces the Accept-Encoding forwarded from the MCP client with the encodings httpx can decode here.
+        request.headers["accept-encoding"] = ACCEPT_ENCODING
+        with span(f"http {method} {endpoint}", method=method, endpoint=endpoint) as request_span:
+            if request_span.traceparent:
+                request.headers["traceparent"] = request_span.traceparent
+            UPSTREAM_IN_FLIGHT.inc()
+            start = time.perf_counter()
+            try:
+                response = await self._transport.handle_async_request(request)
+                await response.aread()
+            except Exception as e:
+                UPSTREAM_ERRORS.inc(method, endpoint, type(e).__name__)
+                raise
+            finally:
+                UPSTREAM_IN_FLIGHT.dec()
+                UPSTREAM_LATENCY.observe(time.perf_counter() - start, method, endpoint)
+            UPSTREAM_RESPONSE_BYTES.observe(len(response.content), method, endpoint)
+            request_span.set_attribute("status_code", response.status_code)
+            request_span.set_attribute("response_bytes", len(response.content))
+            request_span.set_attribute("content_encoding", response.headers.get("content-encoding", "identity"))
+            if response.status_code >= 400:
+                UPSTREAM_ERRORS.inc(method, endpoint, str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+def upstream_client(**kwargs) -> httpx.AsyncClient:
+    """
+    `httpx.AsyncClient` for Composer API requests. Accepts the same arguments as `httpx.AsyncClient`.
+    Requests are recorded to or replayed from the active cassette, if any (see utils/cassette.py).
+    """
+    transport = kwargs.pop("transport", None)
+    cassette = active_cassette()
+    if cassette is not None:
+        transport = CassetteTransport(cassette, transport)
+    return httpx.AsyncClient(transport=InstrumentedTransport(transport), **kwargs)
@@ -0,0 +1,102 @@
+"""
+Market-session-aware caching for Composer MCP Server.
+
+Some reads (market hours, options expiration calendars, ...) only change when the market opens or closes.
+Instead of a fixed TTL, their cache entries expire at the next session boundary found in a market hours response.
+"""
+from datetime import datetime, timezone
+from typing import Any, Hashable, List, Optional
+import time
+
+from .cache import LRUCache
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        # Epoch milliseconds or seconds
+        return value / 1000 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+def session_boundaries(market_hours: Any) -> List[float]:
+    """
+    All open/close times (unix timestamps) in a market hours response.
+    Any value under a key containing "open" or "close" that parses as a timestamp counts as a boundary.
+    """
+    boundaries = []
+
+    def walk(node: Any, key: str = "") -> None:
+        if isinstance(node, dict):
+            for child_key, child in node.items():
+                walk(child, str(child_key).lower())
+        elif isinstance(node, list):
+            for child in node:
+                walk(child, key)
+        elif "open" in key or "close" in key:
+            timestamp = _to_timestamp(node)
+            if timestamp is not None:
+                boundaries.append(timestamp)
+
+    walk(market_hours)
+    return sorted(boundaries)
+
+def next_session_boundary(market_hours: Any, now: Optional[float] = None) -> Optional[float]:
+    """
+    The first market open or close after `now`, or None if the response doesn't contain one.
+    """
+    now = time.time() if now is None else now
+    return next((boundary for boundary in session_boundaries(market_hours) if boundary > now), None)
+
+class SessionCache:
+    """
+    LRU cache whose entries expire at the next market open or close.
+
+    Call `update_market_hours` with each fresh market hours response; entries stored afterwards expire exactly at the
+    next boundary it contains, or after `max_ttl` seconds if that comes first. Without a known boundary, entries fall
+    back to `fallback_ttl` seconds, clamped to [min_ttl, max_ttl].
+    """
+
+    def __init__(self, max_entries: int = 256, fallback_ttl: float = 15 * 60, min_ttl: float = 30, max_ttl: float = 24 * 60 * 60):
+        self.fallback_ttl = fallback_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self._boundaries: List[float] = []
+        self._entries = LRUCache(max_entries=max_entries)
+
+    def update_market_hours(self, market_hours: Any) -> None:
+        self._boundaries = session_boundaries(market_hours)
+
+    def has_market_hours(self) -> bool:
+        return any(boundary > time.time() for boundary in self._boundaries)
+
+    def expires_at(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        boundary = next((boundary for boundary in self._boundaries if boundary > now), None)
+        if boundary is not None:
+            return min(boundary, now + self.max_ttl)
+        return now + min(max(self.fallback_ttl, self.min_ttl), self.max_ttl)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._entries.get(key, default)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.set(key, value, expires_at=self.expires_at())
+
+    @property
+    def hits(self) -> int:
+        return self._entries.hits
+
+    @property
+    def misses(self) -> int:
+        return self._entries.misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,183 @@
+"""
+Prometheus-style metrics for Composer MCP Server.
+
+Metrics are recorded from the event loop thread, so recording is a plain dict lookup and integer/float update
+with no locks. `render` produces the Prometheus text exposition format.
+"""
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import json
+import re
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    labels = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: Any) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    def dec(self, *labels: Any, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: Any, value: float) -> None:
+        self._values[labels] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: Any) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound) if bound != "+Inf" else bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._metrics: List[Any] = []
+        self._caches: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def _register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self.prefix + name, help, label_names))
+
+    def gauge(self, name: str, help: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self.prefix + name, help, label_names))
+
+    def histogram(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(self.prefix + name, help, label_names, buckets))
+
+    def track_cache(self, name: str, cache: Any) -> None:
+        """
+        Report hits, misses and size of a cache with `hits` and `misses` attributes and a length.
+        """
+        self._caches[name] = cache
+
+    def add_collector(self, collect: Callable[[], List[str]]) -> None:
+        """
+        Add a function returning extra exposition lines, evaluated on every render.
+        """
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        if self._caches:
+            for suffix, help, attribute in (
+                ("cache_hits_total", "Cache lookups that found an entry.", "hits"),
+                ("cache_misses_total", "Cache lookups that found no entry.", "misses"),
+                ("cache_entries", "Entries currently stored.", None),
+            ):
+                name = self.prefix + suffix
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {'gauge' if attribute is None else 'counter'}")
+                for cache_name, cache in sorted(self._caches.items()):
+                    value = len(cache) if attribute is None else getattr(cache, attribute)
+                    lines.append(f'{name}{{cache="{_escape(cache_name)}"}} {value}')
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+# Path segments that identify a resource rather than an endpoint: UUIDs, long IDs containing a digit, numbers,
+# and anything with "::" (symbols)
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F-]{32,36}|(?=.*\d)[A-Za-z0-9_-]{16,}|.*::.*|\d+)$")
+
+def endpoint_template(path: str) -> str:
+    """
+    Collapse the resource IDs in a URL path so requests to the same endpoint share metrics,
+    e.g. /api/v0.1/symphonies/3W80K6PVgou3IF93Un0N/score -> /api/v0.1/symphonies/{id}/score.
+    """
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+def is_error_result(content: Sequence[Any]) -> bool:
+    """
+    Whether the content blocks of a tool result report a failure.
+    Tools report most failures as a JSON object with an "error" field instead of raising.
+    """
+    for block in content or []:
+        text = getattr(block, "text", None)
+        # Only parse results that can contain an error field
+        if text is None or '"error"' not in text:
+            continue
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get("error"):
+            return True
+    return False
+
+metrics = MetricsRegistry(prefix="composer_mcp_")
+
+TOOL_LATENCY = metrics.histogram("tool_duration_seconds", "Tool call latency.", ["tool"])
+TOOL_RESPONSE_BYTES = metrics.histogram("tool_response_bytes", "Size of tool results.", ["tool"], SIZE_BUCKETS)
+TOOL_ERRORS = metrics.counter("tool_errors_total", "Tool calls that raised or returned an error.", ["tool"])
+TOOLS_IN_FLIGHT = metrics.gauge("tool_calls_in_flight", "Tool calls currently running.", ["tool"])
+
+UPSTREAM_LATENCY = metrics.histogram("upstream_request_duration_seconds", "Composer API request latency, including the response body.", ["method", "endpoint"])
+UPSTREAM_RESPONSE_BYTES = metrics.histogram("upstream_response_bytes", "Size of Composer API response bodies.", ["method", "endpoint"], SIZE_BUCKETS)
+UPSTREAM_ERRORS = metrics.counter("upstream_errors_total", "Composer API requests that failed or returned a 4xx/5xx status.", ["method", "endpoint", "status"])
+UPSTREAM_IN_FLIGHT = metrics.gauge("upstream_requests_in_flight", "Composer API requests currently running.")
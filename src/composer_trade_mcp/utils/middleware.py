@@ -0,0 +1,122 @@
+"""
+FastMCP middleware for Composer MCP Server.
+"""
+from typing import Callable, Optional
+import logging
+import time
+import uuid
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware
+
+from .cassette import active_cassette
+from .context import build_request_context, use_request_context
+from .profiling import ToolProfiler
+from .offload import loop_lag_monitor
+from .metrics import TOOL_ERRORS, TOOL_LATENCY, TOOL_RESPONSE_BYTES, TOOLS_IN_FLIGHT, is_error_result
+from .tracing import span, tracing_enabled
+
+logger = logging.getLogger(__name__)
+
+class ToolMetricsMiddleware(Middleware):
+    """
+    Record latency, result size, errors and in-flight count of every tool call.
+    Tools report most failures as an {"error": ...} result rather than raising, so those count as errors too
+    (see `is_error_result`).
+    Also starts the event loop lag monitor on the serving loop.
+    """
+
+    async def on_call_tool(self, context, call_next):
+        loop_lag_monitor.ensure_started()
+        tool = context.message.name
+        TOOLS_IN_FLIGHT.inc(tool)
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception:
+            TOOL_ERRORS.inc(tool)
+            raise
+        finally:
+            TOOLS_IN_FLIGHT.dec(tool)
+            TOOL_LATENCY.observe(time.perf_counter() - start, tool)
+        size = 0
+        for content in result or []:
+            text = getattr(content, "text", None)
+            if text is not None:
+                size += len(text)
+        TOOL_RESPONSE_BYTES.observe(size, tool)
+        if is_error_result(result):
+            TOOL_ERRORS.inc(tool)
+        return result
+
+class ToolTracingMiddleware(Middleware):
+    """
+    Run every tool call inside a root span, continuing the caller's trace if it sent a `traceparent` header.
+    """
+
+    async def on_call_tool(self, context, call_next):
+        if not tracing_enabled():
+            return await call_next(context)
+        tool = context.message.name
+        with span(f"tool {tool}", traceparent=get_http_headers().get("traceparent"), tool=tool):
+            return await call_next(context)
+
+class ToolProfilingMiddleware(Middleware):
+    """
+    Profile tool calls when enabled by environment variable or by the privileged profiling header (see utils/profiling.py).
+    """
+
+    def __init__(self, profiler: ToolProfiler):
+        self.profiler = profiler
+
+    async def on_call_tool(self, context, call_next):
+        if not self.profiler.should_profile(get_http_headers()):
+            return await call_next(context)
+        fastmcp_context = context.fastmcp_context
+        request_id = None
+        if fastmcp_context is not None:
+            try:
+                request_id = fastmcp_context.request_id
+            except Exception:
+                pass
+        async with self.profiler.profile(context.message.name, str(request_id or uuid.uuid4().hex)):
+            return await call_next(context)
+
+class ToolCassetteMiddleware(Middleware):
+    """
+    Record tool calls to the active cassette in record mode, so that a recorded session can be replayed (see utils/cassette.py).
+    """
+
+    async def on_call_tool(self, context, call_next):
+        cassette = active_cassette()
+        if cassette is not None and cassette.recording:
+            try:
+                cassette.record_tool_call(context.message.name, context.message.arguments or {})
+            except Exception as e:
+                logger.error(f"Error recording tool call to cassette: {e!r}")
+        return await call_next(context)
+
+class RequestContextMiddleware(Middleware):
+    """
+    Build the request context once per tool call and make it current for the duration of the call.
+    """
+
+    def __init__(self, base_url_for: Callable[[str], str]):
+        self.base_url_for = base_url_for
+
+    async def on_call_tool(self, context, call_next):
+        request_context = build_request_context(get_http_headers(), self.base_url_for, _mcp_session_id(context))
+        with use_request_context(request_context):
+            return await call_next(context)
+
+def _mcp_session_id(context) -> Optional[str]:
+    """
+    MCP session ID of the current tool call. Read from the MCP request itself: `get_http_headers()` returns the headers
+    of the request that opened the session, which don't carry the session ID yet.
+    """
+    try:
+        request = context.fastmcp_context.request_context.request
+    except (AttributeError, ValueError):
+        return None
+    headers = getattr(request, "headers", None)
+    return headers.get("mcp-session-id") if headers is not None else None
@@ -0,0 +1,142 @@
+"""
+Offloading of CPU-bound work (JSON decoding, validation, backtest parsing) from the event loop.
+
+Work runs inline when it is small, and on a pool above a size threshold, so one large backtest or symphony score
+does not stall every other session on the same event loop. Configuration:
+- COMPOSER_MCP_OFFLOAD: "thread" (default), "process" or "off". Threads only help while the work releases the GIL
+  (JSON decoding partly does), but keep the loop responsive between steps; processes give real parallelism but pickle
+  arguments and results both ways.
+- COMPOSER_MCP_OFFLOAD_WORKERS: pool size (default: number of CPUs, at most 4).
+- COMPOSER_MCP_OFFLOAD_MIN_BYTES, COMPOSER_MCP_OFFLOAD_MIN_POINTS, COMPOSER_MCP_OFFLOAD_MIN_NODES: thresholds below.
+
+`LoopLagMonitor` measures how late the event loop wakes up from short sleeps, which is how long other work blocked it.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+import asyncio
+import contextvars
+import functools
+import importlib
+import multiprocessing
+import os
+import time
+
+from .metrics import LATENCY_BUCKETS, metrics
+
+# Response bodies of at least this many bytes are JSON-decoded on the pool.
+OFFLOAD_MIN_BYTES = int(os.getenv("COMPOSER_MCP_OFFLOAD_MIN_BYTES", 256 * 1024))
+# Backtests with at least this many daily values (days x series) are validated and parsed on the pool.
+OFFLOAD_MIN_POINTS = int(os.getenv("COMPOSER_MCP_OFFLOAD_MIN_POINTS", 1000))
+# Symphony scores with at least this many nodes are validated on the pool.
+OFFLOAD_MIN_NODES = int(os.getenv("COMPOSER_MCP_OFFLOAD_MIN_NODES", 100))
+# Seconds between event loop lag measurements.
+LOOP_LAG_INTERVAL = 0.1
+
+OFFLOADED_CALLS = metrics.counter("offloaded_calls_total", "CPU-bound calls by where they ran (pool or inline).", ["function", "where"])
+OFFLOAD_DURATION = metrics.histogram("offload_duration_seconds", "Duration of CPU-bound calls, including pool queueing.", ["function", "where"])
+LOOP_LAG = metrics.histogram("event_loop_lag_seconds", "How late the event loop woke up from a short sleep.",
+                             buckets=(0.001, 0.0025) + LATENCY_BUCKETS)
+
+def count_points(dvm_capital: Any) -> int:
+    """
+    Number of daily values in a backtest's `dvm_capital` (a dict of series, or None).
+    """
+    return sum(len(series) for series in (dvm_capital or {}).values())
+
+def count_nodes(node: Any) -> int:
+    """
+    Number of nodes in a symphony score, given as a model or a dict.
+    """
+    children = node.get("children") if isinstance(node, dict) else getattr(node, "children", None)
+    return 1 + sum(count_nodes(child) for child in children or [])
+
+class OffloadPool:
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None):
+        if mode not in ("thread", "process", "off"):
+            raise ValueError(f"Unknown offload mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[Executor] = None
+
+    @classmethod
+    def from_env(cls) -> "OffloadPool":
+        workers = os.getenv("COMPOSER_MCP_OFFLOAD_WORKERS")
+        return cls(os.getenv("COMPOSER_MCP_OFFLOAD", "thread").lower(), int(workers) if workers else None)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # Spawned workers import the schemas package first, which avoids the circular import of importing
+                # a utils module on its own when unpickling the offloaded function.
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=importlib.import_module,
+                    initargs=("composer_trade_mcp.schemas",),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="composer-mcp-offload")
+        return self._executor
+
+    async def run(self, fn: Callable, *args: Any, offload: bool = True, **kwargs: Any) -> Any:
+        """
+        Call `fn(*args, **kwargs)` on the pool when `offload` is set (the caller's size check) and offloading is enabled,
+        and inline otherwise. In process mode `fn`, its arguments and its result must be picklable.
+        """
+        name = getattr(fn, "__qualname__", repr(fn))
+        start = time.perf_counter()
+        if not offload or self.mode == "off":
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                OFFLOADED_CALLS.inc(name, "inline")
+                OFFLOAD_DURATION.observe(time.perf_counter() - start, name, "inline")
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            # Run in a copy of the current context so that tracing spans nest under the caller's span.
+            call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        else:
+            call = functools.partial(fn, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(self._get_executor(), call)
+        finally:
+            OFFLOADED_CALLS.inc(name, "pool")
+            OFFLOAD_DURATION.observe(time.perf_counter() - start, name, "pool")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+offload_pool = OffloadPool.from_env()
+
+class LoopLagMonitor:
+    """
+    Background task measuring event loop lag. Started lazily on the running loop with `ensure_started`.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        metrics.add_collector(self._collect)
+
+    def ensure_started(self) -> None:
+        if self._task is None or self._task.done() or self._task.get_loop() is not asyncio.get_running_loop():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _collect(self) -> List[str]:
+        name = f"{metrics.prefix}event_loop_lag_max_seconds"
+        lines = [f"# HELP {name} Largest event loop lag since the previous scrape.", f"# TYPE {name} gauge", f"{name} {self.max_lag!r}"]
+        self.max_lag = 0.0
+        return lines
+
+loop_lag_monitor = LoopLagMonitor()
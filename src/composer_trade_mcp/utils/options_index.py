@@ -0,0 +1,128 @@
+"""
+In-memory index of an options chain for strike / expiry range queries.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, List, Optional
+import re
+import time
+
+# OPTIONS::<ticker><YYMMDD><P|C><strike * 1000, padded to 8 digits>//USD
+OPTIONS_SYMBOL_PATTERN = re.compile(r'^OPTIONS::[A-Z]{1,5}[1-9]?(\d{2})(\d{2})(\d{2})([CP])(\d{8})//USD$')
+
+def parse_options_symbol(symbol: str) -> Optional[Dict]:
+    """
+    Extract expiry, contract type and strike price from an options symbol like 'OPTIONS::AAPL211022C000150000//USD'.
+    """
+    match = OPTIONS_SYMBOL_PATTERN.match(symbol or "")
+    if not match:
+        return None
+    year, month, day, contract_type, strike = match.groups()
+    return {
+        "expiry": f"20{year}-{month}-{day}",
+        "contract_type": "CALL" if contract_type == "C" else "PUT",
+        "strike_price": int(strike) / 1000,
+    }
+
+def _contract_fields(row: Dict) -> Optional[Dict]:
+    fields = {
+        "expiry": row.get("expiry"),
+        "contract_type": row.get("contract_type"),
+        "strike_price": row.get("strike_price"),
+    }
+    if any(value is None for value in fields.values()):
+        parsed = parse_options_symbol(row.get("symbol"))
+        if parsed is None:
+            return None
+        fields = {k: v if v is not None else parsed[k] for k, v in fields.items()}
+    fields["expiry"] = str(fields["expiry"])[:10]
+    fields["contract_type"] = str(fields["contract_type"]).upper()
+    fields["strike_price"] = float(fields["strike_price"])
+    return fields
+
+class OptionsChainIndex:
+    """
+    Snapshot of an options chain, grouped by expiry (sorted) and then by strike (sorted within each expiry).
+    Range queries use bisection on both levels, so only matching contracts are visited.
+
+    `truncated` means `rows` is only the start of the chain. If those rows are in expiry order, every expiry before
+    the last one is still complete (`complete_before`); otherwise nothing is known to be complete.
+    """
+
+    def __init__(self, rows: List[Dict], truncated: bool = False):
+        self.created_at = time.time()
+        self.size = 0
+        self.truncated = truncated
+        by_expiry: Dict[str, List[tuple]] = {}
+        last_expiry = None
+        in_expiry_order = True
+        for row in rows:
+            fields = _contract_fields(row)
+            if fields is None:
+                continue
+            if last_expiry is not None and fields["expiry"] < last_expiry:
+                in_expiry_order = False
+            last_expiry = fields["expiry"]
+            by_expiry.setdefault(fields["expiry"], []).append((fields["strike_price"], fields["contract_type"], row))
+            self.size += 1
+        self.complete_before: Optional[str] = last_expiry if truncated and in_expiry_order else None
+        self.expiries: List[str] = sorted(by_expiry)
+        self.strikes: List[List[float]] = []
+        self.contracts: List[List[tuple]] = []
+        for expiry in self.expiries:
+            contracts = sorted(by_expiry[expiry], key=lambda contract: contract[0])
+            self.strikes.append([contract[0] for contract in contracts])
+            self.contracts.append(contracts)
+
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def covers(self, expiry_to: Optional[str] = None) -> bool:
+        """
+        Whether the snapshot has every contract expiring up to `expiry_to` (inclusive; None for any expiry).
+        """
+        if not self.truncated:
+            return True
+        return expiry_to is not None and self.complete_before is not None and expiry_to < self.complete_before
+
+    def query(self,
+              contract_type: Optional[str] = None,
+              min_strike: Optional[float] = None,
+              max_strike: Optional[float] = None,
+              expiry_from: Optional[str] = None,
+              expiry_to: Optional[str] = None,
+              moneyness: Optional[str] = None,
+              underlying_price: Optional[float] = None,
+              atm_tolerance: float = 0.02) -> List[Dict]:
+        """
+        Contracts matching every given filter, ordered by expiry then strike.
+        Expiries are inclusive YYYY-MM-DD strings. Moneyness ("ITM", "ATM" or "OTM") needs `underlying_price`;
+        a contract is ATM when its strike is within `atm_tolerance` (a fraction) of the underlying price.
+        """
+        if moneyness and not underlying_price:
+            raise ValueError("underlying_price is required to filter by moneyness")
+        lo = bisect_left(self.expiries, expiry_from) if expiry_from else 0
+        hi = bisect_right(self.expiries, expiry_to) if expiry_to else len(self.expiries)
+        matches = []
+        for strikes, contracts in zip(self.strikes[lo:hi], self.contracts[lo:hi]):
+            start = bisect_left(strikes, min_strike) if min_strike is not None else 0
+            end = bisect_right(strikes, max_strike) if max_strike is not None else len(strikes)
+            for strike, row_contract_type, row in contracts[start:end]:
+                if contract_type and row_contract_type != contract_type:
+                    continue
+                if moneyness and _moneyness(row_contract_type, strike, underlying_price, atm_tolerance) != moneyness:
+                    continue
+                matches.append(row)
+        return matches
+
+def _moneyness(contract_type: str, strike: float, underlying_price: float, atm_tolerance: float) -> str:
+    if abs(strike - underlying_price) <= atm_tolerance * underlying_price:
+        return "ATM"
+    in_the_money = strike < underlying_price if contract_type == "CALL" else strike > underlying_price
+    return "ITM" if in_the_money else "OTM"
+
+def days_from_today(days: int) -> str:
+    """
+    The date `days` days from today, as YYYY-MM-DD.
+    """
+    return date.fromordinal(date.today().toordinal() + days).isoformat()
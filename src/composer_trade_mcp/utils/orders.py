@@ -0,0 +1,105 @@
+"""
+Validation and payload building for single-symbol trade orders.
+"""
+from typing import Any, Dict, List, Optional
+import hashlib
+import uuid
+
+import numpy as np
+
+def _parse_number(value: Any) -> float:
+    """
+    The value as a float, NaN if missing or invalid.
+    """
+    if value is None or isinstance(value, bool):
+        return np.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+def validate_orders(orders: List[Dict]) -> List[Optional[str]]:
+    """
+    Validate a batch of orders (dicts with the `execute_single_trade` arguments) in one pass.
+    Returns an error message per order, or None if the order is valid.
+
+    Rules are applied in a fixed order as boolean masks over the whole batch; when an order breaks several rules,
+    the last one wins.
+    """
+    n = len(orders)
+    errors = np.full(n, None, dtype=object)
+    if not n:
+        return []
+
+    def column(name: str) -> List[Any]:
+        return [order.get(name) for order in orders]
+
+    notional_raw = column("notional")
+    quantity_raw = column("quantity")
+    limit_price_raw = column("limit_price")
+    notional = np.array([_parse_number(value) for value in notional_raw])
+    quantity = np.array([_parse_number(value) for value in quantity_raw])
+    limit_price = np.array([_parse_number(value) for value in limit_price_raw])
+    has_notional = np.array([value is not None for value in notional_raw])
+    has_quantity = np.array([value is not None for value in quantity_raw])
+    has_limit_price = np.array([value is not None for value in limit_price_raw])
+    side = np.array(column("side"), dtype=object)
+    is_options = np.array([str(order.get("symbol") or "").startswith("OPTIONS::") for order in orders])
+    is_limit = np.array(column("type"), dtype=object) == "LIMIT"
+    is_day = np.array(column("time_in_force"), dtype=object) == "DAY"
+    has_position_intent = np.array([value is not None for value in column("position_intent")])
+
+    def reject(mask: np.ndarray, message: str) -> None:
+        errors[mask] = message
+
+    def reject_each(mask: np.ndarray, template: str, values: List[Any]) -> None:
+        for i in np.flatnonzero(mask):
+            errors[i] = template.format(values[i])
+
+    with np.errstate(invalid="ignore"):
+        reject_each(has_notional & np.isnan(notional), "Invalid notional value: {}", notional_raw)
+        reject_each(has_quantity & np.isnan(quantity), "Invalid quantity value: {}", quantity_raw)
+        reject(~(has_notional & (notional != 0)) & ~(has_quantity & (quantity != 0)), "One of notional or quantity must be provided")
+        reject(is_options & ~has_position_intent, "Position intent is required for options orders")
+        reject(is_options & ~is_day, "Time in force must be DAY for options orders")
+        reject(~is_options & is_limit, "Limit orders are only supported for options orders")
+        reject(has_limit_price & ~is_options, "Limit price is only used for options orders")
+        reject(has_limit_price & (limit_price <= 0), "Limit price must be positive")
+        reject_each(has_limit_price & np.isnan(limit_price), "Invalid limit price value: {}", limit_price_raw)
+
+        is_buy = side == "BUY"
+        is_sell = side == "SELL"
+        reject(is_buy & (notional <= 0), "Notional must be positive for BUY orders")
+        reject(is_buy & (quantity <= 0), "Quantity must be positive for BUY orders")
+        reject(is_sell & (notional >= 0), "Notional must be negative for SELL orders")
+        reject(is_sell & (quantity >= 0), "Quantity must be negative for SELL orders")
+
+    return errors.tolist()
+
+def order_payload(order: Dict) -> Dict:
+    """
+    Request body for the order-requests endpoint. Assumes the order passed `validate_orders`.
+    """
+    payload = {
+        "type": order["type"],
+        "symbol": order["symbol"],
+        "time_in_force": order["time_in_force"],
+    }
+    for field in ("notional", "quantity", "limit_price"):
+        if order.get(field) is not None:
+            payload[field] = float(order[field])
+    if order.get("position_intent") is not None:
+        payload["position_intent"] = order["position_intent"]
+    return payload
+
+def new_client_order_id() -> str:
+    """
+    Random client_order_id for an order submitted without one.
+    """
+    return uuid.uuid4().hex
+
+def idempotency_key(account_uuid: str, client_order_id: str) -> str:
+    """
+    Idempotency key for an order: retrying with the same client_order_id on the same account gives the same key.
+    """
+    return hashlib.sha256(f"{account_uuid}:{client_order_id}".encode()).hexdigest()
@@ -2,8 +2,9 @@
 Utility functions for parsing Composer API responses.
 """
 from typing import Dict, List, Any
-from datetime import datetime
+from datetime import datetime, date
 from ..schemas.backtest_api import DvmCapital, Legend, BacktestResponse
+from .tracing import traced
 
 def parse_stats(stats: Dict) -> Dict:
     """
@@ -38,12 +39,19 @@ def epoch_to_date(epoch: int) -> str:
     """
     return datetime.utcfromtimestamp(epoch * 86400).strftime("%Y-%m-%d")
 
+def date_to_epoch(date_str: str) -> int:
+    """
+    Convert a YYYY-MM-DD date string to an epoch day (the inverse of `epoch_to_date`).
+    """
+    return (date.fromisoformat(date_str) - date(1970, 1, 1)).days
+
 def epoch_ms_to_date(epoch_ms: int) -> str:
     """
     Convert an epoch timestamp to a date string.
     """
     return datetime.utcfromtimestamp(epoch_ms / 1000).strftime("%Y-%m-%d")
 
+@traced()
 def parse_dvm_capital(dvm_capital: DvmCapital, legend: Legend) -> Dict[str, List[Any]]:
     """
     Parse the daily values of a symphony backtest.
@@ -102,6 +110,7 @@ def parse_dvm_capital(dvm_capital: DvmCapital, legend: Legend) -> Dict[str, List
 
     return parsed_daily_values
 
+@traced()
 def parse_backtest_output(backtest: BacktestResponse, include_daily_values: bool = False) -> Dict:
     """
     Parse the output of a symphony backtest.
@@ -120,4 +129,39 @@ def parse_backtest_output(backtest: BacktestResponse, include_daily_values: bool
     }
     if include_daily_values and backtest.dvm_capital and backtest.legend:
         output["daily_values"] = parse_dvm_capital(backtest.dvm_capital, backtest.legend)
-    return output 
\ No newline at end of file
+    return output
+
+def parse_extended_stats(stats: Dict) -> Dict:
+    """
+    Parse the output of `compute_extended_stats` into the same format as `parse_stats`.
+    """
+    if not stats:
+        return {}
+    parsed_stats = parse_stats(stats)
+    if not stats.get("benchmarks"):
+        del parsed_stats["benchmarks"]
+
+    def parse_drawdown(drawdown: Dict) -> Dict:
+        if not drawdown:
+            return None
+        return {
+            "peak_date": epoch_to_date(drawdown["peak_day"]),
+            "trough_date": epoch_to_date(drawdown["trough_day"]),
+            "recovery_date": epoch_to_date(drawdown["recovery_day"]) if drawdown["recovery_day"] is not None else None,
+            "depth": f"{round(drawdown['depth'] * 100, 2)}%",
+            "duration_days": drawdown["duration_days"],
+        }
+
+    rolling_sharpe = stats.get("rolling_sharpe", {})
+    parsed_stats["sortino_ratio"] = round(stats.get("sortino_ratio", 0), 4)
+    parsed_stats["rolling_sharpe"] = {
+        k: round(v, 4) if isinstance(v, float) else v for k, v in rolling_sharpe.items()
+    }
+    parsed_stats["longest_drawdown"] = parse_drawdown(stats.get("longest_drawdown"))
+    parsed_stats["current_drawdown"] = parse_drawdown(stats.get("current_drawdown"))
+    parsed_stats["num_drawdowns"] = stats.get("num_drawdowns", 0)
+    parsed_stats["monthly_returns"] = {
+        year: {month: f"{round(value * 100, 2)}%" for month, value in months.items()}
+        for year, months in stats.get("monthly_returns", {}).items()
+    }
+    return parsed_stats
@@ -0,0 +1,99 @@
+"""
+Shared status polling with exponential backoff.
+"""
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import random
+import time
+
+class SharedPoller:
+    """
+    Polls `fetch` until `is_done(result)` is true, on behalf of any number of concurrent waiters.
+
+    Only one poll loop runs however many waiters there are. The delay between polls starts at `initial_delay`
+    and grows by `factor` (with jitter) up to `max_delay`. The loop stops when the result is done, when a poll
+    raises, or when the last waiter leaves.
+
+    Pollers live in the memory of one process. With several workers (utils/workers.py), waiters served by different
+    workers each run their own poll loop.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[], Awaitable[Any]],
+                 is_done: Callable[[Any], bool],
+                 initial_delay: float = 1.0,
+                 max_delay: float = 15.0,
+                 factor: float = 2.0):
+        self.fetch = fetch
+        self.is_done = is_done
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.latest: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.polls = 0
+        self._waiters = 0
+        self._updated = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.done or self.error is not None
+
+    @property
+    def idle(self) -> bool:
+        return self._waiters == 0
+
+    async def _run(self) -> None:
+        delay = self.initial_delay
+        try:
+            while self._waiters > 0:
+                result = await self.fetch()
+                self.polls += 1
+                self.latest = result
+                self.done = self.is_done(result)
+                async with self._updated:
+                    self._updated.notify_all()
+                if self.done:
+                    return
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+                delay = min(delay * self.factor, self.max_delay)
+        except Exception as e:
+            self.error = e
+            async with self._updated:
+                self._updated.notify_all()
+
+    async def wait(self, timeout: float, on_update: Optional[Callable[[Any], Awaitable[None]]] = None) -> Any:
+        """
+        Wait until the result is done or `timeout` seconds have passed, and return the latest result.
+        `on_update` is awaited with each new result. Raises the poll error if a poll failed.
+        """
+        deadline = time.monotonic() + timeout
+        self._waiters += 1
+        try:
+            if self._task is None or (self._task.done() and not self.finished):
+                self._task = asyncio.ensure_future(self._run())
+            seen = 0
+            while True:
+                if self.polls > seen:
+                    seen = self.polls
+                    if on_update is not None:
+                        await on_update(self.latest)
+                if self.finished:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                async with self._updated:
+                    try:
+                        await asyncio.wait_for(self._updated.wait_for(lambda: self.polls > seen or self.finished), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            if self.error is not None:
+                raise self.error
+            return self.latest
+        finally:
+            self._waiters -= 1
+            if self._waiters == 0 and self._task is not None and not self._task.done():
+                self._task.cancel()
@@ -0,0 +1,131 @@
+"""
+Opt-in profiling of single tool calls.
+
+Profiling is enabled for every tool call with COMPOSER_MCP_PROFILE=1, or for one call by sending the
+x-composer-mcp-profile header with the value of COMPOSER_MCP_PROFILE_TOKEN (the header is ignored when no token
+is configured). Profiles are written to COMPOSER_MCP_PROFILE_DIR (default "profiles") in the format given by
+COMPOSER_MCP_PROFILE_FORMAT:
+- "pstats" (default): deterministic cProfile output, readable with `python -m pstats` or snakeviz.
+- "collapsed": sampled stacks of the event loop thread in collapsed-stack format, for flamegraph tools.
+
+Tool calls share the event loop thread, so a profile also includes whatever else ran while the call was awaiting.
+Only one call is profiled at a time; calls arriving while a profile is running are not profiled.
+"""
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import cProfile
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-composer-mcp-profile"
+
+class SamplingProfiler:
+    """
+    Sample the stack of one thread every `interval` seconds from a background thread.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._sample, name="composer-mcp-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ToolProfiler:
+    def __init__(self,
+                 always: bool = False,
+                 token: Optional[str] = None,
+                 directory: str = "profiles",
+                 format: str = "pstats"):
+        if format not in ("pstats", "collapsed"):
+            raise ValueError(f"Unknown profile format: {format}")
+        self.always = always
+        self.token = token
+        self.directory = directory
+        self.format = format
+        self._active = False
+
+    @classmethod
+    def from_env(cls) -> "ToolProfiler":
+        return cls(
+            always=os.getenv("COMPOSER_MCP_PROFILE", "").lower() in ("1", "true", "yes"),
+            token=os.getenv("COMPOSER_MCP_PROFILE_TOKEN") or None,
+            directory=os.getenv("COMPOSER_MCP_PROFILE_DIR", "profiles"),
+            format=os.getenv("COMPOSER_MCP_PROFILE_FORMAT", "pstats").lower(),
+        )
+
+    def should_profile(self, headers: Dict[str, str]) -> bool:
+        if self.always:
+            return True
+        requested = headers.get(PROFILE_HEADER)
+        return bool(self.token and requested and hmac.compare_digest(requested, self.token))
+
+    @asynccontextmanager
+    async def profile(self, tool: str, request_id: str) -> AsyncIterator[Optional[str]]:
+        """
+        Profile the enclosed block and yield the path the profile will be written to,
+        or None if another profile is already running.
+        """
+        if self._active:
+            yield None
+            return
+        self._active = True
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{tool}-{request_id}")
+        extension = "prof" if self.format == "pstats" else "collapsed"
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_name}.{extension}")
+        if self.format == "pstats":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = SamplingProfiler(threading.get_ident())
+            profiler.start()
+        try:
+            yield path
+        finally:
+            if self.format == "pstats":
+                profiler.disable()
+            else:
+                profiler.stop()
+            self._active = False
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                if self.format == "pstats":
+                    profiler.dump_stats(path)
+                else:
+                    profiler.dump(path)
+                logger.info(f"Saved profile of {tool} to {path}")
+            except Exception as e:
+                logger.error(f"Error saving profile of {tool}: {e!r}")
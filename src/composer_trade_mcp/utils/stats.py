@@ -0,0 +1,227 @@
+"""
+Vectorized performance statistics for Composer MCP Server.
+
+All series are indexed by epoch day (days since 1970-01-01), matching the keys of `dvm_capital`.
+Returned values follow the conventions of the upstream backtest stats (fractions, not percentages).
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from ..schemas.backtest_api import DvmCapital, DvmCapitalEntry
+
+TRADING_DAYS_PER_YEAR = 252
+DAYS_PER_YEAR = 365.25
+
+def series_from_dvm_entry(entry: DvmCapitalEntry) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a single `dvm_capital` entry into sorted (days, values) arrays.
+    """
+    days = np.fromiter((int(day) for day in entry.keys()), dtype=np.int64, count=len(entry))
+    values = np.fromiter(entry.values(), dtype=np.float64, count=len(entry))
+    order = np.argsort(days, kind="stable")
+    return days[order], values[order]
+
+def daily_returns(values: np.ndarray) -> np.ndarray:
+    """
+    Simple returns between consecutive values.
+    """
+    if len(values) < 2:
+        return np.empty(0, dtype=np.float64)
+    return values[1:] / values[:-1] - 1
+
+def max_drawdown(values: np.ndarray) -> float:
+    """
+    Largest peak-to-trough decline as a positive fraction.
+    """
+    if len(values) == 0:
+        return 0.0
+    return float(np.max(1 - values / np.maximum.accumulate(values)))
+
+def trailing_return(days: np.ndarray, values: np.ndarray, lookback_days: int) -> float:
+    """
+    Return over the last `lookback_days` calendar days, anchored on the last value on or before the lookback date.
+    """
+    if len(values) == 0:
+        return 0.0
+    index = max(int(np.searchsorted(days, days[-1] - lookback_days, side="right")) - 1, 0)
+    return float(values[-1] / values[index] - 1)
+
+def regression_stats(returns: np.ndarray, benchmark_returns: np.ndarray) -> Dict[str, float]:
+    """
+    Alpha (annualized), beta, R-squared and Pearson correlation of a return series against a benchmark.
+    """
+    if len(returns) < 2 or np.var(benchmark_returns) == 0 or np.var(returns) == 0:
+        return {"alpha": 0.0, "beta": 0.0, "r_square": 0.0, "pearson_r": 0.0}
+    covariance = np.cov(returns, benchmark_returns)
+    beta = covariance[0, 1] / covariance[1, 1]
+    pearson_r = covariance[0, 1] / np.sqrt(covariance[0, 0] * covariance[1, 1])
+    alpha = (np.mean(returns) - beta * np.mean(benchmark_returns)) * TRADING_DAYS_PER_YEAR
+    return {"alpha": float(alpha), "beta": float(beta), "r_square": float(pearson_r ** 2), "pearson_r": float(pearson_r)}
+
+def compute_series_stats(days: np.ndarray, values: np.ndarray) -> Dict:
+    """
+    Compute the stats reported by the backtest API for a single value series.
+    """
+    if len(values) == 0:
+        return {}
+    returns = daily_returns(values)
+    cumulative_return = float(values[-1] / values[0] - 1)
+    years = (days[-1] - days[0]) / DAYS_PER_YEAR
+    annualized = float((1 + cumulative_return) ** (1 / years) - 1) if years > 0 and cumulative_return > -1 else 0.0
+    std = float(np.std(returns, ddof=1)) if len(returns) > 1 else 0.0
+    drawdown = max_drawdown(values)
+    return {
+        "annualized_rate_of_return": annualized,
+        "calmar_ratio": annualized / drawdown if drawdown else 0.0,
+        "sharpe_ratio": float(np.mean(returns) / std * np.sqrt(TRADING_DAYS_PER_YEAR)) if std else 0.0,
+        "cumulative_return": cumulative_return,
+        "trailing_one_year_return": trailing_return(days, values, 365),
+        "trailing_one_month_return": trailing_return(days, values, 30),
+        "trailing_three_month_return": trailing_return(days, values, 91),
+        "max_drawdown": drawdown,
+        "standard_deviation": std * np.sqrt(TRADING_DAYS_PER_YEAR),
+    }
+
+def _aligned_returns(days: np.ndarray, values: np.ndarray, other_days: np.ndarray, other_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    common, index, other_index = np.intersect1d(days, other_days, assume_unique=True, return_indices=True)
+    return daily_returns(values[index]), daily_returns(other_values[other_index])
+
+def compute_backtest_stats(dvm_capital: DvmCapital,
+                           primary_key: str,
+                           benchmark_keys: List[str],
+                           start_day: Optional[int] = None,
+                           end_day: Optional[int] = None,
+                           extended: bool = False,
+                           rolling_window: int = 63) -> Dict:
+    """
+    Recompute backtest stats from `dvm_capital` in the same shape as the upstream `stats` field.
+    Benchmark entries include the primary series' alpha/beta against that benchmark under "percent".
+    Optionally restrict every series to the [start_day, end_day] window, and use `compute_extended_stats`
+    for the primary series when `extended` is set.
+    """
+    days, values = window(*series_from_dvm_entry(dvm_capital[primary_key]), start_day, end_day)
+    stats = compute_extended_stats(days, values, rolling_window) if extended else compute_series_stats(days, values)
+    stats["benchmarks"] = {}
+    for key in benchmark_keys:
+        if key not in dvm_capital:
+            continue
+        benchmark_days, benchmark_values = window(*series_from_dvm_entry(dvm_capital[key]), start_day, end_day)
+        benchmark_stats = compute_series_stats(benchmark_days, benchmark_values)
+        returns, benchmark_returns = _aligned_returns(days, values, benchmark_days, benchmark_values)
+        benchmark_stats["percent"] = regression_stats(returns, benchmark_returns)
+        stats["benchmarks"][key] = benchmark_stats
+    return stats
+
+def find_primary_key(dvm_capital: DvmCapital, benchmark_keys: List[str], preferred_key: Optional[str] = None) -> Optional[str]:
+    """
+    Find the `dvm_capital` key of the symphony series (the first key that isn't a benchmark).
+    """
+    if preferred_key and preferred_key in dvm_capital:
+        return preferred_key
+    return next((key for key in dvm_capital if key not in benchmark_keys), None)
+
+def window(days: np.ndarray, values: np.ndarray, start_day: Optional[int] = None, end_day: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Slice a (days, values) series to the inclusive [start_day, end_day] window.
+    """
+    lo = int(np.searchsorted(days, start_day, side="left")) if start_day is not None else 0
+    hi = int(np.searchsorted(days, end_day, side="right")) if end_day is not None else len(days)
+    return days[lo:hi], values[lo:hi]
+
+def sortino_ratio(returns: np.ndarray) -> float:
+    """
+    Annualized Sortino ratio (downside deviation relative to a 0% target).
+    """
+    if len(returns) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    return float(np.mean(returns) / downside * np.sqrt(TRADING_DAYS_PER_YEAR)) if downside else 0.0
+
+def rolling_sharpe(returns: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Annualized Sharpe ratio over a trailing window of `window_size` returns.
+    Element i covers returns[i:i + window_size].
+    """
+    if window_size < 2 or len(returns) < window_size:
+        return np.empty(0, dtype=np.float64)
+    cumsum = np.concatenate(([0.0], np.cumsum(returns)))
+    cumsum_sq = np.concatenate(([0.0], np.cumsum(returns ** 2)))
+    sums = cumsum[window_size:] - cumsum[:-window_size]
+    sums_sq = cumsum_sq[window_size:] - cumsum_sq[:-window_size]
+    means = sums / window_size
+    variances = np.maximum((sums_sq - window_size * means ** 2) / (window_size - 1), 0)
+    stds = np.sqrt(variances)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(stds > 0, means / stds * np.sqrt(TRADING_DAYS_PER_YEAR), 0.0)
+    return sharpe
+
+def drawdown_periods(days: np.ndarray, values: np.ndarray) -> List[Dict]:
+    """
+    Every drawdown as {peak_day, trough_day, recovery_day, depth, duration_days}.
+    recovery_day is None for a drawdown that hasn't recovered yet, in which case the duration runs to the last day.
+    """
+    if len(values) < 2:
+        return []
+    peaks = np.maximum.accumulate(values)
+    underwater = np.concatenate(([False], values < peaks, [False]))
+    edges = np.diff(underwater.astype(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    drawdowns = 1 - values / peaks
+    periods = []
+    for start, end in zip(starts, ends):
+        trough = start + int(np.argmax(drawdowns[start:end]))
+        recovered = end < len(values)
+        periods.append({
+            "peak_day": int(days[start - 1]),
+            "trough_day": int(days[trough]),
+            "recovery_day": int(days[end]) if recovered else None,
+            "depth": float(drawdowns[trough]),
+            "duration_days": int((days[end] if recovered else days[-1]) - days[start - 1]),
+        })
+    return periods
+
+def monthly_returns(days: np.ndarray, values: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """
+    Calendar-month returns as {"YYYY": {"MM": return}}. The first month is measured from the first value.
+    """
+    if len(values) < 2:
+        return {}
+    months = days.astype("datetime64[D]").astype("datetime64[M]")
+    month_ends = np.flatnonzero(np.concatenate((months[1:] != months[:-1], [True])))
+    month_end_values = values[month_ends]
+    previous_values = np.concatenate(([values[0]], month_end_values[:-1]))
+    returns = month_end_values / previous_values - 1
+    table: Dict[str, Dict[str, float]] = {}
+    for month, value in zip(months[month_ends].astype(str), returns):
+        year, month_number = month.split("-")
+        table.setdefault(year, {})[month_number] = float(value)
+    return table
+
+def compute_extended_stats(days: np.ndarray, values: np.ndarray, rolling_window: int = 63) -> Dict:
+    """
+    Stats from `compute_series_stats` plus Sortino, rolling Sharpe, drawdown durations and monthly returns.
+    """
+    stats = compute_series_stats(days, values)
+    if not stats:
+        return stats
+    returns = daily_returns(values)
+    rolling = rolling_sharpe(returns, rolling_window)
+    periods = drawdown_periods(days, values)
+    longest = max(periods, key=lambda period: period["duration_days"]) if periods else None
+    current = periods[-1] if periods and periods[-1]["recovery_day"] is None else None
+    stats.update({
+        "sortino_ratio": sortino_ratio(returns),
+        "rolling_sharpe": {
+            "window": rolling_window,
+            "latest": float(rolling[-1]) if len(rolling) else None,
+            "min": float(np.min(rolling)) if len(rolling) else None,
+            "max": float(np.max(rolling)) if len(rolling) else None,
+            "median": float(np.median(rolling)) if len(rolling) else None,
+        },
+        "longest_drawdown": longest,
+        "current_drawdown": current,
+        "num_drawdowns": len(periods),
+        "monthly_returns": monthly_returns(days, values),
+    })
+    return stats
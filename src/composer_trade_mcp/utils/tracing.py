@@ -0,0 +1,161 @@
+"""
+Lightweight tracing for Composer MCP Server.
+
+A span is opened per tool call, with child spans for header parsing, validation, each upstream request and
+each parse stage. Finished spans are handed to every registered exporter. Without exporters, `span` returns
+a shared no-op span, so instrumented code costs almost nothing.
+
+Exporters are configured with COMPOSER_MCP_TRACE_EXPORTERS (comma-separated: "console", "file") and
+COMPOSER_MCP_TRACE_FILE (JSON lines, default "composer-mcp-traces.jsonl"). Custom exporters are any object
+with an `export(span)` method, added with `add_span_exporter`.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+import functools
+import json
+import logging
+import os
+import re
+import secrets
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# W3C trace context: version-trace_id-parent_id-flags
+TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+class _NoopSpan:
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class ConsoleExporter:
+    """
+    Write each finished span as a JSON line to a stream (stderr by default, since stdout may carry MCP messages).
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stderr
+
+    def export(self, span: Span) -> None:
+        self.stream.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+class FileExporter:
+    """
+    Append each finished span as a JSON line to a file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        self._file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+_exporters: List[Any] = []
+_current_span: ContextVar[Optional[Span]] = ContextVar("composer_mcp_current_span", default=None)
+
+def add_span_exporter(exporter: Any) -> None:
+    _exporters.append(exporter)
+
+def tracing_enabled() -> bool:
+    return bool(_exporters)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def span(name: str, traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Open a span, as a child of the current span if there is one. A root span can continue a remote trace
+    by passing the caller's W3C `traceparent` header.
+    """
+    if not _exporters:
+        yield NOOP_SPAN
+        return
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id, parent_span_id = parent.trace_id, parent.span_id
+    else:
+        match = TRACEPARENT_PATTERN.match(traceparent or "")
+        trace_id, parent_span_id = match.groups() if match else (secrets.token_hex(16), None)
+    current = Span(name, trace_id, parent_span_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration_ms = (time.perf_counter() - current._start) * 1000
+        for exporter in _exporters:
+            try:
+                exporter.export(current)
+            except Exception as e:
+                logger.error(f"Error exporting span {name}: {e!r}")
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator running a (synchronous) function inside a span named after it.
+    """
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _exporters:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def configure_tracing() -> None:
+    """
+    Add the exporters named in COMPOSER_MCP_TRACE_EXPORTERS.
+    """
+    for name in filter(None, (part.strip().lower() for part in os.getenv("COMPOSER_MCP_TRACE_EXPORTERS", "").split(","))):
+        if name == "console":
+            add_span_exporter(ConsoleExporter())
+        elif name == "file":
+            add_span_exporter(FileExporter(os.getenv("COMPOSER_MCP_TRACE_FILE", "composer-mcp-traces.jsonl")))
+        else:
+            logger.warning(f"Unknown trace exporter: {name}")
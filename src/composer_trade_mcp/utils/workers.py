@@ -0,0 +1,289 @@
+"""
+Multi-process serving with pre-started workers sharing one listening socket.
+
+With COMPOSER_MCP_WORKERS > 1, `main()` runs a `Supervisor` instead of the server. The supervisor binds the socket once
+and starts that many worker processes which inherit it, so the kernel spreads connections over workers and CPU-heavy
+work (validation, parsing, JSON) can use every core. Workers are fresh interpreters rather than forks of the supervisor,
+so a reload picks up new code. The supervisor handles:
+- SIGHUP: rolling reload. Workers are replaced one at a time, and each old worker is only stopped once its replacement is ready.
+- SIGTERM / SIGINT: graceful shutdown. Workers stop accepting connections and finish in-flight requests.
+- Workers that exit are restarted, and workers that stop sending heartbeats are killed and restarted.
+
+Every worker writes a heartbeat file to a status directory shared with the supervisor, and /health on any worker reports
+how many workers are ready, so a load balancer sees the state of the whole instance. A draining worker answers 503.
+
+Workers serve MCP in stateless mode, since consecutive requests of one client can reach different workers.
+Caches created with `make_cache` default to a SQLite database in the status directory, shared by all workers.
+Everything else is per worker:
+- other caches (market sessions, options chain snapshots, performance histories) and in-flight request deduplication;
+- `SharedPoller` state, so `wait_for_completion` calls served by different workers poll upstream separately;
+- /metrics, which only reports the worker that answered the scrape.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import asyncio
+import glob
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds between worker heartbeats.
+HEARTBEAT_INTERVAL = 2
+# Workers whose last heartbeat is older than this are considered stuck.
+HEARTBEAT_TIMEOUT = 30
+# Seconds a new worker gets to become ready.
+STARTUP_TIMEOUT = 60
+# Seconds workers get to finish in-flight requests when stopped.
+GRACEFUL_TIMEOUT = 30
+# Upper bound of the delay before restarting workers that keep crashing on startup.
+MAX_RESTART_DELAY = 30
+
+def worker_status_dir() -> Optional[str]:
+    """
+    Status directory shared with the supervisor, or None when not running as a worker.
+    """
+    return os.getenv("COMPOSER_MCP_WORKER_DIR") or None
+
+def read_heartbeats(directory: str) -> Dict[int, Dict]:
+    heartbeats = {}
+    for path in glob.glob(os.path.join(directory, "worker-*.json")):
+        try:
+            with open(path) as f:
+                heartbeat = json.load(f)
+            heartbeats[heartbeat["pid"]] = heartbeat
+        except (OSError, ValueError, KeyError):
+            # Removed or replaced while reading.
+            continue
+    return heartbeats
+
+def _write_json(path: str, data: Dict) -> None:
+    # Write and rename, so readers never see a partial file.
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class WorkerHeartbeat:
+    """
+    Periodically records whether this worker's server is ready to serve requests.
+    """
+
+    def __init__(self, directory: str, server):
+        self.path = os.path.join(directory, f"worker-{os.getpid()}.json")
+        self.server = server
+
+    @property
+    def draining(self) -> bool:
+        return bool(self.server.should_exit)
+
+    def write(self) -> None:
+        _write_json(self.path, {
+            "pid": os.getpid(),
+            "ready": bool(self.server.started) and not self.draining,
+            "time": time.time(),
+        })
+
+    async def run(self) -> None:
+        # Write every HEARTBEAT_INTERVAL, and right away when the worker becomes ready or starts draining.
+        last_write = 0.0
+        last_state = None
+        while True:
+            state = (bool(self.server.started), self.draining)
+            if state != last_state or time.monotonic() - last_write >= HEARTBEAT_INTERVAL:
+                try:
+                    self.write()
+                    last_write = time.monotonic()
+                    last_state = state
+                except OSError as e:
+                    logger.error(f"Error writing worker heartbeat: {e!r}")
+            await asyncio.sleep(0.1)
+
+_heartbeat: Optional[WorkerHeartbeat] = None
+
+def cluster_health() -> Optional[Dict]:
+    """
+    Health of all workers of this instance, or None when not running as a worker.
+    """
+    directory = worker_status_dir()
+    if directory is None:
+        return None
+    try:
+        with open(os.path.join(directory, "supervisor.json")) as f:
+            expected = json.load(f)["workers"]
+    except (OSError, ValueError, KeyError):
+        expected = None
+    now = time.time()
+    ready = [
+        pid for pid, heartbeat in read_heartbeats(directory).items()
+        if heartbeat.get("ready") and now - heartbeat.get("time", 0) <= HEARTBEAT_TIMEOUT
+    ]
+    return {
+        "worker_pid": os.getpid(),
+        "draining": _heartbeat.draining if _heartbeat is not None else False,
+        "workers_expected": expected,
+        "workers_ready": len(ready),
+    }
+
+def serve_worker(app) -> None:
+    """
+    Serve `app` on the listening socket inherited from the supervisor.
+    """
+    import uvicorn
+
+    global _heartbeat
+    sock = socket.socket(fileno=int(os.environ["COMPOSER_MCP_LISTEN_FD"]))
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="on", timeout_graceful_shutdown=GRACEFUL_TIMEOUT))
+    _heartbeat = WorkerHeartbeat(os.environ["COMPOSER_MCP_WORKER_DIR"], server)
+
+    async def serve() -> None:
+        heartbeat = asyncio.create_task(_heartbeat.run())
+        try:
+            await server.serve(sockets=[sock])
+        finally:
+            heartbeat.cancel()
+
+    asyncio.run(serve())
+
+@dataclass
+class WorkerProcess:
+    process: subprocess.Popen
+    started: float
+    retiring: bool = False
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+class Supervisor:
+    def __init__(self, worker_command: List[str], workers: int, host: str, port: int):
+        self.worker_command = worker_command
+        self.num_workers = workers
+        self.host = host
+        self.port = port
+        self.workers: Dict[int, WorkerProcess] = {}
+        self.directory: Optional[str] = None
+        self._env: Dict[str, str] = {}
+        self._stop = False
+        self._reload = False
+        self._restart_delay = 0.0
+
+    def _spawn(self) -> WorkerProcess:
+        process = subprocess.Popen(self.worker_command, env=self._env, pass_fds=(int(self._env["COMPOSER_MCP_LISTEN_FD"]),))
+        worker = WorkerProcess(process, time.monotonic())
+        self.workers[worker.pid] = worker
+        logger.info(f"Started worker {worker.pid}")
+        return worker
+
+    def _ready(self, worker: WorkerProcess) -> bool:
+        heartbeat = read_heartbeats(self.directory).get(worker.pid)
+        return bool(heartbeat and heartbeat.get("ready"))
+
+    def _check_workers(self) -> None:
+        heartbeats = read_heartbeats(self.directory)
+        now = time.time()
+        for pid, worker in list(self.workers.items()):
+            returncode = worker.process.poll()
+            if returncode is not None:
+                del self.workers[pid]
+                _remove(os.path.join(self.directory, f"worker-{pid}.json"))
+                if worker.retiring or self._stop:
+                    continue
+                logger.error(f"Worker {pid} exited with code {returncode}, restarting")
+                if time.monotonic() - worker.started < STARTUP_TIMEOUT and pid not in heartbeats:
+                    # Crashed before becoming ready: back off instead of restarting in a tight loop.
+                    self._restart_delay = min(max(1.0, self._restart_delay * 2), MAX_RESTART_DELAY)
+                    time.sleep(self._restart_delay)
+                self._spawn()
+                continue
+            heartbeat = heartbeats.get(pid)
+            if heartbeat and heartbeat.get("ready"):
+                self._restart_delay = 0.0
+            last_seen = heartbeat["time"] if heartbeat else None
+            if last_seen is None and time.monotonic() - worker.started > STARTUP_TIMEOUT:
+                logger.error(f"Worker {pid} did not start within {STARTUP_TIMEOUT}s, killing it")
+                worker.process.kill()
+            elif last_seen is not None and now - last_seen > HEARTBEAT_TIMEOUT and not worker.retiring:
+                logger.error(f"Worker {pid} stopped sending heartbeats, killing it")
+                worker.process.kill()
+
+    def _rolling_reload(self) -> None:
+        logger.info("Reloading workers")
+        for old in [worker for worker in self.workers.values() if not worker.retiring]:
+            new = self._spawn()
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while not self._ready(new):
+                if self._stop or new.process.poll() is not None or time.monotonic() > deadline:
+                    logger.error(f"Replacement worker {new.pid} did not become ready, aborting reload")
+                    new.retiring = True
+                    new.process.terminate()
+                    return
+                time.sleep(0.2)
+            old.retiring = True
+            old.process.terminate()
+        logger.info("Reloaded workers")
+
+    def _shutdown(self) -> None:
+        for worker in self.workers.values():
+            worker.retiring = True
+            if worker.process.poll() is None:
+                worker.process.terminate()
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT + 5
+        for worker in self.workers.values():
+            try:
+                worker.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.error(f"Worker {worker.pid} did not stop in time, killing it")
+                worker.process.kill()
+                worker.process.wait()
+
+    def run(self) -> int:
+        sock = socket.create_server((self.host, self.port), backlog=2048)
+        sock.set_inheritable(True)
+        self.directory = tempfile.mkdtemp(prefix="composer-mcp-workers-")
+        self._env = {
+            **os.environ,
+            "COMPOSER_MCP_LISTEN_FD": str(sock.fileno()),
+            "COMPOSER_MCP_WORKER_DIR": self.directory,
+        }
+        self._env.setdefault("COMPOSER_MCP_CACHE_BACKEND", "sqlite")
+        self._env.setdefault("COMPOSER_MCP_CACHE_PATH", os.path.join(self.directory, "cache.sqlite3"))
+        _write_json(os.path.join(self.directory, "supervisor.json"), {"pid": os.getpid(), "workers": self.num_workers})
+
+        def stop(signum, frame):
+            self._stop = True
+
+        def reload(signum, frame):
+            self._reload = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGHUP, reload)
+        logger.info(f"Starting {self.num_workers} workers on http://{self.host}:{self.port}")
+        try:
+            for _ in range(self.num_workers):
+                self._spawn()
+            while not self._stop:
+                if self._reload:
+                    self._reload = False
+                    self._rolling_reload()
+                self._check_workers()
+                time.sleep(0.5)
+        finally:
+            self._shutdown()
+            sock.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+        return 0
@@ -0,0 +1,6 @@
+"""
+Shared test setup.
+"""
+# Importing the schemas package first avoids the circular import between schemas and utils
+# when a test imports a utils module on its own.
+import composer_trade_mcp.schemas  # noqa: F401
@@ -0,0 +1,81 @@
+"""
+Tests for combining holdings, portfolio stats and trades across accounts and symphonies.
+"""
+import numpy as np
+import pytest
+
+from composer_trade_mcp.utils.aggregation import group_sum, merge_holdings, merge_portfolio_stats, net_trades
+
+def _holding(ticker, direct=None, symphony=None):
+    return {
+        "ticker": ticker,
+        "direct": {"amount": direct[0], "value": direct[1]} if direct else None,
+        "symphony": {"amount": symphony[0], "value": symphony[1]} if symphony else None,
+    }
+
+def test_group_sum():
+    keys, sums = group_sum(["b", "a", "b"], np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]))
+    assert keys == ["a", "b"]
+    assert sums.tolist() == [[3.0, 4.0], [6.0, 8.0]]
+
+def test_merge_holdings_sums_per_ticker_and_source():
+    merged = merge_holdings({
+        "account-1": [_holding("SPY", direct=(2, 200), symphony=(1, 100)), _holding("QQQ", symphony=(1, 50))],
+        "account-2": [_holding("SPY", direct=(1, 100)), _holding("BIL", direct=(5, 50))],
+    })
+    assert merged["total_value"] == 500.0
+    assert [holding["ticker"] for holding in merged["holdings"]] == ["SPY", "BIL", "QQQ"]
+    spy = merged["holdings"][0]
+    assert spy == {
+        "ticker": "SPY",
+        "accounts": ["account-1", "account-2"],
+        "direct": {"amount": 3.0, "value": 300.0},
+        "symphony": {"amount": 1.0, "value": 100.0},
+        "overall_portfolio": {"allocation": 0.8, "amount": 4.0, "value": 400.0},
+    }
+    assert sum(holding["overall_portfolio"]["allocation"] for holding in merged["holdings"]) == pytest.approx(1.0)
+
+def test_merge_holdings_empty():
+    assert merge_holdings({"account-1": []}) == {"total_value": 0.0, "holdings": []}
+
+def test_merge_portfolio_stats_recomputes_ratios():
+    totals = merge_portfolio_stats([
+        {"portfolio_value": 1100, "net_deposits": 1000, "todays_dollar_change": 11, "total_cash": 5},
+        {"portfolio_value": 900, "net_deposits": 1000, "todays_dollar_change": -1, "total_cash": None},
+    ])
+    assert totals["portfolio_value"] == 2000.0
+    assert totals["total_cash"] == 5.0
+    assert totals["simple_return"] == 0.0
+    assert totals["todays_percent_change"] == pytest.approx(10 / 2000)
+
+def test_merge_portfolio_stats_empty():
+    totals = merge_portfolio_stats([])
+    assert totals["portfolio_value"] == 0.0
+    assert totals["simple_return"] == 0.0 and totals["todays_percent_change"] == 0.0
+
+def test_net_trades_offsets_opposite_trades():
+    netted = net_trades({
+        "sym-1": [{"symbol": "SPY", "side": "BUY", "notional": 1000, "quantity": 2}, {"symbol": "BIL", "side": "SELL", "notional": 300}],
+        "sym-2": [{"symbol": "SPY", "side": "SELL", "notional": 400, "quantity": 0.8}, {"ticker": "QQQ", "side": "BUY", "notional": 50}],
+        "sym-3": [{"side": "BUY", "notional": 10}],
+    }, cost_bps=10)
+    assert netted["gross_turnover"] == 1750.0
+    assert netted["net_turnover"] == 950.0
+    assert netted["turnover_saved"] == 800.0
+    assert netted["estimated_cost_savings"] == 0.8
+    assert netted["trades"] == [
+        {"symbol": "SPY", "side": "BUY", "net_notional": 600.0, "net_quantity": pytest.approx(1.2), "gross_notional": 1400.0, "symphony_ids": ["sym-1", "sym-2"]},
+        {"symbol": "BIL", "side": "SELL", "net_notional": -300.0, "net_quantity": 0.0, "gross_notional": 300.0, "symphony_ids": ["sym-1"]},
+        {"symbol": "QQQ", "side": "BUY", "net_notional": 50.0, "net_quantity": 0.0, "gross_notional": 50.0, "symphony_ids": ["sym-2"]},
+    ]
+
+def test_net_trades_fully_offsetting():
+    netted = net_trades({
+        "sym-1": [{"symbol": "SPY", "side": "BUY", "notional": 100}],
+        "sym-2": [{"symbol": "SPY", "side": "SELL", "notional": -100}],
+    })
+    assert netted["net_turnover"] == 0.0
+    assert netted["trades"][0]["side"] == "NONE"
+
+def test_net_trades_empty():
+    assert net_trades({})["trades"] == []
@@ -0,0 +1,88 @@
+"""
+Tests for extending cached backtests with newer market days.
+"""
+import numpy as np
+import pytest
+
+from composer_trade_mcp.schemas.backtest_api import BacktestResponse
+from composer_trade_mcp.utils.backtest import stitch_backtest, truncate_backtest
+from composer_trade_mcp.utils.stats import compute_backtest_stats
+
+BENCHMARKS = ["SPY"]
+FIRST_DAY = 19359
+DAYS = list(range(FIRST_DAY, FIRST_DAY + 120))
+
+def _series(seed, capital):
+    returns = np.random.default_rng(seed).normal(0.0004, 0.012, len(DAYS))
+    returns[0] = 0
+    return capital * np.cumprod(1 + returns)
+
+SYMPHONY = _series(1, 10_000.0)
+SPY = _series(2, 10_000.0)
+
+def _backtest(start, end, capital=10_000.0):
+    """
+    Backtest over DAYS[start:end], as the API returns it when started with `capital` on DAYS[start].
+    """
+    scale = capital / SYMPHONY[start]
+    benchmark_scale = capital / SPY[start]
+    dvm_capital = {
+        "sym-1": {day: value * scale for day, value in zip(DAYS[start:end], SYMPHONY[start:end])},
+        "SPY": {day: value * benchmark_scale for day, value in zip(DAYS[start:end], SPY[start:end])},
+    }
+    return BacktestResponse(
+        first_day=DAYS[start],
+        capital=capital,
+        last_market_day=DAYS[end - 1],
+        last_market_days_holdings={"SPY": SYMPHONY[end - 1] * scale / 400},
+        last_market_days_value=SYMPHONY[end - 1] * scale,
+        stats=compute_backtest_stats(dvm_capital, "sym-1", BENCHMARKS),
+        dvm_capital=dvm_capital,
+        legend={"sym-1": {"name": "Symphony"}},
+    )
+
+def _assert_nested_approx(actual, expected):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _assert_nested_approx(actual[key], expected[key])
+    else:
+        assert actual == pytest.approx(expected)
+
+def test_stitched_backtest_equals_full_run():
+    full = _backtest(0, len(DAYS))
+    cached = _backtest(0, 90)
+    # The tail starts a few days before the cached backtest ends, with its own starting capital.
+    tail = _backtest(85, len(DAYS), capital=1_000.0)
+
+    stitched = stitch_backtest(cached, tail, BENCHMARKS)
+
+    assert stitched is not None
+    _assert_nested_approx(stitched.dvm_capital, full.dvm_capital)
+    _assert_nested_approx(stitched.stats, full.stats)
+    assert stitched.first_day == full.first_day
+    assert stitched.last_market_day == full.last_market_day
+    assert stitched.last_market_days_value == pytest.approx(full.last_market_days_value)
+    _assert_nested_approx(stitched.last_market_days_holdings, full.last_market_days_holdings)
+
+def test_stitch_needs_an_overlapping_day():
+    assert stitch_backtest(_backtest(0, 60), _backtest(60, len(DAYS)), BENCHMARKS) is None
+
+def test_stitch_needs_every_series_in_the_tail():
+    tail = _backtest(50, len(DAYS))
+    del tail.dvm_capital["SPY"]
+    assert stitch_backtest(_backtest(0, 60), tail, BENCHMARKS) is None
+
+def test_truncated_backtest_equals_shorter_run():
+    truncated = truncate_backtest(_backtest(0, len(DAYS)), DAYS[59], BENCHMARKS)
+    shorter = _backtest(0, 60)
+
+    assert truncated is not None
+    _assert_nested_approx(truncated.dvm_capital, shorter.dvm_capital)
+    _assert_nested_approx(truncated.stats, shorter.stats)
+    assert truncated.last_market_day == DAYS[59]
+    assert truncated.last_market_days_value == pytest.approx(shorter.last_market_days_value)
+    assert truncated.last_market_days_holdings is None
+
+def test_truncate_before_first_day():
+    assert truncate_backtest(_backtest(0, 60), FIRST_DAY - 1, BENCHMARKS) is None
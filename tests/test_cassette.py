@@ -0,0 +1,54 @@
+"""
+Tests for recording and replaying upstream traffic.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from composer_trade_mcp.utils.cassette import Cassette, CassetteMissError, CassetteTransport, body_hash
+
+def test_body_hash_ignores_json_key_order():
+    assert body_hash(b'{"a": 1, "b": 2}') == body_hash(b'{"b":2,"a":1}')
+    assert body_hash(b"not json") != body_hash(b"not json!")
+
+@pytest.mark.parametrize("file_name", ["cassette.jsonl", "cassette.jsonl.gz"])
+def test_record_then_replay(tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    responses = iter([{"status": "running"}, {"status": "done"}])
+
+    def upstream(request):
+        return httpx.Response(200, json=next(responses), headers={"x-request-id": "1"})
+
+    async def call(transport, times):
+        async with httpx.AsyncClient(transport=transport) as client:
+            results = []
+            for _ in range(times):
+                response = await client.post(
+                    "https://api.example.com/status", json={"id": 1, "kind": "x"}, headers={"Authorization": "Bearer secret"},
+                )
+                results.append(response.json())
+            return results
+
+    recorder = Cassette(path, "record")
+    recorder.record_tool_call("get_status", {"id": 1})
+    asyncio.run(call(CassetteTransport(recorder, httpx.MockTransport(upstream)), 2))
+    recorder.close()
+    with open(path, "rb") as f:
+        assert b"secret" not in f.read()
+
+    player = Cassette(path, "replay")
+    assert player.tool_calls == [{"type": "tool", "name": "get_status", "arguments": {"id": 1}}]
+    # Responses are served in recorded order and the last one is repeated.
+    assert asyncio.run(call(CassetteTransport(player), 3)) == [{"status": "running"}, {"status": "done"}, {"status": "done"}]
+
+def test_replay_miss(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+
+    async def call():
+        async with httpx.AsyncClient(transport=CassetteTransport(Cassette(str(path), "replay"))) as client:
+            await client.get("https://api.example.com/unknown")
+
+    with pytest.raises(CassetteMissError):
+        asyncio.run(call())
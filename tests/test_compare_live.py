@@ -0,0 +1,54 @@
+"""
+Tests for comparing a symphony's live performance with its backtest.
+"""
+import asyncio
+import math
+
+import pytest
+
+from composer_trade_mcp import server
+from composer_trade_mcp.schemas.backtest_api import BacktestResponse
+from composer_trade_mcp.utils.history_store import MS_PER_DAY, PerformanceHistory
+
+DAY = 19724
+
+def _compare(monkeypatch, live_values):
+    history = PerformanceHistory()
+    history.merge({
+        "epoch_ms": [(DAY + i) * MS_PER_DAY for i in range(len(live_values))],
+        "deposit_adjusted_series": live_values,
+    })
+    backtests = []
+
+    async def sync_performance_history(account_uuid, symphony_id=None):
+        return history
+
+    async def run_symphony_backtest(symphony_id, start_date, end_date, params, incremental=False):
+        backtests.append((start_date, end_date))
+        days = range(DAY, DAY + len(live_values))
+        return BacktestResponse(dvm_capital={
+            "sym-1": {day: 100.0 + 5 * (day - DAY) for day in days},
+            "SPY": {day: 100.0 + (day - DAY) for day in days},
+        })
+
+    monkeypatch.setattr(server, "_sync_performance_history", sync_performance_history)
+    monkeypatch.setattr(server, "_run_symphony_backtest", run_symphony_backtest)
+    result = asyncio.run(server._compare_symphony_live_vs_backtest("account", {"id": "sym-1"}))
+    return result, backtests
+
+def test_windows_start_on_the_first_funded_day(monkeypatch):
+    result, backtests = _compare(monkeypatch, [0, 0, 1000, 1100])
+    assert result["start_day"] == DAY + 2 and result["end_day"] == DAY + 3
+    assert backtests == [(server.epoch_to_date(DAY + 2), server.epoch_to_date(DAY + 3))]
+    assert result["live"] == pytest.approx(0.1)
+    assert result["backtest"] == pytest.approx(115 / 110 - 1)
+    assert result["spy"] == pytest.approx(103 / 102 - 1)
+
+def test_single_funded_day_gives_nan(monkeypatch):
+    result, backtests = _compare(monkeypatch, [0, 0, 1000])
+    assert all(math.isnan(result[key]) for key in ("live", "backtest", "spy"))
+    assert backtests == []
+
+def test_unfunded_symphony_fails(monkeypatch):
+    with pytest.raises(ValueError, match="No funded live history"):
+        _compare(monkeypatch, [0, 0])
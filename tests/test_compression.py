@@ -0,0 +1,85 @@
+"""
+Tests for response compression.
+"""
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from composer_trade_mcp.utils.compression import CompressionMiddleware, StreamCompressor, compress, negotiate
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("", None),
+    ("identity", None),
+    ("deflate, gzip;q=0.5", "gzip"),
+    ("*", "gzip"),
+    ("*, gzip;q=0", None),
+    ("gzip;q=bad", None),
+])
+def test_negotiate(accept_encoding, expected, monkeypatch):
+    monkeypatch.setattr("composer_trade_mcp.utils.compression.ENCODINGS", ["gzip"])
+    assert negotiate(accept_encoding) == expected
+
+def test_stream_compressor_flushes_every_chunk():
+    compressor = StreamCompressor("gzip")
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # Each chunk must be decodable as soon as it is sent.
+    for chunk in (b"event: one\n\n", b"event: two\n\n"):
+        assert decompressor.decompress(compressor.compress(chunk)) == chunk
+    decompressor.decompress(compressor.finish())
+    assert decompressor.eof
+
+def test_compress_round_trip():
+    data = b"x" * 10_000
+    assert gzip.decompress(compress(data, "gzip")) == data
+    with pytest.raises(ValueError):
+        StreamCompressor("lzma")
+
+def _run(body_messages, content_type=b"application/json", accept_encoding=b"gzip", minimum_size=100):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type)]})
+        for message in body_messages:
+            await send({"type": "http.response.body", **message})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding)]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, None, send))
+    return dict(sent[0]["headers"]), [message["body"] for message in sent[1:]]
+
+def test_middleware_compresses_large_responses(monkeypatch):
+    monkeypatch.setattr("composer_trade_mcp.utils.compression.ENCODINGS", ["gzip"])
+    body = b'{"data": "' + b"a" * 1000 + b'"}'
+    headers, bodies = _run([{"body": body}])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert int(headers[b"content-length"]) == len(bodies[0])
+    assert gzip.decompress(bodies[0]) == body
+
+@pytest.mark.parametrize("kwargs", [
+    {"content_type": b"image/png"},
+    {"accept_encoding": b"identity"},
+    {"minimum_size": 10_000},
+])
+def test_middleware_passes_through(kwargs, monkeypatch):
+    monkeypatch.setattr("composer_trade_mcp.utils.compression.ENCODINGS", ["gzip"])
+    body = b"a" * 1000
+    headers, bodies = _run([{"body": body}], **kwargs)
+    assert b"content-encoding" not in headers
+    assert bodies == [body]
+
+def test_middleware_streams_chunks(monkeypatch):
+    monkeypatch.setattr("composer_trade_mcp.utils.compression.ENCODINGS", ["gzip"])
+    chunks = [b"data: " + b"a" * 200 + b"\n\n", b"data: b\n\n", b""]
+    headers, bodies = _run([{"body": chunk, "more_body": i < 2} for i, chunk in enumerate(chunks)], content_type=b"text/event-stream")
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert [decompressor.decompress(body) for body in bodies[:2]] == chunks[:2]
+    decompressor.decompress(bodies[2])
+    assert decompressor.eof
@@ -0,0 +1,25 @@
+"""
+Tests for bounded concurrent fan-out.
+"""
+import asyncio
+
+from composer_trade_mcp.utils.concurrency import gather_bounded
+
+def test_gather_bounded_limits_concurrency_and_keeps_order():
+    running = 0
+    peak = 0
+
+    async def task(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (5 - i))
+        running -= 1
+        if i == 3:
+            raise ValueError("failed")
+        return i
+
+    results = asyncio.run(gather_bounded((task(i) for i in range(5)), 2))
+    assert peak == 2
+    assert results[:3] == [0, 1, 2] and results[4] == 4
+    assert isinstance(results[3], ValueError)
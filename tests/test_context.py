@@ -0,0 +1,71 @@
+"""
+Tests for the per-request context.
+"""
+import base64
+
+import pytest
+
+from composer_trade_mcp.utils import auth
+from composer_trade_mcp.utils.context import build_request_context, current_request_context, use_request_context
+from composer_trade_mcp.utils.profiling import PROFILE_HEADER
+
+BASE_URLS = {"prod": "https://api.composer.trade", "dev": "https://api.dev.composer.trade"}
+BASIC = "Basic " + base64.b64encode(b"key-1:secret-1").decode()
+
+def _build(headers, session_id=None):
+    return build_request_context(headers, BASE_URLS.__getitem__, session_id)
+
+def test_basic_auth():
+    context = _build({"authorization": BASIC, PROFILE_HEADER: "token"}, session_id="session-1")
+    assert context.environment == "prod" and context.base_url == BASE_URLS["prod"]
+    assert dict(context.required_headers) == {"authorization": "Bearer secret-1", "x-api-key-id": "key-1", "x-origin": "public-api"}
+    assert context.optional_headers == context.required_headers
+    assert context.required_headers_error is None
+    assert context.session_id == "session-1"
+
+def test_bearer_auth_in_dev():
+    context = _build({"authorization": "Bearer secret-1", "x-api-key-id": "key-1", "x-composer-mcp-environment": "dev"})
+    assert context.base_url == BASE_URLS["dev"]
+    assert context.required_headers["authorization"] == "Bearer secret-1"
+    assert context.credential_fingerprint == _build({"authorization": BASIC}).credential_fingerprint
+
+@pytest.mark.parametrize("headers, error", [
+    ({}, "X-Api-Key-Id header is required but not set"),
+    ({"x-api-key-id": "key-1"}, "Authorization header is required but not set"),
+])
+def test_missing_credentials_only_fail_required_headers(headers, error):
+    context = _build(headers)
+    assert context.required_headers is None and context.required_headers_error == error
+    assert dict(context.optional_headers) == {"x-origin": "public-api"}
+    assert context.optional_headers_error is None
+
+def test_invalid_basic_auth():
+    context = _build({"authorization": "Basic not-base64"})
+    assert context.optional_headers_error == context.required_headers_error == "Invalid basic auth header"
+    assert context.credential_fingerprint is None
+
+@pytest.mark.parametrize("headers", [
+    {"authorization": BASIC, PROFILE_HEADER: "token"},
+    {"authorization": "Bearer secret-1", "x-api-key-id": "key-1"},
+    {"x-api-key-id": "key-1"},
+    {"authorization": "Basic not-base64"},
+])
+def test_auth_helpers_match_with_and_without_context(monkeypatch, headers):
+    """
+    The auth helpers give the same answers from the context as from parsing the headers.
+    """
+    monkeypatch.setattr(auth, "get_http_headers", lambda: dict(headers))
+
+    def answers():
+        results = []
+        for helper in (auth.get_optional_headers, auth.get_required_headers, auth.get_credential_fingerprint):
+            try:
+                results.append(helper())
+            except ValueError as e:
+                results.append(str(e))
+        return results
+
+    parsed = answers()
+    with use_request_context(_build(headers)):
+        assert answers() == parsed
+    assert current_request_context() is None
@@ -0,0 +1,62 @@
+"""
+Tests for Arrow/Parquet exports.
+"""
+import asyncio
+import io
+import os
+
+import pytest
+
+from composer_trade_mcp.utils import export
+from composer_trade_mcp.utils.export import EXPORT_URI_PREFIX, ExportStore, serialize_columns
+
+COLUMNS = {"date": ["2024-01-02", "2024-01-03"], "value": [100.0, 101.5]}
+
+@pytest.mark.parametrize("export_format", ["arrow", "parquet"])
+def test_serialize_columns_round_trip(export_format):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    data = serialize_columns(COLUMNS, export_format, date_column="date", metadata={"symphony_id": "sym-1", "skipped": None})
+    if export_format == "arrow":
+        table = pyarrow.ipc.open_file(pyarrow.BufferReader(data)).read_all()
+    else:
+        table = pyarrow.parquet.read_table(io.BytesIO(data))
+    assert table.schema.field("date").type == pyarrow.date32()
+    assert [day.isoformat() for day in table.column("date").to_pylist()] == COLUMNS["date"]
+    assert table.column("value").to_pylist() == COLUMNS["value"]
+    assert table.schema.metadata[b"symphony_id"] == b"sym-1"
+    assert b"skipped" not in table.schema.metadata
+
+def test_serialize_columns_errors(monkeypatch):
+    if export.pyarrow is not None:
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            serialize_columns(COLUMNS, "csv")
+    monkeypatch.setattr(export, "pyarrow", None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        serialize_columns(COLUMNS, "arrow")
+
+def test_store_in_cache_is_readable_by_owner_only():
+    store = ExportStore(directory=None)
+
+    async def main():
+        saved = await store.save(b"data", "parquet", "backtest sym/1", owner="owner-1")
+        export_id = saved["uri"][len(EXPORT_URI_PREFIX):]
+        with pytest.raises(ValueError, match="not found"):
+            await store.read(export_id, owner="owner-2")
+        return saved, export_id, await store.read(export_id, owner="owner-1")
+
+    saved, export_id, data = asyncio.run(main())
+    assert data == b"data"
+    assert export_id.startswith("backtest-sym-1-")
+    assert saved["format"] == "parquet" and saved["mime_type"] == "application/vnd.apache.parquet" and saved["bytes"] == 4
+
+def test_store_in_directory(tmp_path):
+    store = ExportStore(directory=str(tmp_path / "exports"))
+    saved = asyncio.run(store.save(b"data", "arrow", "history", owner="owner-1"))
+    assert "uri" not in saved
+    assert saved["path"].endswith(".arrow") and os.path.dirname(saved["path"]) == str(tmp_path / "exports")
+    with open(saved["path"], "rb") as f:
+        assert f.read() == b"data"
+    assert os.listdir(tmp_path / "exports") == [os.path.basename(saved["path"])]
@@ -0,0 +1,43 @@
+"""
+Tests for the local performance history store.
+"""
+from composer_trade_mcp.utils.history_store import MS_PER_DAY, PerformanceHistory
+
+# 2024-01-02 as an epoch day.
+DAY = 19724
+
+def _response(days, series, **extra):
+    return {"epoch_ms": [day * MS_PER_DAY for day in days], "series": list(series), **extra}
+
+def test_merge_appends_new_rows_and_refreshes_last_row():
+    history = PerformanceHistory()
+    assert history.merge(_response([DAY, DAY + 1], [100, 101], currency="USD")) == 2
+    assert history.merge(_response([DAY, DAY + 1, DAY + 2], [100, 102, 103], currency="USD")) == 1
+    assert history.columns["series"] == [100, 102, 103]
+    assert history.dates == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert history.meta == {"currency": "USD"}
+
+def test_merge_replaces_history_that_does_not_line_up():
+    history = PerformanceHistory()
+    history.merge(_response([DAY, DAY + 1], [100, 101]))
+    # A different first day (e.g. a restated history) replaces the stored rows.
+    assert history.merge(_response([DAY + 1, DAY + 2], [50, 51])) == 2
+    assert history.columns["series"] == [50, 51]
+    # So does a new column.
+    assert history.merge(_response([DAY + 1, DAY + 2], [50, 51], deposit_adjusted_series=[1, 2])) == 2
+    assert set(history.columns) == {"series", "deposit_adjusted_series"}
+
+def test_merge_replaces_history_when_an_earlier_row_is_restated():
+    history = PerformanceHistory()
+    history.merge(_response([DAY, DAY + 1, DAY + 2], [100, 101, 102]))
+    # The close of the first day was corrected upstream.
+    assert history.merge(_response([DAY, DAY + 1, DAY + 2, DAY + 3], [99, 101, 102, 104])) == 4
+    assert history.columns["series"] == [99, 101, 102, 104]
+    assert history.to_response()["dates"][-1] == "2024-01-05"
+
+def test_responses_are_restricted_to_the_day_range():
+    history = PerformanceHistory()
+    history.merge(_response([DAY, DAY + 1, DAY + 2], [100, 101, 102], currency="USD"))
+    assert history.to_response(DAY + 1, DAY + 1) == {"currency": "USD", "series": [101], "dates": ["2024-01-03"]}
+    assert history.to_raw(start_day=DAY + 1)["epoch_ms"] == [(DAY + 1) * MS_PER_DAY, (DAY + 2) * MS_PER_DAY]
+    assert history.to_response(end_day=DAY)["series"] == [100]
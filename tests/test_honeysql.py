@@ -0,0 +1,83 @@
+"""
+Tests for HoneySQL clause canonicalization and the local search snapshot evaluator.
+"""
+import pickle
+
+import pytest
+
+from composer_trade_mcp.utils.honeysql import SearchSnapshot, canonical_query_key, canonicalize_clause, canonicalize_order_by
+
+ROWS = [
+    {"symphony_url": "a", "name": "Alpha", "oos_sharpe": 1.5, "oos_max_drawdown": 0.20},
+    {"symphony_url": "b", "name": "Beta", "oos_sharpe": 0.8, "oos_max_drawdown": 0.10},
+    {"symphony_url": "c", "name": "Gamma", "oos_sharpe": None, "oos_max_drawdown": 0.30},
+    {"symphony_url": "d", "name": "Delta", "oos_sharpe": 2.1, "oos_max_drawdown": 0.35},
+]
+
+def _snapshot(rows=ROWS, max_rows=5000):
+    snapshot = SearchSnapshot(max_rows=max_rows)
+    snapshot.add(rows)
+    return snapshot
+
+def _urls(rows):
+    return [row["symphony_url"] for row in rows]
+
+def test_canonicalize_clause():
+    assert canonicalize_clause([":AND", [">", "x", 1.0], ["and", ["<", "y", 2], [">", "x", 1]]]) == [
+        "and", ["<", "y", 2], [">", "x", 1],
+    ]
+    assert canonicalize_clause([["or", ["=", "x", 1]]]) == ["=", "x", 1]
+
+def test_equivalent_queries_share_a_key():
+    first = canonical_query_key(["and", [">", "a", 1], ["<", "b", 2]], [["oos_sharpe", ":desc"]])
+    second = canonical_query_key([":and", ["<", "b", 2.0], [">", "a", 1]], [["oos_sharpe", "desc"]])
+    assert first == second
+    assert first != canonical_query_key(["and", [">", "a", 1], ["<", "b", 2]], [["oos_sharpe", "asc"]])
+
+def test_canonicalize_order_by():
+    assert canonicalize_order_by([":name", ["oos_sharpe", ":DESC"], ["x"]]) == [["name", "asc"], ["oos_sharpe", "desc"], ["x", "asc"]]
+    assert canonicalize_order_by(None) == []
+
+@pytest.mark.parametrize("where, expected", [
+    ([">", "oos_sharpe", 1], ["a", "d"]),
+    (["and", [">=", "oos_sharpe", 0.8], ["<", "oos_max_drawdown", 0.3]], ["a", "b"]),
+    (["or", ["=", "oos_max_drawdown", 0.3], [">", "oos_sharpe", 2]], ["c", "d"]),
+    (["not", [">", "oos_sharpe", 1]], ["b", "c"]),
+    # Comparisons with a missing value are false.
+    (["<", "oos_sharpe", 10], ["a", "b", "d"]),
+    ([">", ["/", "oos_sharpe", "oos_max_drawdown"], 7], ["a", "b"]),
+    ([">", ["-", "oos_max_drawdown"], -0.25], ["a", "b"]),
+])
+def test_query_filters(where, expected):
+    assert _urls(_snapshot().query(where)) == expected
+
+def test_query_sorts_missing_values_last():
+    snapshot = _snapshot()
+    assert _urls(snapshot.query(order_by=[["oos_sharpe", "desc"]])) == ["d", "a", "b", "c"]
+    assert _urls(snapshot.query(order_by=[["oos_sharpe", "asc"]])) == ["b", "a", "d", "c"]
+    assert _urls(snapshot.query(order_by=["name"], limit=2)) == ["a", "b"]
+
+@pytest.mark.parametrize("where, message", [
+    ([">", "unknown", 1], "Unknown column"),
+    (["like", "name", "A%"], "Unsupported operator"),
+    (["and", "oos_sharpe"], "Not a condition"),
+    (["not", ["=", "name", "A"], ["=", "name", "B"]], "exactly one argument"),
+])
+def test_query_errors(where, message):
+    with pytest.raises(ValueError, match=message):
+        _snapshot().query(where)
+
+def test_add_deduplicates_and_evicts_oldest():
+    snapshot = _snapshot(max_rows=3)
+    assert len(snapshot) == 3
+    assert _urls(snapshot.query()) == ["b", "c", "d"]
+    snapshot.add([{"symphony_url": "b", "name": "Beta 2", "oos_sharpe": 3.0, "oos_max_drawdown": 0.1}])
+    assert _urls(snapshot.query()) == ["c", "d", "b"]
+    assert _urls(snapshot.query([">", "oos_sharpe", 2.5])) == ["b"]
+
+def test_pickling_drops_columns():
+    snapshot = _snapshot()
+    snapshot.query([">", "oos_sharpe", 1])
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert restored._columns == {}
+    assert _urls(restored.query([">", "oos_sharpe", 1])) == ["a", "d"]
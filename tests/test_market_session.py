@@ -0,0 +1,38 @@
+"""
+Tests for market-session-aware caching.
+"""
+from composer_trade_mcp.utils.market_session import SessionCache, next_session_boundary, session_boundaries
+
+NOW = 1_700_000_000.0
+MARKET_HOURS = {
+    "days": [
+        {"market_open": "2023-11-14T14:30:00Z", "market_close": "2023-11-14T21:00:00Z"},
+        {"market_open": (NOW + 3600) * 1000, "market_close": NOW + 7200},
+    ],
+    "holiday": "2023-11-23",
+}
+
+def test_session_boundaries():
+    boundaries = session_boundaries(MARKET_HOURS)
+    assert boundaries == sorted(boundaries)
+    assert NOW + 3600 in boundaries and NOW + 7200 in boundaries
+    assert next_session_boundary(MARKET_HOURS, NOW) == NOW + 3600
+    assert next_session_boundary(MARKET_HOURS, NOW + 7200) is None
+
+def test_entries_expire_exactly_at_the_next_boundary():
+    cache = SessionCache(min_ttl=30)
+    cache.update_market_hours(MARKET_HOURS)
+    assert cache.expires_at(NOW) == NOW + 3600
+    # No minimum TTL is applied when the boundary is known, however close it is.
+    assert cache.expires_at(NOW + 3595) == NOW + 3600
+
+def test_far_boundaries_are_capped():
+    cache = SessionCache(max_ttl=600)
+    cache.update_market_hours(MARKET_HOURS)
+    assert cache.expires_at(NOW) == NOW + 600
+
+def test_fallback_ttl_without_boundaries():
+    cache = SessionCache(fallback_ttl=10, min_ttl=30)
+    assert cache.expires_at(NOW) == NOW + 30
+    cache.update_market_hours(MARKET_HOURS)
+    assert cache.expires_at(NOW + 7200) == NOW + 7200 + 30
@@ -0,0 +1,88 @@
+"""
+Tests for the Prometheus metrics registry.
+"""
+import pytest
+
+from composer_trade_mcp.utils.metrics import MetricsRegistry, endpoint_template, is_error_result
+
+@pytest.mark.parametrize("path, expected", [
+    ("/api/v0.1/symphonies/3W80K6PVgou3IF93Un0N/score", "/api/v0.1/symphonies/{id}/score"),
+    ("/api/v0.1/accounts/123e4567-e89b-12d3-a456-426614174000/holdings", "/api/v0.1/accounts/{id}/holdings"),
+    ("/api/v0.1/market-data/options/contract/OPTIONS::AAPL211022C000150000//USD", "/api/v0.1/market-data/options/contract/{id}//USD"),
+    ("/api/v0.1/deploy/accounts/abc/deploys/42", "/api/v0.1/deploy/accounts/abc/deploys/{id}"),
+    ("/api/v0.1/search/symphonies", "/api/v0.1/search/symphonies"),
+    ("/api/v1/market-data/options/chain", "/api/v1/market-data/options/chain"),
+])
+def test_endpoint_template(path, expected):
+    assert endpoint_template(path) == expected
+
+class _Cache:
+    hits = 3
+    misses = 1
+
+    def __len__(self):
+        return 2
+
+def test_render():
+    registry = MetricsRegistry(prefix="test_")
+    calls = registry.counter("calls_total", "Calls.", ["tool"])
+    in_flight = registry.gauge("in_flight", "In flight.")
+    latency = registry.histogram("latency_seconds", "Latency.", ["tool"], buckets=(0.1, 1))
+    registry.track_cache("search", _Cache())
+    registry.add_collector(lambda: ["test_extra 1"])
+
+    calls.inc("a")
+    calls.inc("a", amount=2)
+    calls.inc('b"\n')
+    in_flight.inc()
+    in_flight.dec()
+    in_flight.inc(amount=0.5)
+    latency.observe(0.05, "a")
+    latency.observe(0.5, "a")
+    latency.observe(3, "a")
+
+    lines = registry.render().splitlines()
+    assert lines == [
+        "# HELP test_calls_total Calls.",
+        "# TYPE test_calls_total counter",
+        'test_calls_total{tool="a"} 3',
+        'test_calls_total{tool="b\\"\\n"} 1',
+        "# HELP test_in_flight In flight.",
+        "# TYPE test_in_flight gauge",
+        "test_in_flight 0.5",
+        "# HELP test_latency_seconds Latency.",
+        "# TYPE test_latency_seconds histogram",
+        'test_latency_seconds_bucket{tool="a",le="0.1"} 1',
+        'test_latency_seconds_bucket{tool="a",le="1"} 2',
+        'test_latency_seconds_bucket{tool="a",le="+Inf"} 3',
+        'test_latency_seconds_sum{tool="a"} 3.55',
+        'test_latency_seconds_count{tool="a"} 3',
+        "# HELP test_cache_hits_total Cache lookups that found an entry.",
+        "# TYPE test_cache_hits_total counter",
+        'test_cache_hits_total{cache="search"} 3',
+        "# HELP test_cache_misses_total Cache lookups that found no entry.",
+        "# TYPE test_cache_misses_total counter",
+        'test_cache_misses_total{cache="search"} 1',
+        "# HELP test_cache_entries Entries currently stored.",
+        "# TYPE test_cache_entries gauge",
+        'test_cache_entries{cache="search"} 2',
+        "test_extra 1",
+    ]
+    assert latency.count("a") == 3
+    assert calls.value("a") == 3
+
+class _Text:
+    def __init__(self, text):
+        self.text = text
+
+@pytest.mark.parametrize("texts, expected", [
+    (['{"error": "Symphony not found"}'], True),
+    (['{\n  "account_uuid": "abc",\n  "portfolio_value": 1,\n  "error": "Upstream timed out"\n}'], True),
+    (['{"error": null, "results": []}'], False),
+    (['{"orders": [{"status": "failed", "error": "Insufficient funds"}], "submitted": 1}'], False),
+    (['[{"error": "x"}]'], False),
+    (['An "error" in plain text'], False),
+    ([], False),
+])
+def test_is_error_result(texts, expected):
+    assert is_error_result([_Text(text) for text in texts]) is expected
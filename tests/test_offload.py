@@ -0,0 +1,61 @@
+"""
+Tests for offloading CPU-bound work from the event loop.
+"""
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from composer_trade_mcp.utils.offload import OFFLOADED_CALLS, OffloadPool, count_nodes, count_points
+
+def test_count_points():
+    assert count_points({"sym-1": {1: 1.0, 2: 2.0}, "SPY": {1: 1.0}}) == 3
+    assert count_points(None) == 0
+
+def test_count_nodes():
+    score = {"step": "root", "children": [{"step": "wt-cash-equal", "children": [{"step": "asset"}, {"step": "asset"}]}]}
+    assert count_nodes(score) == 4
+
+def _thread_name():
+    return threading.current_thread().name
+
+@pytest.mark.parametrize("mode, offload, on_pool", [
+    ("thread", True, True),
+    ("thread", False, False),
+    ("off", True, False),
+])
+def test_run_routes_by_threshold_and_mode(mode, offload, on_pool):
+    pool = OffloadPool(mode, max_workers=1)
+    before = OFFLOADED_CALLS.value("_thread_name", "pool"), OFFLOADED_CALLS.value("_thread_name", "inline")
+    try:
+        thread_name = asyncio.run(pool.run(_thread_name, offload=offload))
+    finally:
+        pool.shutdown()
+    assert thread_name.startswith("composer-mcp-offload") is on_pool
+    after = OFFLOADED_CALLS.value("_thread_name", "pool"), OFFLOADED_CALLS.value("_thread_name", "inline")
+    assert after == ((before[0] + 1, before[1]) if on_pool else (before[0], before[1] + 1))
+
+def test_thread_pool_keeps_the_callers_context():
+    variable = contextvars.ContextVar("variable", default=None)
+    pool = OffloadPool("thread", max_workers=1)
+
+    async def main():
+        variable.set("caller")
+        return await pool.run(variable.get)
+
+    try:
+        assert asyncio.run(main()) == "caller"
+    finally:
+        pool.shutdown()
+
+def test_process_pool_passes_arguments():
+    pool = OffloadPool("process", max_workers=1)
+    try:
+        assert asyncio.run(pool.run(count_points, {"sym-1": {1: 1.0}})) == 1
+    finally:
+        pool.shutdown()
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        OffloadPool("fork")
@@ -0,0 +1,62 @@
+"""
+Tests for fetching a whole options chain within a row and byte budget.
+"""
+import asyncio
+import json
+
+import pytest
+
+from composer_trade_mcp import server
+
+def _row(i):
+    return {"symbol": f"AAPL-{i:03d}", "strike_price": i}
+
+ROW_BYTES = len(json.dumps(_row(0), separators=(",", ":")))
+
+def _fetch(monkeypatch, pages, max_rows=1000, max_bytes=float("inf")):
+    fetched = []
+    closed = []
+
+    async def iter_pages(params):
+        try:
+            for page in pages:
+                fetched.append(page)
+                yield page
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(server, "_iter_options_chain_pages", iter_pages)
+    chain = asyncio.run(server._fetch_full_options_chain({"underlying_asset_symbol": "AAPL"}, max_rows, max_bytes))
+    return chain, len(fetched), bool(closed)
+
+PAGES = [
+    {"results": [_row(i) for i in range(0, 3)], "next_cursor": "page-2"},
+    {"results": [_row(i) for i in range(3, 6)], "next_cursor": "page-3"},
+    {"results": [_row(i) for i in range(6, 8)], "next_cursor": None},
+]
+
+def test_fetches_every_page(monkeypatch):
+    chain, fetched, closed = _fetch(monkeypatch, PAGES)
+    assert [row["strike_price"] for row in chain["results"]] == list(range(8))
+    assert chain["pages"] == 3 and chain["next_cursor"] is None and not chain["truncated"]
+    assert fetched == 3 and closed
+
+@pytest.mark.parametrize("budget, rows, next_cursor, fetched", [
+    # The budget ends on a page boundary, so the chain can be resumed from the next cursor.
+    ({"max_rows": 3}, 3, "page-2", 1),
+    # Cut mid-page: the cursor would skip the rest of the page, so it isn't returned.
+    ({"max_rows": 4}, 4, None, 2),
+    ({"max_bytes": ROW_BYTES * 5 + 1}, 5, None, 2),
+    ({"max_bytes": ROW_BYTES * 6}, 6, None, 3),
+])
+def test_stops_at_the_budget(monkeypatch, budget, rows, next_cursor, fetched):
+    chain, pages_fetched, closed = _fetch(monkeypatch, PAGES, **budget)
+    assert len(chain["results"]) == rows
+    assert chain["next_cursor"] == next_cursor
+    assert chain["truncated"]
+    assert pages_fetched == fetched and closed
+
+def test_returns_upstream_errors(monkeypatch):
+    error = {"error": "Unknown symbol"}
+    chain, _, _ = _fetch(monkeypatch, [error])
+    assert chain == error
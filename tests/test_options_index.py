@@ -0,0 +1,42 @@
+"""
+Tests for the options chain index.
+"""
+from composer_trade_mcp.utils.options_index import OptionsChainIndex
+
+def contract(expiry, contract_type, strike):
+    return {"symbol": f"{expiry}-{contract_type}-{strike}", "expiry": expiry, "contract_type": contract_type, "strike_price": strike}
+
+ROWS = [
+    contract("2025-01-17", "CALL", 100),
+    contract("2025-01-17", "PUT", 100),
+    contract("2025-01-17", "CALL", 90),
+    contract("2025-02-21", "CALL", 110),
+    contract("2025-03-21", "PUT", 95),
+]
+
+def test_query_ranges():
+    index = OptionsChainIndex(ROWS)
+    assert [row["symbol"] for row in index.query(contract_type="CALL", max_strike=105)] == [
+        "2025-01-17-CALL-90", "2025-01-17-CALL-100",
+    ]
+    assert [row["symbol"] for row in index.query(expiry_from="2025-02-01", expiry_to="2025-02-28")] == ["2025-02-21-CALL-110"]
+    assert [row["symbol"] for row in index.query(moneyness="OTM", underlying_price=100, expiry_from="2025-02-01")] == [
+        "2025-02-21-CALL-110", "2025-03-21-PUT-95",
+    ]
+
+def test_complete_chain_covers_everything():
+    index = OptionsChainIndex(ROWS)
+    assert index.covers()
+    assert index.covers("2025-01-31")
+
+def test_truncated_chain_in_expiry_order_covers_earlier_expiries():
+    index = OptionsChainIndex(ROWS[:4], truncated=True)
+    assert index.complete_before == "2025-02-21"
+    assert not index.covers()
+    assert index.covers("2025-02-20")
+    assert not index.covers("2025-02-21")
+
+def test_truncated_chain_out_of_order_covers_nothing():
+    index = OptionsChainIndex([ROWS[3], ROWS[0]], truncated=True)
+    assert index.complete_before is None
+    assert not index.covers("2025-01-01")
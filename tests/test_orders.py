@@ -0,0 +1,166 @@
+"""
+Tests for order validation, idempotency keys and deduplicated order submission.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from composer_trade_mcp import server
+from composer_trade_mcp.utils.cache import LRUCache
+from composer_trade_mcp.utils.orders import idempotency_key, new_client_order_id, order_payload, validate_orders
+
+STOCK = "AAPL"
+OPTION = "OPTIONS::AAPL211022C000150000//USD"
+
+def make_order(**fields):
+    order = {
+        "side": "BUY",
+        "type": "MARKET",
+        "time_in_force": "DAY",
+        "symbol": STOCK,
+        "notional": None,
+        "quantity": None,
+        "position_intent": None,
+        "limit_price": None,
+    }
+    order.update(fields)
+    return order
+
+# Orders and the error the original `execute_single_trade` validation returned for them.
+# Checks ran in this order and each failing check overwrote the previous message, so the last failing rule wins.
+BASELINE_CASES = [
+    (make_order(notional=100), None),
+    (make_order(notional="12.5"), None),
+    (make_order(side="SELL", quantity=-2), None),
+    (make_order(symbol=OPTION, position_intent="BUY_TO_OPEN", type="LIMIT", quantity=1, limit_price=2.5), None),
+    (make_order(), "One of notional or quantity must be provided"),
+    (make_order(side="SELL"), "One of notional or quantity must be provided"),
+    # A zero amount counts as missing, but the side check on the same amount comes later.
+    (make_order(notional=0), "Notional must be positive for BUY orders"),
+    (make_order(notional="0"), "Notional must be positive for BUY orders"),
+    (make_order(side="SELL", quantity=0), "Quantity must be negative for SELL orders"),
+    (make_order(symbol=OPTION, notional=100), "Position intent is required for options orders"),
+    (make_order(symbol=OPTION, time_in_force="GTC", notional=100), "Time in force must be DAY for options orders"),
+    (make_order(symbol=OPTION, time_in_force="GTC", position_intent="BUY_TO_OPEN", notional=100), "Time in force must be DAY for options orders"),
+    (make_order(type="LIMIT", notional=100), "Limit orders are only supported for options orders"),
+    (make_order(notional=100, limit_price=5), "Limit price is only used for options orders"),
+    (make_order(type="LIMIT", notional=100, limit_price=5), "Limit price is only used for options orders"),
+    (make_order(notional=100, limit_price=-1), "Limit price must be positive"),
+    (make_order(symbol=OPTION, position_intent="BUY_TO_OPEN", notional=100, limit_price=0), "Limit price must be positive"),
+    (make_order(side="SELL", notional=100), "Notional must be negative for SELL orders"),
+    (make_order(quantity=-1), "Quantity must be positive for BUY orders"),
+    (make_order(notional=-5, quantity=-1), "Quantity must be positive for BUY orders"),
+    (make_order(side="SELL", notional=-5, quantity=1), "Quantity must be negative for SELL orders"),
+    (make_order(type="LIMIT", notional=-1), "Notional must be positive for BUY orders"),
+    (make_order(symbol=OPTION, time_in_force="GTC", notional=100, limit_price=-1), "Limit price must be positive"),
+    (make_order(side="SELL", symbol=OPTION, time_in_force="GTC", quantity=1, limit_price=0), "Quantity must be negative for SELL orders"),
+]
+
+@pytest.mark.parametrize("order, expected", BASELINE_CASES)
+def test_validate_orders_matches_baseline(order, expected):
+    assert validate_orders([order]) == [expected]
+
+def test_validate_orders_batch_matches_single_orders():
+    orders = [order for order, _ in BASELINE_CASES]
+    assert validate_orders(orders) == [expected for _, expected in BASELINE_CASES]
+
+# Values the original validation raised on instead of returning an error.
+@pytest.mark.parametrize("order, expected", [
+    (make_order(notional="abc"), "Invalid notional value: abc"),
+    (make_order(notional=10, quantity="abc"), "Invalid quantity value: abc"),
+    (make_order(symbol=OPTION, position_intent="BUY_TO_OPEN", notional=10, limit_price="x"), "Invalid limit price value: x"),
+])
+def test_validate_orders_invalid_numbers(order, expected):
+    assert validate_orders([order]) == [expected]
+
+def test_validate_orders_empty():
+    assert validate_orders([]) == []
+
+def test_order_payload():
+    order = make_order(symbol=OPTION, position_intent="BUY_TO_OPEN", type="LIMIT", quantity="2", limit_price=1.5)
+    assert order_payload(order) == {
+        "type": "LIMIT",
+        "symbol": OPTION,
+        "time_in_force": "DAY",
+        "quantity": 2.0,
+        "limit_price": 1.5,
+        "position_intent": "BUY_TO_OPEN",
+    }
+
+def test_idempotency_key():
+    assert idempotency_key("account", "order-1") == idempotency_key("account", "order-1")
+    assert idempotency_key("account", "order-1") != idempotency_key("account", "order-2")
+    assert idempotency_key("account", "order-1") != idempotency_key("other-account", "order-1")
+    assert new_client_order_id() != new_client_order_id()
+
+ORDER_URL = "https://api.example.com/api/v0.1/trading/accounts/account/order-requests"
+
+def _submit_twice(monkeypatch, responses):
+    """
+    Submit the same order twice with the upstream answering from `responses` (a response, or an exception to raise).
+    Returns both outcomes and the number of requests sent upstream.
+    """
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        response = responses[len(requests) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(server, "submitted_orders", LRUCache(ttl=60))
+    monkeypatch.setattr(server, "upstream_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    key = ("base", "fingerprint", idempotency_key("account", "order-1"))
+    payload = order_payload(make_order(notional=100))
+
+    async def main():
+        first = await server._submit_order(ORDER_URL, {}, payload, key)
+        second = await server._submit_order(ORDER_URL, {}, payload, key)
+        return first, second
+
+    first, second = asyncio.run(main())
+    return first, second, len(requests)
+
+@pytest.mark.parametrize("first_response", [
+    httpx.ReadTimeout("timed out"),
+    httpx.Response(503, json={"error": "unavailable"}),
+])
+def test_retry_after_unknown_outcome_is_not_sent_again(monkeypatch, first_response):
+    first, second, sent = _submit_twice(monkeypatch, [first_response, httpx.Response(200, json={"id": "1"})])
+    assert first["status"] == "unknown"
+    assert second == {"status": "unknown", "error": server.UNKNOWN_ORDER_OUTCOME}
+    assert sent == 1
+
+def test_retry_after_submission_is_suppressed(monkeypatch):
+    first, second, sent = _submit_twice(monkeypatch, [httpx.Response(200, json={"id": "1"})])
+    assert first == {"status": "submitted", "response": {"id": "1"}}
+    assert second == {"status": "duplicate_suppressed", "response": {"id": "1"}}
+    assert sent == 1
+
+def test_retry_after_rejection_is_sent_again(monkeypatch):
+    first, second, sent = _submit_twice(monkeypatch, [httpx.Response(400, json={"error": "bad"}), httpx.Response(200, json={"id": "1"})])
+    assert first["status"] == "failed"
+    assert second["status"] == "submitted"
+    assert sent == 2
+
+def test_concurrent_retries_share_one_submission(monkeypatch):
+    monkeypatch.setattr(server, "submitted_orders", LRUCache(ttl=60))
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": "1"})
+
+    monkeypatch.setattr(server, "upstream_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    key = ("base", "fingerprint", idempotency_key("account", "order-1"))
+    payload = order_payload(make_order(notional=100))
+
+    async def main():
+        return await asyncio.gather(*(server._submit_order(ORDER_URL, {}, payload, key) for _ in range(3)))
+
+    outcomes = asyncio.run(main())
+    assert sorted(outcome["status"] for outcome in outcomes) == ["duplicate_suppressed", "duplicate_suppressed", "submitted"]
+    assert len(requests) == 1
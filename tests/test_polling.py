@@ -0,0 +1,59 @@
+"""
+Tests for shared status polling.
+"""
+import asyncio
+
+import pytest
+
+from composer_trade_mcp.utils.polling import SharedPoller
+
+def _poller(statuses):
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if isinstance(status, Exception):
+            raise status
+        return status
+
+    return SharedPoller(fetch, lambda status: status == "done", initial_delay=0.01, max_delay=0.02), calls
+
+def test_concurrent_waiters_share_one_poll_loop():
+    poller, calls = _poller(["running", "running", "done"])
+
+    async def main():
+        return await asyncio.gather(*(poller.wait(timeout=5) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["done"] * 5
+    assert len(calls) == 3
+
+def test_on_update_sees_every_result():
+    poller, _ = _poller(["queued", "running", "done"])
+    updates = []
+
+    async def on_update(status):
+        updates.append(status)
+
+    assert asyncio.run(poller.wait(timeout=5, on_update=on_update)) == "done"
+    assert updates == ["queued", "running", "done"]
+
+def test_timeout_returns_latest_result_and_stops_polling():
+    poller, calls = _poller(["running"])
+
+    async def main():
+        result = await poller.wait(timeout=0.05)
+        polls = len(calls)
+        await asyncio.sleep(0.1)
+        return result, polls
+
+    result, polls = asyncio.run(main())
+    assert result == "running"
+    assert not poller.finished and poller.idle
+    # The poll loop stops once the last waiter leaves.
+    assert len(calls) == polls
+
+def test_poll_errors_are_raised_to_waiters():
+    poller, _ = _poller(["running", RuntimeError("upstream down")])
+    with pytest.raises(RuntimeError, match="upstream down"):
+        asyncio.run(poller.wait(timeout=5))
@@ -0,0 +1,60 @@
+"""
+Tests for the search_symphonies page cache.
+"""
+import asyncio
+
+import httpx
+
+from composer_trade_mcp import server
+from composer_trade_mcp.utils.cache import LRUCache
+from composer_trade_mcp.utils.honeysql import canonical_query_key
+
+BASE_URL = "https://api.example.com"
+URL_BASE = "https://app.composer.trade"
+
+def _patch_upstream(monkeypatch, respond):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return respond(request)
+
+    monkeypatch.setattr(server, "search_cache", LRUCache(ttl=60))
+    monkeypatch.setattr(server, "upstream_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return requests
+
+def _get_page(where, order_by, offset=0):
+    return server._get_search_page(BASE_URL, {}, URL_BASE, canonical_query_key(where, order_by), where, order_by, offset)
+
+def test_equivalent_queries_share_cached_pages(monkeypatch):
+    requests = _patch_upstream(monkeypatch, lambda request: httpx.Response(200, json=[{"symphony_sid": "abc", "name": "A"}]))
+
+    async def main():
+        first = await _get_page(["and", [">", "a", 1], ["<", "b", 2]], [["oos_sharpe", "desc"]])
+        second = await _get_page([":and", ["<", "b", 2.0], [">", "a", 1]], [["oos_sharpe", ":desc"]])
+        other_page = await _get_page(["and", [">", "a", 1], ["<", "b", 2]], [["oos_sharpe", "desc"]], offset=5)
+        return first, second, other_page
+
+    first, second, _ = asyncio.run(main())
+    assert first == second == [{"name": "A", "symphony_url": f"{URL_BASE}/symphony/abc/details"}]
+    assert len(requests) == 2
+
+def test_concurrent_requests_share_one_upstream_call(monkeypatch):
+    requests = _patch_upstream(monkeypatch, lambda request: httpx.Response(200, json=[]))
+
+    async def main():
+        return await asyncio.gather(*(_get_page([">", "a", 1], []) for _ in range(3)))
+
+    assert asyncio.run(main()) == [[], [], []]
+    assert len(requests) == 1
+    assert server._search_page_fetches == {}
+
+def test_errors_are_not_cached(monkeypatch):
+    requests = _patch_upstream(monkeypatch, lambda request: httpx.Response(400, json={"error": "bad where"}))
+
+    async def main():
+        return [await _get_page(["like", "a", 1], []) for _ in range(2)]
+
+    assert asyncio.run(main()) == [{"error": "bad where"}] * 2
+    assert len(requests) == 2
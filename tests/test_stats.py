@@ -0,0 +1,125 @@
+"""
+Tests for the vectorized performance statistics.
+"""
+import numpy as np
+import pytest
+
+from composer_trade_mcp.utils.stats import (
+    compute_backtest_stats, compute_extended_stats, compute_series_stats, daily_returns, drawdown_periods,
+    find_primary_key, max_drawdown, monthly_returns, regression_stats, rolling_sharpe, series_from_dvm_entry,
+    sortino_ratio, trailing_return, window,
+)
+
+# 2023-01-02 as an epoch day.
+START_DAY = 19359
+
+def test_series_from_dvm_entry_sorts_by_day():
+    days, values = series_from_dvm_entry({3: 30.0, 1: 10.0, 2: 20.0})
+    assert days.tolist() == [1, 2, 3]
+    assert values.tolist() == [10.0, 20.0, 30.0]
+
+def test_daily_returns():
+    assert daily_returns(np.array([100.0, 110.0, 99.0])) == pytest.approx([0.1, -0.1])
+    assert len(daily_returns(np.array([100.0]))) == 0
+
+@pytest.mark.parametrize("values, expected", [
+    ([100.0, 120.0, 90.0, 130.0, 65.0], 0.5),
+    ([100.0, 110.0, 120.0], 0.0),
+    ([100.0, 80.0, 90.0], 0.2),
+    ([], 0.0),
+])
+def test_max_drawdown(values, expected):
+    assert max_drawdown(np.array(values)) == pytest.approx(expected)
+
+def test_trailing_return_anchors_on_last_value_before_lookback():
+    days = np.array([0, 10, 20, 40])
+    values = np.array([100.0, 110.0, 120.0, 132.0])
+    # The lookback date is day 10, so the anchor is the value on day 10.
+    assert trailing_return(days, values, 30) == pytest.approx(0.2)
+    # A lookback before the first day anchors on the first value.
+    assert trailing_return(days, values, 365) == pytest.approx(0.32)
+
+def test_regression_stats_recovers_beta():
+    benchmark = np.array([0.01, -0.02, 0.015, 0.003, -0.007])
+    stats = regression_stats(2 * benchmark + 0.001, benchmark)
+    assert stats["beta"] == pytest.approx(2.0)
+    assert stats["pearson_r"] == pytest.approx(1.0)
+    assert stats["r_square"] == pytest.approx(1.0)
+    assert stats["alpha"] == pytest.approx(0.001 * 252)
+
+def test_regression_stats_with_flat_benchmark():
+    assert regression_stats(np.array([0.01, 0.02]), np.zeros(2)) == {"alpha": 0.0, "beta": 0.0, "r_square": 0.0, "pearson_r": 0.0}
+
+def test_compute_series_stats_for_constant_growth():
+    # One year of calendar days growing 10% overall.
+    days = np.arange(366) + START_DAY
+    values = 100.0 * 1.1 ** ((days - START_DAY) / 365.25)
+    stats = compute_series_stats(days, values)
+    assert stats["cumulative_return"] == pytest.approx(1.1 ** (365 / 365.25) - 1)
+    assert stats["annualized_rate_of_return"] == pytest.approx(0.1)
+    assert stats["max_drawdown"] == 0.0
+    assert stats["calmar_ratio"] == 0.0
+    assert stats["standard_deviation"] == pytest.approx(0.0, abs=1e-12)
+    assert compute_series_stats(np.empty(0), np.empty(0)) == {}
+
+def test_window_is_inclusive():
+    days = np.array([1, 2, 3, 4, 5])
+    values = days * 10.0
+    assert window(days, values, 2, 4)[0].tolist() == [2, 3, 4]
+    assert window(days, values, None, 2)[1].tolist() == [10.0, 20.0]
+    assert window(days, values)[0].tolist() == [1, 2, 3, 4, 5]
+
+def test_find_primary_key():
+    dvm_capital = {"SPY": {}, "sym-1": {}}
+    assert find_primary_key(dvm_capital, ["SPY"]) == "sym-1"
+    assert find_primary_key(dvm_capital, ["SPY"], preferred_key="SPY") == "SPY"
+    assert find_primary_key({"SPY": {}}, ["SPY"]) is None
+
+def test_sortino_ratio_ignores_upside():
+    returns = np.array([0.02, -0.01, 0.03, -0.01])
+    downside = np.sqrt(np.mean([0, 0.0001, 0, 0.0001]))
+    assert sortino_ratio(returns) == pytest.approx(np.mean(returns) / downside * np.sqrt(252))
+    assert sortino_ratio(np.array([0.01, 0.02])) == 0.0
+
+def test_rolling_sharpe_matches_direct_computation():
+    rng = np.random.default_rng(7)
+    returns = rng.normal(0.0005, 0.01, 100)
+    expected = [np.mean(returns[i:i + 20]) / np.std(returns[i:i + 20], ddof=1) * np.sqrt(252) for i in range(81)]
+    assert rolling_sharpe(returns, 20) == pytest.approx(expected)
+    assert len(rolling_sharpe(returns[:10], 20)) == 0
+
+def test_drawdown_periods():
+    days = np.arange(7)
+    values = np.array([100.0, 90.0, 80.0, 100.0, 110.0, 99.0, 105.0])
+    first, second = drawdown_periods(days, values)
+    assert first == {"peak_day": 0, "trough_day": 2, "recovery_day": 3, "depth": pytest.approx(0.2), "duration_days": 3}
+    assert second == {"peak_day": 4, "trough_day": 5, "recovery_day": None, "depth": pytest.approx(0.1), "duration_days": 2}
+
+def test_monthly_returns():
+    # 2023-01-30, 2023-01-31, 2023-02-01, 2023-02-28, 2023-03-01
+    days = np.array([19387, 19388, 19389, 19416, 19417])
+    values = np.array([100.0, 110.0, 121.0, 99.0, 108.9])
+    assert monthly_returns(days, values) == {
+        "2023": {"01": pytest.approx(0.1), "02": pytest.approx(-0.1), "03": pytest.approx(0.1)},
+    }
+
+def test_compute_extended_stats_adds_fields():
+    days = np.arange(100) + START_DAY
+    values = 100.0 * np.cumprod(1 + np.random.default_rng(1).normal(0, 0.01, 100))
+    stats = compute_extended_stats(days, values, rolling_window=20)
+    assert stats["cumulative_return"] == pytest.approx(values[-1] / values[0] - 1)
+    assert stats["rolling_sharpe"]["window"] == 20
+    assert stats["num_drawdowns"] == len(drawdown_periods(days, values))
+    assert set(stats["monthly_returns"]) == {"2023"}
+
+def test_compute_backtest_stats_windows_every_series():
+    days = range(START_DAY, START_DAY + 10)
+    dvm_capital = {
+        "sym-1": {day: 100.0 * 1.01 ** i for i, day in enumerate(days)},
+        "SPY": {day: 50.0 * 1.005 ** i for i, day in enumerate(days)},
+    }
+    stats = compute_backtest_stats(dvm_capital, "sym-1", ["SPY", "QQQ"], start_day=START_DAY + 2, end_day=START_DAY + 5)
+    assert stats["cumulative_return"] == pytest.approx(1.01 ** 3 - 1)
+    assert list(stats["benchmarks"]) == ["SPY"]
+    assert stats["benchmarks"]["SPY"]["cumulative_return"] == pytest.approx(1.005 ** 3 - 1)
+    assert set(stats["benchmarks"]["SPY"]["percent"]) == {"alpha", "beta", "r_square", "pearson_r"}